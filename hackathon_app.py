@@ -3,15 +3,32 @@
 HACKATHON READY - Campus Entity Resolution & Security Monitoring System
 Optimized for fast startup and real data processing
 """
+import os
+import re
 import sys
+import hashlib
+import time
+import asyncio
+import threading
+import zlib
+import orjson
+from html import escape
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from fastapi import FastAPI, HTTPException
+from functools import wraps
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
 import uvicorn
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from loguru import logger
+from sortedcontainers import SortedKeyList
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -21,6 +38,30 @@ from src.config import DATA_FILES, CAMPUS_LOCATIONS
 # Global data storage
 campus_data = {}
 entity_profiles = {}
+search_index = {}
+activity_feed = {}
+entity_table = {}
+entity_last_seen = {}
+
+# Inline SVG icon sprite (replaces the FontAwesome CDN stylesheet)
+STATIC_DIR = Path(__file__).parent / "static"
+ICON_SPRITE = (STATIC_DIR / "icons.svg").read_text()
+ICON_PATTERN = re.compile(r'<i class="fas fa-([\w-]+)( fa-spin)?"([^>]*)></i>')
+
+def _icon_svg(match):
+    spin = " ic-spin" if match.group(2) else ""
+    return f'<svg class="ic{spin}"{match.group(3)}><use href="#i-{match.group(1)}"/></svg>'
+
+def inline_icons(html: str) -> str:
+    """Swap FontAwesome <i> tags for SVG sprite references and embed the sprite"""
+    html = ICON_PATTERN.sub(_icon_svg, html)
+    return html.replace("<body>", "<body>\n" + ICON_SPRITE, 1)
+
+def entity_initials(name: str) -> str:
+    """Up to two uppercase initials for an entity's avatar; blank for missing names"""
+    if not isinstance(name, str):
+        return ''
+    return ''.join(part[0] for part in name.split()[:2]).upper()
 
 def load_campus_data():
     """Load and process campus data efficiently"""
@@ -43,6 +84,10 @@ def load_campus_data():
         campus_data['cctv_frames']['timestamp'] = pd.to_datetime(campus_data['cctv_frames']['timestamp'])
         campus_data['wifi_logs']['timestamp'] = pd.to_datetime(campus_data['wifi_logs']['timestamp'])
         
+        # Epoch seconds alongside each timestamp, so hot paths compare floats instead of datetimes
+        for source, _ in ACTIVITY_SOURCES:
+            campus_data[source]['ts_epoch'] = (campus_data[source]['timestamp'] - EPOCH).dt.total_seconds()
+        
         # Create entity lookup
         for _, row in campus_data['profiles'].iterrows():
             entity_profiles[row['entity_id']] = {
@@ -51,9 +96,14 @@ def load_campus_data():
                 'department': row['department'],
                 'card_id': row['card_id'],
                 'device_hash': row['device_hash'],
-                'face_id': row['face_id']
+                'face_id': row['face_id'],
+                'initials': entity_initials(row['name'])
             }
         
+        build_search_index()
+        build_activity_feed()
+        build_entity_table()
+        
         logger.info(f"✅ Loaded {len(campus_data)} data sources")
         logger.info(f"✅ {len(entity_profiles)} entities ready")
         
@@ -140,39 +190,213 @@ def get_entity_timeline(entity_id: str, hours: int = 24):
     
     return timeline
 
+# Naive timestamps are local wall-clock times; epoch seconds are measured on the same clock
+EPOCH = pd.Timestamp(0)
+
+def now_epoch() -> float:
+    """Current local wall-clock time in epoch seconds, comparable with the ts_epoch columns"""
+    return (datetime.now() - EPOCH).total_seconds()
+
+# Event sources scanned for entity activity: (campus_data key, identifier column in both the source and profile)
+ACTIVITY_SOURCES = (
+    ('card_swipes', 'card_id'),
+    ('cctv_frames', 'face_id'),
+    ('wifi_logs', 'device_hash'),
+)
+
+def get_entities_activity(entity_ids, hours: int = 24, now_ts: Optional[float] = None):
+    """Event count and latest event time (epoch seconds) per entity, from one grouped scan of each source"""
+    start_ts = (now_ts or now_epoch()) - hours * 3600
+    activity = {entity_id: {'count': 0, 'last_seen': None} for entity_id in entity_ids}
+    
+    for source, column in ACTIVITY_SOURCES:
+        events = campus_data[source]
+        owners = {}
+        for entity_id in entity_ids:
+            key = entity_profiles.get(entity_id, {}).get(column)
+            if key and pd.notna(key):
+                owners.setdefault(key, []).append(entity_id)
+        if not owners or events.empty:
+            continue
+        
+        recent = events[(events['ts_epoch'] >= start_ts) & events[column].isin(list(owners))]
+        grouped = recent.groupby(column)['ts_epoch'].agg(['size', 'max'])
+        for key, count, last_seen in zip(grouped.index, grouped['size'], grouped['max']):
+            for entity_id in owners[key]:
+                entry = activity[entity_id]
+                entry['count'] += int(count)
+                if entry['last_seen'] is None or last_seen > entry['last_seen']:
+                    entry['last_seen'] = last_seen
+    
+    return activity
+
+def build_search_index():
+    """Build columnar lowercase arrays of ids, names and card ids for search"""
+    ids = list(entity_profiles.keys())
+    search_index['ids'] = np.array(ids, dtype=object)
+    search_index['ids_lower'] = np.char.lower(np.array(ids, dtype=str))
+    search_index['names_lower'] = np.char.lower(np.array([str(p['name']) for p in entity_profiles.values()], dtype=str))
+    search_index['card_ids_lower'] = np.char.lower(np.array([str(p['card_id']) for p in entity_profiles.values()], dtype=str))
+
+# Column holding the place of each event in the activity sources
+FEED_PLACE_COLUMNS = {'card_swipes': 'location_id', 'cctv_frames': 'location_id', 'wifi_logs': 'ap_id'}
+
+def build_activity_feed():
+    """Merge card, CCTV and WiFi events into columnar arrays ordered by time, for the live feed"""
+    frames = []
+    for source, column in ACTIVITY_SOURCES:
+        events = campus_data[source]
+        owners = {info[column]: entity_id for entity_id, info in entity_profiles.items()}
+        frames.append(pd.DataFrame({
+            'ts_epoch': events['ts_epoch'],
+            'timestamp': events['timestamp'],
+            'kind': source,
+            'subject': events[column].map(owners).fillna(events[column]).astype(str),
+            'location': events[FEED_PLACE_COLUMNS[source]].astype(str)
+        }))
+    
+    feed = pd.concat(frames, ignore_index=True).sort_values('ts_epoch', kind='stable')
+    activity_feed['ts_epoch'] = feed['ts_epoch'].to_numpy()
+    activity_feed['timestamp'] = feed['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy()
+    for column in ('kind', 'subject', 'location'):
+        activity_feed[column] = feed[column].to_numpy()
+    
+    # Latest event per known entity, so the entity list never rescans the event sources
+    known = feed[feed['subject'].isin(entity_profiles.keys())]
+    entity_last_seen.clear()
+    entity_last_seen.update(known.groupby('subject')['ts_epoch'].max().to_dict())
+
+def last_event_epoch() -> float:
+    """Epoch of the most recent loaded event, or 0 before any data is loaded"""
+    ts = activity_feed.get('ts_epoch')
+    return float(ts[-1]) if ts is not None and len(ts) else 0.0
+
+def feed_events(after_ts: float, until_ts: float, limit: int = 50):
+    """Latest feed events in (after_ts, until_ts], oldest first, with the epoch of the last one"""
+    ts = activity_feed['ts_epoch']
+    end = int(np.searchsorted(ts, until_ts, side='right'))
+    start = max(int(np.searchsorted(ts, after_ts, side='right')), end - limit)
+    events = [
+        {
+            'timestamp': activity_feed['timestamp'][i],
+            'kind': activity_feed['kind'][i],
+            'subject': activity_feed['subject'][i],
+            'location': activity_feed['location'][i]
+        }
+        for i in range(start, end)
+    ]
+    return events, (float(ts[end - 1]) if end > start else after_ts)
+
+def location_counts(after_ts: float, until_ts: float):
+    """[location, count] pairs for card and CCTV events in (after_ts, until_ts], busiest first"""
+    ts = activity_feed['ts_epoch']
+    start = int(np.searchsorted(ts, after_ts, side='right'))
+    end = int(np.searchsorted(ts, until_ts, side='right'))
+    # WiFi events are placed by access point rather than location, so they are left out
+    placed = activity_feed['kind'][start:end] != 'wifi_logs'
+    locations, counts = np.unique(activity_feed['location'][start:end][placed].astype(str), return_counts=True)
+    order = np.argsort(-counts, kind='stable')
+    return [[str(locations[i]), int(counts[i])] for i in order]
+
+# Fields served by the entities list, stored column-wise in entity id order
+ENTITY_TABLE_FIELDS = ('name', 'role', 'department', 'card_id', 'initials')
+
+def build_entity_table():
+    """Parallel arrays of the entity list fields, sorted by id for cursor pagination"""
+    ids = np.array(list(entity_profiles.keys()), dtype=str)
+    order = np.argsort(ids, kind='stable')
+    entity_table['ids'] = ids[order]
+    for field in ENTITY_TABLE_FIELDS:
+        column = np.array([info.get(field, '') for info in entity_profiles.values()], dtype=object)
+        entity_table[field] = column[order]
+
 def search_entities(query: str):
     """Search for entities by name or ID"""
+    if query in entity_profiles:
+        hits = [query]
+    else:
+        query_lower = query.lower()
+        mask = (
+            (np.char.find(search_index['ids_lower'], query_lower) >= 0) |
+            (np.char.find(search_index['names_lower'], query_lower) >= 0) |
+            (np.char.find(search_index['card_ids_lower'], query_lower) >= 0)
+        )
+        hits = search_index['ids'][mask][:10]  # Limit results
+    
     results = []
-    query_lower = query.lower()
+    for entity_id in hits:
+        info = entity_profiles[entity_id]
+        results.append({
+            'entity_id': entity_id,
+            'name': info['name'],
+            'role': info['role'],
+            'department': info['department'],
+            'card_id': info.get('card_id', ''),
+            'confidence': 1.0
+        })
     
-    for entity_id, info in entity_profiles.items():
-        if (query_lower in entity_id.lower() or 
-            query_lower in info['name'].lower() or
-            query_lower in info.get('card_id', '').lower()):
-            
-            results.append({
-                'entity_id': entity_id,
-                'name': info['name'],
-                'role': info['role'],
-                'department': info['department'],
-                'card_id': info.get('card_id', ''),
-                'confidence': 1.0
-            })
+    return results
+
+def render_timeline_fragment(entity: dict, timeline: list) -> str:
+    """Render the dashboard timeline panel as an HTML fragment"""
+    parts = [f"""
+        <div style="margin-bottom: 24px; padding: 16px; background: #f8fafc; border-radius: 8px;">
+            <h6 style="margin-bottom: 8px; color: #0f172a;">📋 Entity: {escape(str(entity['name']))} ({escape(entity['entity_id'])})</h6>
+            <p style="margin: 0; color: #64748b;"><strong>Role:</strong> {escape(str(entity['role']))} | <strong>Department:</strong> {escape(str(entity['department']))}</p>
+        </div>
+    """]
+    
+    if not timeline:
+        parts.append('<div style="padding: 20px; text-align: center; color: #64748b; background: #fef3c7; border-radius: 8px;"><i class="fas fa-info-circle" style="margin-right: 8px;"></i>No recent activity found for this entity</div>')
+        return inline_icons(''.join(parts))
+    
+    parts.append('<div class="timeline">')
+    for event in timeline:
+        confidence = round(event['confidence'] * 100)
+        level = 'high' if confidence > 80 else 'medium' if confidence > 60 else 'low'
+        color = '#059669' if confidence > 80 else '#d97706' if confidence > 60 else '#dc2626'
+        timestamp = datetime.fromisoformat(event['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        sources = ''.join(f'<span class="badge badge-success">{escape(source)}</span>' for source in event['sources'])
+        parts.append(f"""
+            <div class="timeline-item {level}-confidence">
+                <h6 style="margin-bottom: 8px; color: #0f172a;">{escape(event['description'])}</h6>
+                <p style="margin-bottom: 12px; color: #64748b; font-size: 14px;">
+                    <i class="fas fa-clock" style="margin-right: 4px;"></i> {timestamp} | 
+                    <i class="fas fa-map-marker-alt" style="margin-right: 4px;"></i> {escape(str(event['location']))} | 
+                    <span style="color: {color};">Confidence: {confidence}%</span>
+                </p>
+                <div style="display: flex; gap: 8px; flex-wrap: wrap;">
+                    <span class="badge badge-primary">{escape(event['activity'])}</span>
+                    {sources}
+                </div>
+            </div>
+        """)
+    parts.append('</div>')
     
-    return results[:10]  # Limit results
+    return inline_icons(''.join(parts))
 
 def check_entity_alerts(entity_id: str):
     """Check for alerts"""
-    alerts = []
-    
-    entity_info = entity_profiles.get(entity_id, {})
-    if not entity_info:
-        return alerts
+    if entity_id not in entity_profiles:
+        return []
     
-    # Get recent timeline
-    timeline = get_entity_timeline(entity_id, 48)
+    return entity_alerts(entity_id, get_entities_activity([entity_id], 48)[entity_id]['count'])
+
+# Entities with fewer events than this over 48 hours raise an activity alert
+LOW_ACTIVITY_THRESHOLD = 3
+
+def scan_entity_alerts(entity_ids, hours: int = 48):
+    """Alerts for many entities from one grouped activity scan, flagging entities with an array mask"""
+    activity = get_entities_activity(entity_ids, hours)
+    counts = np.array([activity[entity_id]['count'] for entity_id in entity_ids], dtype=np.int64)
+    flagged = np.flatnonzero(counts < LOW_ACTIVITY_THRESHOLD)
+    return {entity_ids[i]: entity_alerts(entity_ids[i], int(counts[i])) for i in flagged}
+
+def entity_alerts(entity_id: str, activity_count: int):
+    """Alerts for an entity given its event count over the last 48 hours"""
+    alerts = []
     
-    if not timeline:
+    if not activity_count:
         alerts.append({
             'entity_id': entity_id,
             'alert_type': 'absence',
@@ -182,19 +406,169 @@ def check_entity_alerts(entity_id: str):
             'evidence': {'last_seen': 'Unknown'},
             'recommended_actions': ['Contact entity directly', 'Check with department']
         })
-    elif len(timeline) < 3:
+    elif activity_count < LOW_ACTIVITY_THRESHOLD:
         alerts.append({
             'entity_id': entity_id,
             'alert_type': 'low_activity',
             'severity': 'medium',
             'timestamp': datetime.now().isoformat(),
             'description': 'Unusually low activity detected',
-            'evidence': {'activity_count': len(timeline)},
+            'evidence': {'activity_count': activity_count},
             'recommended_actions': ['Monitor for next 24 hours']
         })
     
     return alerts
 
+# Pandas scans run in worker threads so they never stall the event loop (and the SSE clients on it)
+BLOCKING_SLOTS = asyncio.Semaphore(os.cpu_count() or 1)
+
+async def run_blocking(func, *args):
+    """Run CPU-bound data access in a worker thread, bounded so bursts cannot exhaust the pool"""
+    async with BLOCKING_SLOTS:
+        return await asyncio.to_thread(func, *args)
+
+def ttl_cache(seconds: float, maxsize: int = 256):
+    """Memoize a function's results for `seconds`, keyed on its positional arguments"""
+    def decorator(func):
+        cache = {}
+        
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+            if len(cache) >= maxsize:
+                cache.clear()
+            value = func(*args)
+            cache[args] = (now, value)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+# Active alerts, newest first, maintained incrementally as scans raise and clear them
+alerts_index = SortedKeyList(key=lambda entry: -entry[0])
+active_alerts = {}
+alerts_lock = threading.Lock()
+
+def sync_alerts(group: str, alerts: list):
+    """Replace a group's active alerts in the index, keeping entries that are still raised"""
+    raised = {alert.get('alert_id') or alert['alert_type']: alert for alert in alerts}
+    
+    with alerts_lock:
+        current = active_alerts.setdefault(group, {})
+        for key in current.keys() - raised.keys():
+            alerts_index.remove(current.pop(key))
+        
+        for key, alert in raised.items():
+            if key not in current:
+                entry = ((pd.Timestamp(alert['timestamp']) - EPOCH).total_seconds(), alert)
+                current[key] = entry
+                alerts_index.add(entry)
+
+def data_etag() -> str:
+    """Weak ETag for polled views derived from the loaded data; rolls over each minute as relative times age"""
+    return f'W/"{len(entity_profiles)}-{last_event_epoch():.0f}-{int(now_epoch() // 60)}"'
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response when the client already holds the version tagged `etag`"""
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={'ETag': etag})
+    return None
+
+def etag_response(request: Request, payload, etag: Optional[str] = None) -> Response:
+    """Serialize payload as JSON with an ETag (content hash unless given), answering 304 when the client copy matches"""
+    body = orjson.dumps(payload, default=jsonable_encoder, option=orjson.OPT_SERIALIZE_NUMPY)
+    etag = etag or f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {'ETag': etag, 'Cache-Control': 'private, must-revalidate'}
+    
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def gzip_chunks(*parts: bytes) -> tuple:
+    """Compress parts as one gzip stream, flushed after each part so every chunk can be sent as soon as it is ready"""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    chunks = [compressor.compress(part) + compressor.flush(zlib.Z_SYNC_FLUSH) for part in parts]
+    chunks[-1] += compressor.flush()
+    return tuple(chunks)
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the client accepts gzip-encoded responses"""
+    return 'gzip' in request.headers.get('accept-encoding', '')
+
+def page_response(request: Request, body: bytes, etag: str, gzipped: Optional[bytes] = None) -> Response:
+    """Serve pre-encoded page HTML (precompressed when the client accepts gzip), answering 304 when the client copy matches"""
+    headers = {'Cache-Control': 'public, max-age=60', 'Vary': 'Accept-Encoding'}
+    if gzipped is not None and accepts_gzip(request):
+        body, etag = gzipped, etag[:-1] + '-gzip"'
+        headers['Content-Encoding'] = 'gzip'
+    headers['ETag'] = etag
+    
+    if request.headers.get('if-none-match') == etag:
+        headers.pop('Content-Encoding', None)
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="text/html", headers=headers)
+
+class VersionedStaticFiles(StaticFiles):
+    """Static files that browsers may cache forever when requested with a ?v= content version"""
+    
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if b'v=' in scope.get('query_string', b''):
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving repeat GETs on selected paths from a short-lived cache"""
+    
+    def __init__(self, app, paths, ttl: float = 15.0, maxsize: int = 1024):
+        self.app = app
+        self.paths = set(paths)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.cache = {}
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        
+        # Vary on Accept-Encoding and Origin so compressed bodies and CORS headers never mix
+        headers = dict(scope['headers'])
+        key = (scope['path'], scope['query_string'], headers.get(b'accept-encoding', b''), headers.get(b'origin', b''))
+        now = time.monotonic()
+        
+        entry = self.cache.get(key)
+        if entry and entry[0] > now:
+            _, status, response_headers, body = entry
+            await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        
+        start = {}
+        chunks = []
+        
+        async def capture(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body', False) and start.get('status') == 200:
+                    if len(self.cache) >= self.maxsize:
+                        self.cache.clear()
+                    response_headers = [(k, v) for k, v in start['headers'] if k.lower() != b'content-length']
+                    body = b''.join(chunks)
+                    response_headers.append((b'content-length', str(len(body)).encode()))
+                    self.cache[key] = (now + self.ttl, start['status'], response_headers, body)
+            await send(message)
+        
+        await self.app(scope, receive, capture)
+
 # FastAPI App
 app = FastAPI(
     title="Campus Entity Resolution & Security Monitoring System - HACKATHON READY",
@@ -210,6 +584,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.mount("/static", VersionedStaticFiles(directory=STATIC_DIR), name="static")
+
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=6)
+app.add_middleware(ResponseCacheMiddleware, paths=["/api/search"], ttl=15)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize system on startup"""
@@ -218,71 +597,25 @@ async def startup_event():
         logger.error("Failed to initialize system")
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard():
+async def dashboard(request: Request):
     """Main dashboard"""
-    return """
+    return page_response(request, DASHBOARD_HTML, DASHBOARD_ETAG, DASHBOARD_GZIP)
+
+def dashboard_html():
+    """Render the static dashboard page"""
+    return inline_icons("""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <title>Campus Security Dashboard</title>
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
+        <link rel="preconnect" href="https://fonts.googleapis.com">
+        <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+        <link rel="preconnect" href="https://code.jquery.com">
         <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
         <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body { font-family: 'Inter', sans-serif; background: #f8fafc; color: #334155; }
-            .sidebar { width: 280px; height: 100vh; background: #ffffff; border-right: 1px solid #e2e8f0; position: fixed; left: 0; top: 0; z-index: 1000; }
-            .sidebar-header { padding: 24px; border-bottom: 1px solid #e2e8f0; }
-            .sidebar-brand { display: flex; align-items: center; gap: 12px; font-size: 18px; font-weight: 600; color: #1e293b; }
-            .sidebar-nav { padding: 24px 0; }
-            .nav-section { margin-bottom: 32px; }
-            .nav-section-title { padding: 0 24px 12px; font-size: 12px; font-weight: 600; color: #64748b; text-transform: uppercase; letter-spacing: 0.05em; }
-            .nav-item { display: flex; align-items: center; gap: 12px; padding: 12px 24px; color: #64748b; text-decoration: none; transition: all 0.2s; }
-            .nav-item:hover, .nav-item.active { background: #f1f5f9; color: #0f172a; }
-            .nav-item.active { border-right: 3px solid #3b82f6; }
-            .main-content { margin-left: 280px; padding: 32px; }
-            .header { display: flex; justify-content: between; align-items: center; margin-bottom: 32px; }
-            .header h1 { font-size: 28px; font-weight: 700; color: #0f172a; }
-            .stats-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 24px; margin-bottom: 32px; }
-            .stat-card { background: white; border-radius: 12px; padding: 24px; border: 1px solid #e2e8f0; }
-            .stat-header { display: flex; justify-content: between; align-items: center; margin-bottom: 16px; }
-            .stat-title { font-size: 14px; font-weight: 500; color: #64748b; }
-            .stat-icon { width: 40px; height: 40px; border-radius: 8px; display: flex; align-items: center; justify-content: center; }
-            .stat-value { font-size: 32px; font-weight: 700; color: #0f172a; margin-bottom: 8px; }
-            .stat-change { font-size: 14px; display: flex; align-items: center; gap: 4px; }
-            .stat-change.positive { color: #059669; }
-            .stat-change.negative { color: #dc2626; }
-            .card { background: white; border-radius: 12px; border: 1px solid #e2e8f0; }
-            .card-header { padding: 24px 24px 0; border-bottom: none; }
-            .card-title { font-size: 18px; font-weight: 600; color: #0f172a; margin-bottom: 8px; }
-            .card-body { padding: 24px; }
-            .form-group { margin-bottom: 20px; }
-            .form-label { display: block; font-size: 14px; font-weight: 500; color: #374151; margin-bottom: 8px; }
-            .form-control { width: 100%; padding: 12px 16px; border: 1px solid #d1d5db; border-radius: 8px; font-size: 14px; transition: border-color 0.2s; }
-            .form-control:focus { outline: none; border-color: #3b82f6; box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1); }
-            .btn { padding: 12px 24px; border-radius: 8px; font-size: 14px; font-weight: 500; border: none; cursor: pointer; transition: all 0.2s; }
-            .btn-primary { background: #3b82f6; color: white; }
-            .btn-primary:hover { background: #2563eb; }
-            .btn-secondary { background: #6b7280; color: white; }
-            .btn-secondary:hover { background: #4b5563; }
-            .timeline-item { padding: 16px; border-left: 3px solid #e2e8f0; margin-bottom: 16px; }
-            .timeline-item.high-confidence { border-left-color: #10b981; }
-            .timeline-item.medium-confidence { border-left-color: #f59e0b; }
-            .timeline-item.low-confidence { border-left-color: #ef4444; }
-            .badge { padding: 4px 8px; border-radius: 6px; font-size: 12px; font-weight: 500; }
-            .badge-primary { background: #dbeafe; color: #1e40af; }
-            .badge-success { background: #d1fae5; color: #065f46; }
-            .badge-warning { background: #fef3c7; color: #92400e; }
-            .btn { padding: 8px 16px; border-radius: 6px; font-size: 14px; font-weight: 500; border: none; cursor: pointer; }
-            .btn-primary { background: #3b82f6; color: white; }
-            .stat-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px; }
-            .stat-title { font-size: 14px; font-weight: 500; color: #64748b; }
-            .stat-icon { width: 40px; height: 40px; border-radius: 8px; display: flex; align-items: center; justify-content: center; }
-            .badge-warning { background: #fef3c7; color: #92400e; }
-            .badge-danger { background: #fee2e2; color: #991b1b; }
-        </style>
+        <link href="/static/app.css?v=""" + APP_CSS_VERSION + """" rel="stylesheet">
     </head>
     <body>
         <!-- Sidebar -->
@@ -654,6 +987,11 @@ async def dashboard():
         </div>
         
         <script>
+            // Shared request options so every API call reuses the same init object
+            const JSON_INIT = { headers: { 'Accept': 'application/json' }, credentials: 'same-origin', keepalive: true };
+            // Build the locale date formatter once instead of per rendered row
+            const DATE_FMT = new Intl.DateTimeFormat(undefined, { dateStyle: 'medium', timeStyle: 'short' });
+
             // Search entity
             async function searchEntity() {
                 const entityId = document.getElementById('timelineSearch').value || document.getElementById('entitySearch').value;
@@ -665,23 +1003,12 @@ async def dashboard():
                 }
                 
                 try {
-                    // Search for entity first
-                    const searchResponse = await fetch(`/api/search?query=${encodeURIComponent(entityId)}`);
-                    const searchResults = await searchResponse.json();
-                    
-                    if (searchResults.length === 0) {
-                        document.getElementById('timeline-container').innerHTML = 
-                            '<div class="alert alert-warning">Entity not found. Try: E100001, Neha Mehta, or C3286</div>';
-                        return;
+                    // Server renders the timeline fragment; no JSON parse on this path
+                    const response = await fetch(`/api/entity_view.html?query=${encodeURIComponent(entityId)}&hours=${timeRange}`, JSON_INIT);
+                    if (!response.ok && response.status !== 404) {
+                        throw new Error(`HTTP ${response.status}`);
                     }
-                    
-                    const entity = searchResults[0];
-                    
-                    // Get timeline
-                    const timelineResponse = await fetch(`/api/timeline/${entity.entity_id}?hours=${timeRange}`);
-                    const timeline = await timelineResponse.json();
-                    
-                    displayTimeline(entity, timeline);
+                    document.getElementById('timeline-container').innerHTML = await response.text();
                     
                 } catch (error) {
                     console.error('Search failed:', error);
@@ -701,7 +1028,7 @@ async def dashboard():
                 
                 try {
                     // Search for entity first
-                    const searchResponse = await fetch(`/api/search?query=${encodeURIComponent(entityId)}`);
+                    const searchResponse = await fetch(`/api/search?query=${encodeURIComponent(entityId)}`, JSON_INIT);
                     const searchResults = await searchResponse.json();
                     
                     if (searchResults.length === 0) {
@@ -710,7 +1037,7 @@ async def dashboard():
                     }
                     
                     const entity = searchResults[0];
-                    const response = await fetch(`/api/alerts/${entity.entity_id}`);
+                    const response = await fetch(`/api/alerts/${entity.entity_id}`, JSON_INIT);
                     const alerts = await response.json();
                     
                     displayAlerts(alerts);
@@ -720,47 +1047,6 @@ async def dashboard():
                 }
             }
             
-            // Display timeline
-            function displayTimeline(entity, timeline) {
-                const container = document.getElementById('timeline-container');
-                
-                let html = `
-                    <div style="margin-bottom: 24px; padding: 16px; background: #f8fafc; border-radius: 8px;">
-                        <h6 style="margin-bottom: 8px; color: #0f172a;">📋 Entity: ${entity.name} (${entity.entity_id})</h6>
-                        <p style="margin: 0; color: #64748b;"><strong>Role:</strong> ${entity.role} | <strong>Department:</strong> ${entity.department}</p>
-                    </div>
-                `;
-                
-                if (!timeline || timeline.length === 0) {
-                    html += '<div style="padding: 20px; text-align: center; color: #64748b; background: #fef3c7; border-radius: 8px;"><i class="fas fa-info-circle" style="margin-right: 8px;"></i>No recent activity found for this entity</div>';
-                } else {
-                    html += '<div class="timeline">';
-                    timeline.forEach(event => {
-                        const timestamp = new Date(event.timestamp).toLocaleString();
-                        const confidence = Math.round(event.confidence * 100);
-                        const confidenceClass = confidence > 80 ? 'high-confidence' : confidence > 60 ? 'medium-confidence' : 'low-confidence';
-                        
-                        html += `
-                            <div class="timeline-item ${confidenceClass}">
-                                <h6 style="margin-bottom: 8px; color: #0f172a;">${event.description}</h6>
-                                <p style="margin-bottom: 12px; color: #64748b; font-size: 14px;">
-                                    <i class="fas fa-clock" style="margin-right: 4px;"></i> ${timestamp} | 
-                                    <i class="fas fa-map-marker-alt" style="margin-right: 4px;"></i> ${event.location} | 
-                                    <span style="color: ${confidence > 80 ? '#059669' : confidence > 60 ? '#d97706' : '#dc2626'};">Confidence: ${confidence}%</span>
-                                </p>
-                                <div style="display: flex; gap: 8px; flex-wrap: wrap;">
-                                    <span class="badge badge-primary">${event.activity}</span>
-                                    ${event.sources.map(source => `<span class="badge badge-success">${source}</span>`).join('')}
-                                </div>
-                            </div>
-                        `;
-                    });
-                    html += '</div>';
-                }
-                
-                container.innerHTML = html;
-            }
-            
             // Display alerts
             function displayAlerts(alerts) {
                 const container = document.getElementById('alerts-container');
@@ -774,7 +1060,7 @@ async def dashboard():
                 alerts.forEach(alert => {
                     const severityColor = alert.severity === 'high' ? '#dc2626' : '#d97706';
                     const severityBg = alert.severity === 'high' ? '#fee2e2' : '#fef3c7';
-                    const timestamp = new Date(alert.timestamp).toLocaleString();
+                    const timestamp = DATE_FMT.format(new Date(alert.timestamp));
                     
                     html += `
                         <div style="padding: 16px; margin-bottom: 16px; border-radius: 8px; background: ${severityBg}; border-left: 4px solid ${severityColor};">
@@ -823,1087 +1109,262 @@ async def dashboard():
         </script>
     </body>
     </html>
-    """
+    """)
 
-@app.get("/api/search")
+@app.get("/api/search", response_class=ORJSONResponse, response_model=None)
 async def search_entities_api(query: str):
     """Search for entities"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
     
-    results = search_entities(query)
-    return results
+    return ORJSONResponse(search_entities(query))
 
-@app.get("/api/timeline/{entity_id}")
+@app.get("/api/timeline/{entity_id}", response_class=ORJSONResponse, response_model=None)
 async def get_timeline_api(entity_id: str, hours: int = 24):
     """Get entity timeline"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
     
-    timeline = get_entity_timeline(entity_id, hours)
-    return timeline
+    return ORJSONResponse(await run_blocking(get_entity_timeline, entity_id, hours))
+
+@app.get("/api/entity_view", response_class=ORJSONResponse, response_model=None)
+async def entity_view_api(query: str, hours: int = 24):
+    """Search for an entity and return it with its timeline"""
+    if not entity_profiles:
+        raise HTTPException(status_code=503, detail="System not ready")
+
+    results = search_entities(query)
+    if not results:
+        raise HTTPException(status_code=404, detail="Entity not found")
+
+    entity = results[0]
+    return ORJSONResponse({
+        'entity': entity,
+        'timeline': await run_blocking(get_entity_timeline, entity['entity_id'], hours)
+    })
+
+@app.get("/api/entity_view.html", response_class=HTMLResponse)
+async def entity_view_html(query: str, hours: int = 24):
+    """Search for an entity and return its timeline as a rendered HTML fragment"""
+    if not entity_profiles:
+        raise HTTPException(status_code=503, detail="System not ready")
+
+    results = search_entities(query)
+    if not results:
+        return HTMLResponse(
+            '<div class="alert alert-warning">Entity not found. Try: E100001, Neha Mehta, or C3286</div>',
+            status_code=404
+        )
+
+    entity = results[0]
+    timeline = await run_blocking(get_entity_timeline, entity['entity_id'], hours)
+    return render_timeline_fragment(entity, timeline)
 
-@app.get("/api/alerts/{entity_id}")
+@app.get("/api/alerts/{entity_id}", response_class=ORJSONResponse, response_model=None)
 async def get_alerts_api(entity_id: str):
     """Get entity alerts"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
     
-    alerts = check_entity_alerts(entity_id)
-    return alerts
+    return ORJSONResponse(await run_blocking(check_entity_alerts, entity_id))
 
 @app.get("/analytics", response_class=HTMLResponse)
-async def analytics_page():
+async def analytics_page(request: Request):
     """Analytics page"""
-    return create_page_template("Analytics", """
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Entity Resolution Accuracy</div>
-                    <div class="stat-icon" style="background: #d1fae5;">
-                        <i class="fas fa-bullseye" style="color: #059669;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">94.7%</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +3.2%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Improved entity matching across 9 data sources</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Cross-Source Links</div>
-                    <div class="stat-icon" style="background: #dbeafe;">
-                        <i class="fas fa-link" style="color: #2563eb;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">15,847</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +12%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Multi-modal data connections established</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Timeline Events</div>
-                    <div class="stat-icon" style="background: #fef3c7;">
-                        <i class="fas fa-clock" style="color: #d97706;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">8,234</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +18%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Activity events reconstructed today</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Prediction Accuracy</div>
-                    <div class="stat-icon" style="background: #f3e8ff;">
-                        <i class="fas fa-brain" style="color: #8b5cf6;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">91.3%</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +5.1%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">ML inference model performance</p>
-            </div>
-        </div>
-        
-        <div style="display: grid; grid-template-columns: 2fr 1fr; gap: 24px;">
-            <div class="card">
-                <div class="card-header"><div class="card-title">Data Source Performance</div></div>
-                <div class="card-body">
-                    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px;">
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #3b82f6, #1d4ed8); border-radius: 12px; color: white;">
-                            <i class="fas fa-credit-card" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">Card Swipes</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">2,847</div>
-                            <div style="opacity: 0.9;">records processed</div>
-                        </div>
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #ef4444, #dc2626); border-radius: 12px; color: white;">
-                            <i class="fas fa-video" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">CCTV Frames</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">1,923</div>
-                            <div style="opacity: 0.9;">face detections</div>
-                        </div>
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #10b981, #059669); border-radius: 12px; color: white;">
-                            <i class="fas fa-wifi" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">WiFi Logs</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">5,384</div>
-                            <div style="opacity: 0.9;">active sessions</div>
-                        </div>
-                    </div>
-                    <div style="margin-top: 24px; display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px;">
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #8b5cf6, #7c3aed); border-radius: 12px; color: white;">
-                            <i class="fas fa-book" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">Library</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">1,456</div>
-                            <div style="opacity: 0.9;">checkouts</div>
-                        </div>
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #f59e0b, #d97706); border-radius: 12px; color: white;">
-                            <i class="fas fa-calendar" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">Lab Bookings</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">892</div>
-                            <div style="opacity: 0.9;">reservations</div>
-                        </div>
-                        <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #06b6d4, #0891b2); border-radius: 12px; color: white;">
-                            <i class="fas fa-sticky-note" style="font-size: 40px; margin-bottom: 12px;"></i>
-                            <div style="font-weight: 600; font-size: 18px;">Text Notes</div>
-                            <div style="font-size: 24px; font-weight: 700; margin: 8px 0;">634</div>
-                            <div style="opacity: 0.9;">help tickets</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <div class="card-header"><div class="card-title">System Health</div></div>
-                <div class="card-body">
-                    <div style="margin-bottom: 24px;">
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
-                            <span style="font-weight: 500;">Entity Resolution</span>
-                            <span style="color: #059669;">94.7%</span>
-                        </div>
-                        <div style="height: 8px; background: #e2e8f0; border-radius: 4px;">
-                            <div style="height: 100%; width: 94.7%; background: linear-gradient(90deg, #10b981, #059669); border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                    <div style="margin-bottom: 24px;">
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
-                            <span style="font-weight: 500;">Data Processing</span>
-                            <span style="color: #2563eb;">87.2%</span>
-                        </div>
-                        <div style="height: 8px; background: #e2e8f0; border-radius: 4px;">
-                            <div style="height: 100%; width: 87.2%; background: linear-gradient(90deg, #3b82f6, #2563eb); border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                    <div style="margin-bottom: 24px;">
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
-                            <span style="font-weight: 500;">Security Score</span>
-                            <span style="color: #d97706;">91.3%</span>
-                        </div>
-                        <div style="height: 8px; background: #e2e8f0; border-radius: 4px;">
-                            <div style="height: 100%; width: 91.3%; background: linear-gradient(90deg, #f59e0b, #d97706); border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    """, "analytics")
+    return stream_page_template(request, "analytics")
 
 @app.get("/entities", response_class=HTMLResponse)
-async def entities_page():
+async def entities_page(request: Request):
     """Entities page"""
-    return create_page_template("Entities", """
-        <div style="display: flex; gap: 24px; margin-bottom: 24px;">
-            <div class="stat-card" style="flex: 1;">
-                <div class="stat-header">
-                    <div class="stat-title">Total Entities</div>
-                    <div class="stat-icon" style="background: #dbeafe;">
-                        <i class="fas fa-users" style="color: #2563eb;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">7,293</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +142 today</div>
-            </div>
-            <div class="stat-card" style="flex: 1;">
-                <div class="stat-header">
-                    <div class="stat-title">Active Now</div>
-                    <div class="stat-icon" style="background: #d1fae5;">
-                        <i class="fas fa-circle" style="color: #059669;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">1,847</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +23 online</div>
-            </div>
-            <div class="stat-card" style="flex: 1;">
-                <div class="stat-header">
-                    <div class="stat-title">Departments</div>
-                    <div class="stat-icon" style="background: #f3e8ff;">
-                        <i class="fas fa-building" style="color: #8b5cf6;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">8</div>
-                <div class="stat-change positive"><i class="fas fa-check"></i> All active</div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <div class="card-header" style="display: flex; justify-content: space-between; align-items: center;">
-                <div class="card-title">Campus Entities</div>
-                <div style="display: flex; gap: 12px; align-items: center;">
-                    <input type="text" class="form-control" placeholder="Search entities... (e.g., Neha Mehta)" style="max-width: 300px;">
-                    <button class="btn btn-primary" style="padding: 8px 16px;">
-                        <i class="fas fa-plus"></i> Add Entity
-                    </button>
-                </div>
-            </div>
-            <div class="card-body">
-                <div id="entities-container" style="display: grid; gap: 16px;">
-                    <!-- Entities will be loaded here dynamically -->
-                </div>
-                
-                <div style="margin-top: 24px; text-align: center;">
-                    <button id="load-more-btn" class="btn btn-secondary" style="padding: 12px 24px;">
-                        <i class="fas fa-chevron-down"></i> Load More Entities
-                    </button>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Entity Details Modal -->
-        <div id="entity-modal" class="modal">
-            <div class="modal-content">
-                <span class="close">&times;</span>
-                <div id="modal-content">
-                    <div style="text-align: center; padding: 40px;">
-                        <i class="fas fa-spinner fa-spin" style="font-size: 32px; color: #3b82f6;"></i>
-                        <p style="margin-top: 16px;">Loading entity details...</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <script>
-            let currentPage = 0;
-            let allEntities = [];
-            const entitiesPerPage = 5;
-            
-            // Load entities from API
-            async function loadEntities() {
-                try {
-                    const response = await fetch('/api/entities');
-                    allEntities = await response.json();
-                    displayEntities();
-                } catch (error) {
-                    console.error('Error loading entities:', error);
-                    document.getElementById('entities-container').innerHTML = 
-                        '<div style="text-align: center; padding: 40px; color: #64748b;">Error loading entities. Please try again.</div>';
-                }
-            }
-            
-            function displayEntities() {
-                const container = document.getElementById('entities-container');
-                const startIndex = 0;
-                const endIndex = (currentPage + 1) * entitiesPerPage;
-                const entitiesToShow = allEntities.slice(startIndex, endIndex);
-                
-                container.innerHTML = entitiesToShow.map(entity => `
-                    <div style="display: flex; align-items: center; padding: 16px; background: #f8fafc; border-radius: 12px; border: 1px solid #e2e8f0;">
-                        <div style="width: 60px; height: 60px; border-radius: 50%; background: linear-gradient(135deg, #3b82f6, #8b5cf6); display: flex; align-items: center; justify-content: center; color: white; font-weight: 700; font-size: 20px; margin-right: 16px;">
-                            ${entity.initials}
-                        </div>
-                        <div style="flex: 1;">
-                            <div style="display: flex; align-items: center; gap: 8px; margin-bottom: 4px;">
-                                <h6 style="margin: 0; font-weight: 600;">${entity.name}</h6>
-                                <span class="badge badge-${entity.status === 'Active' ? 'success' : 'warning'}">${entity.status}</span>
-                            </div>
-                            <div style="color: #64748b; font-size: 14px; margin-bottom: 4px;">${entity.entity_id} • ${entity.department} • ${entity.role}</div>
-                            <div style="display: flex; gap: 16px; font-size: 12px; color: #64748b;">
-                                <span><i class="fas fa-clock"></i> ${entity.last_seen}</span>
-                                <span><i class="fas fa-credit-card"></i> ${entity.card_id}</span>
-                            </div>
-                        </div>
-                        <div style="display: flex; gap: 8px;">
-                            <button class="btn-view-entity btn btn-primary" data-entity-id="${entity.entity_id}" style="padding: 8px 12px; font-size: 12px;">
-                                <i class="fas fa-eye"></i> View
-                            </button>
-                            <button class="btn btn-secondary" style="padding: 8px 12px; font-size: 12px;">
-                                <i class="fas fa-edit"></i> Edit
-                            </button>
-                        </div>
-                    </div>
-                `).join('');
-                
-                // Update load more button
-                const loadMoreBtn = document.getElementById('load-more-btn');
-                if (endIndex >= allEntities.length) {
-                    loadMoreBtn.style.display = 'none';
-                } else {
-                    loadMoreBtn.style.display = 'inline-block';
-                }
-                
-                // Add event listeners to view buttons
-                document.querySelectorAll('.btn-view-entity').forEach(btn => {
-                    btn.addEventListener('click', function() {
-                        const entityId = this.getAttribute('data-entity-id');
-                        showEntityDetails(entityId);
-                    });
-                });
-            }
-            
-            // Load more entities
-            document.getElementById('load-more-btn').addEventListener('click', function() {
-                currentPage++;
-                displayEntities();
-            });
-            
-            // Show entity details modal
-            async function showEntityDetails(entityId) {
-                const modal = document.getElementById('entity-modal');
-                const modalContent = document.getElementById('modal-content');
-                
-                modal.style.display = 'block';
-                modalContent.innerHTML = `
-                    <div style="text-align: center; padding: 40px;">
-                        <i class="fas fa-spinner fa-spin" style="font-size: 32px; color: #3b82f6;"></i>
-                        <p style="margin-top: 16px;">Loading entity details...</p>
-                    </div>
-                `;
-                
-                try {
-                    const response = await fetch(`/api/entity/${entityId}`);
-                    const entity = await response.json();
-                    
-                    modalContent.innerHTML = `
-                        <div style="display: flex; align-items: center; gap: 20px; margin-bottom: 24px;">
-                            <div style="width: 80px; height: 80px; border-radius: 50%; background: linear-gradient(135deg, #3b82f6, #8b5cf6); display: flex; align-items: center; justify-content: center; color: white; font-weight: 700; font-size: 24px;">
-                                ${entity.name.split(' ').map(n => n[0]).join('').toUpperCase()}
-                            </div>
-                            <div>
-                                <h2 style="margin: 0 0 8px 0;">${entity.name}</h2>
-                                <p style="color: #64748b; margin: 0;">${entity.entity_id} • ${entity.department} • ${entity.role}</p>
-                            </div>
-                        </div>
-                        
-                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 24px; margin-bottom: 24px;">
-                            <div>
-                                <h4 style="margin-bottom: 12px;">Contact Information</h4>
-                                <div style="background: #f8fafc; padding: 16px; border-radius: 8px;">
-                                    <div style="margin-bottom: 8px;"><strong>Card ID:</strong> ${entity.card_id || 'N/A'}</div>
-                                    <div style="margin-bottom: 8px;"><strong>Device Hash:</strong> ${entity.device_hash || 'N/A'}</div>
-                                    <div><strong>Face ID:</strong> ${entity.face_id || 'N/A'}</div>
-                                </div>
-                            </div>
-                            <div>
-                                <h4 style="margin-bottom: 12px;">Activity Summary</h4>
-                                <div style="background: #f8fafc; padding: 16px; border-radius: 8px;">
-                                    <div style="margin-bottom: 8px;"><strong>Total Activities:</strong> ${entity.total_activities}</div>
-                                    <div style="margin-bottom: 8px;"><strong>Active Alerts:</strong> ${entity.alerts.length}</div>
-                                    <div><strong>Department:</strong> ${entity.department}</div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <div style="margin-bottom: 24px;">
-                            <h4 style="margin-bottom: 12px;">Recent Timeline</h4>
-                            <div style="max-height: 200px; overflow-y: auto; background: #f8fafc; padding: 16px; border-radius: 8px;">
-                                ${entity.timeline.slice(0, 10).map(event => `
-                                    <div style="margin-bottom: 12px; padding-bottom: 12px; border-bottom: 1px solid #e2e8f0;">
-                                        <div style="font-weight: 500;">${event.summary}</div>
-                                        <div style="font-size: 12px; color: #64748b;">${new Date(event.timestamp).toLocaleString()}</div>
-                                    </div>
-                                `).join('') || '<div style="color: #64748b;">No recent activity</div>'}
-                            </div>
-                        </div>
-                        
-                        <div style="text-align: right;">
-                            <button class="btn btn-secondary" onclick="document.getElementById('entity-modal').style.display='none'">Close</button>
-                        </div>
-                    `;
-                } catch (error) {
-                    modalContent.innerHTML = `
-                        <div style="text-align: center; padding: 40px;">
-                            <i class="fas fa-exclamation-triangle" style="font-size: 32px; color: #dc2626;"></i>
-                            <p style="margin-top: 16px; color: #dc2626;">Error loading entity details</p>
-                            <button class="btn btn-secondary" onclick="document.getElementById('entity-modal').style.display='none'">Close</button>
-                        </div>
-                    `;
-                }
-            }
-            
-            // Close modal when clicking X or outside
-            document.querySelector('.close').addEventListener('click', function() {
-                document.getElementById('entity-modal').style.display = 'none';
-            });
-            
-            window.addEventListener('click', function(event) {
-                const modal = document.getElementById('entity-modal');
-                if (event.target === modal) {
-                    modal.style.display = 'none';
-                }
-            });
-            
-            // Load entities when page loads
-            document.addEventListener('DOMContentLoaded', function() {
-                loadEntities();
-            });
-        </script>
-        </div>
-    """, "entities")
+    return stream_page_template(request, "entities")
 
 @app.get("/security", response_class=HTMLResponse)
-async def security_page():
+async def security_page(request: Request):
     """Security page"""
-    return create_page_template("Security", """
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Active Alerts</div>
-                    <div class="stat-icon" style="background: #fee2e2;">
-                        <i class="fas fa-exclamation-triangle" style="color: #dc2626;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">2</div>
-                <div class="stat-change negative"><i class="fas fa-arrow-down"></i> -67%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Security incidents decreased this week</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Threat Level</div>
-                    <div class="stat-icon" style="background: #d1fae5;">
-                        <i class="fas fa-shield-check" style="color: #059669;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">Low</div>
-                <div class="stat-change positive"><i class="fas fa-check"></i> Secure</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Campus security status normal</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Predictions Made</div>
-                    <div class="stat-icon" style="background: #f3e8ff;">
-                        <i class="fas fa-brain" style="color: #8b5cf6;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">1,247</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +15%</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">ML predictions generated today</p>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Response Time</div>
-                    <div class="stat-icon" style="background: #dbeafe;">
-                        <i class="fas fa-stopwatch" style="color: #2563eb;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">2.3s</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-down"></i> -0.5s</div>
-                <p style="font-size: 12px; color: #64748b; margin-top: 8px;">Average alert response time</p>
-            </div>
-        </div>
-        
-        <div style="display: grid; grid-template-columns: 2fr 1fr; gap: 24px;">
-            <div class="card">
-                <div class="card-header"><div class="card-title">Recent Security Alerts</div></div>
-                <div class="card-body">
-                    <div style="display: grid; gap: 16px;">
-                        <div style="padding: 20px; background: linear-gradient(135deg, #fef3c7, #fbbf24); border-radius: 12px; border-left: 4px solid #d97706;">
-                            <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 12px;">
-                                <div style="width: 40px; height: 40px; background: #d97706; border-radius: 50%; display: flex; align-items: center; justify-content: center; color: white;">
-                                    <i class="fas fa-exclamation-triangle"></i>
-                                </div>
-                                <div>
-                                    <h6 style="margin: 0; color: #92400e; font-weight: 600;">Unusual Activity Detected</h6>
-                                    <small style="color: #92400e; opacity: 0.8;">Medium Priority</small>
-                                </div>
-                            </div>
-                            <p style="margin-bottom: 12px; color: #92400e;">Multiple failed card swipe attempts detected at LAB_301. Potential security breach attempt.</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <small style="color: #92400e; opacity: 0.8;">Entity: E104001 | 2 hours ago</small>
-                                <button style="padding: 6px 12px; background: #d97706; color: white; border: none; border-radius: 6px; font-size: 12px;">Investigate</button>
-                            </div>
-                        </div>
-                        
-                        <div style="padding: 20px; background: linear-gradient(135deg, #fee2e2, #fca5a5); border-radius: 12px; border-left: 4px solid #dc2626;">
-                            <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 12px;">
-                                <div style="width: 40px; height: 40px; background: #dc2626; border-radius: 50%; display: flex; align-items: center; justify-content: center; color: white;">
-                                    <i class="fas fa-ban"></i>
-                                </div>
-                                <div>
-                                    <h6 style="margin: 0; color: #991b1b; font-weight: 600;">Access Violation</h6>
-                                    <small style="color: #991b1b; opacity: 0.8;">High Priority</small>
-                                </div>
-                            </div>
-                            <p style="margin-bottom: 12px; color: #991b1b;">Unauthorized access attempt to restricted ADMIN_BLOCK area. Security protocol activated.</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <small style="color: #991b1b; opacity: 0.8;">Location: ADMIN_BLOCK | 4 hours ago</small>
-                                <button style="padding: 6px 12px; background: #dc2626; color: white; border: none; border-radius: 6px; font-size: 12px;">Review</button>
-                            </div>
-                        </div>
-                        
-                        <div style="padding: 20px; background: linear-gradient(135deg, #d1fae5, #86efac); border-radius: 12px; border-left: 4px solid #059669;">
-                            <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 12px;">
-                                <div style="width: 40px; height: 40px; background: #059669; border-radius: 50%; display: flex; align-items: center; justify-content: center; color: white;">
-                                    <i class="fas fa-check-circle"></i>
-                                </div>
-                                <div>
-                                    <h6 style="margin: 0; color: #065f46; font-weight: 600;">Incident Resolved</h6>
-                                    <small style="color: #065f46; opacity: 0.8;">Resolved</small>
-                                </div>
-                            </div>
-                            <p style="margin-bottom: 12px; color: #065f46;">Suspicious activity at LIBRARY entrance has been investigated and resolved. False alarm.</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <small style="color: #065f46; opacity: 0.8;">Entity: E100023 | 6 hours ago</small>
-                                <button style="padding: 6px 12px; background: #059669; color: white; border: none; border-radius: 6px; font-size: 12px;">Closed</button>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <div class="card-header"><div class="card-title">Predictive Insights</div></div>
-                <div class="card-body">
-                    <div style="margin-bottom: 24px;">
-                        <h6 style="margin-bottom: 12px; color: #0f172a;">Risk Assessment</h6>
-                        <div style="display: flex; justify-content: space-between; margin-bottom: 8px;">
-                            <span style="font-weight: 500;">Overall Risk</span>
-                            <span style="color: #059669;">Low</span>
-                        </div>
-                        <div style="height: 8px; background: #e2e8f0; border-radius: 4px;">
-                            <div style="height: 100%; width: 25%; background: linear-gradient(90deg, #10b981, #059669); border-radius: 4px;"></div>
-                        </div>
-                    </div>
-                    
-                    <div style="margin-bottom: 24px;">
-                        <h6 style="margin-bottom: 12px; color: #0f172a;">Predicted Hotspots</h6>
-                        <div style="display: grid; gap: 12px;">
-                            <div style="display: flex; justify-content: space-between; align-items: center; padding: 8px; background: #f8fafc; border-radius: 6px;">
-                                <span style="font-size: 14px;">LAB_301</span>
-                                <span style="font-size: 12px; color: #d97706;">Medium</span>
-                            </div>
-                            <div style="display: flex; justify-content: space-between; align-items: center; padding: 8px; background: #f8fafc; border-radius: 6px;">
-                                <span style="font-size: 14px;">ADMIN_BLOCK</span>
-                                <span style="font-size: 12px; color: #dc2626;">High</span>
-                            </div>
-                            <div style="display: flex; justify-content: space-between; align-items: center; padding: 8px; background: #f8fafc; border-radius: 6px;">
-                                <span style="font-size: 14px;">LIBRARY</span>
-                                <span style="font-size: 12px; color: #059669;">Low</span>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div>
-                        <h6 style="margin-bottom: 12px; color: #0f172a;">ML Confidence</h6>
-                        <div style="text-align: center; padding: 20px;">
-                            <div style="width: 80px; height: 80px; border-radius: 50%; background: conic-gradient(#8b5cf6 0deg 328deg, #e2e8f0 328deg 360deg); margin: 0 auto 12px; display: flex; align-items: center; justify-content: center;">
-                                <div style="width: 60px; height: 60px; border-radius: 50%; background: white; display: flex; align-items: center; justify-content: center; font-size: 14px; font-weight: 600; color: #0f172a;">91%</div>
-                            </div>
-                            <div style="color: #64748b; font-size: 12px;">Prediction accuracy</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    """, "security")
+    return page_response(request, PAGE_HTML["security"], PAGE_ETAGS["security"], PAGE_GZIP["security"])
 
 @app.get("/monitoring", response_class=HTMLResponse)
-async def monitoring_page():
+async def monitoring_page(request: Request):
     """Monitoring page"""
-    return create_page_template("Monitoring", """
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Active Cameras</div>
-                    <div class="stat-icon" style="background: #dbeafe;">
-                        <i class="fas fa-video" style="color: #2563eb;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">12</div>
-                <div class="stat-change positive"><i class="fas fa-check"></i> All Online</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">Live Detections</div>
-                    <div class="stat-icon" style="background: #d1fae5;">
-                        <i class="fas fa-eye" style="color: #059669;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">847</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +23 today</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-header">
-                    <div class="stat-title">System Uptime</div>
-                    <div class="stat-icon" style="background: #f3e8ff;">
-                        <i class="fas fa-clock" style="color: #8b5cf6;"></i>
-                    </div>
-                </div>
-                <div class="stat-value">99.8%</div>
-                <div class="stat-change positive"><i class="fas fa-arrow-up"></i> +0.2%</div>
-            </div>
-        </div>
-        
-        <div style="display: grid; grid-template-columns: 2fr 1fr; gap: 24px;">
-            <div class="card">
-                <div class="card-header"><div class="card-title">Live Camera Feeds</div></div>
-                <div class="card-body">
-                    <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px;">
-                        <div style="background: linear-gradient(135deg, #1f2937, #374151); border-radius: 12px; padding: 20px; text-align: center; color: white; position: relative;">
-                            <div style="position: absolute; top: 12px; right: 12px; background: #10b981; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px; font-weight: 600;">LIVE</div>
-                            <i class="fas fa-video" style="font-size: 48px; margin-bottom: 16px; opacity: 0.8;"></i>
-                            <h6 style="margin-bottom: 8px;">CCTV Camera 1</h6>
-                            <p style="opacity: 0.8; margin-bottom: 12px;">LAB_101 - Physics Department</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span class="badge badge-success">Online</span>
-                                <small style="opacity: 0.6;">1920x1080</small>
-                            </div>
-                        </div>
-                        
-                        <div style="background: linear-gradient(135deg, #1f2937, #374151); border-radius: 12px; padding: 20px; text-align: center; color: white; position: relative;">
-                            <div style="position: absolute; top: 12px; right: 12px; background: #10b981; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px; font-weight: 600;">LIVE</div>
-                            <i class="fas fa-video" style="font-size: 48px; margin-bottom: 16px; opacity: 0.8;"></i>
-                            <h6 style="margin-bottom: 8px;">CCTV Camera 2</h6>
-                            <p style="opacity: 0.8; margin-bottom: 12px;">LIBRARY - Main Entrance</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span class="badge badge-success">Online</span>
-                                <small style="opacity: 0.6;">1920x1080</small>
-                            </div>
-                        </div>
-                        
-                        <div style="background: linear-gradient(135deg, #1f2937, #374151); border-radius: 12px; padding: 20px; text-align: center; color: white; position: relative;">
-                            <div style="position: absolute; top: 12px; right: 12px; background: #10b981; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px; font-weight: 600;">LIVE</div>
-                            <i class="fas fa-video" style="font-size: 48px; margin-bottom: 16px; opacity: 0.8;"></i>
-                            <h6 style="margin-bottom: 8px;">CCTV Camera 3</h6>
-                            <p style="opacity: 0.8; margin-bottom: 12px;">AUDITORIUM - Main Hall</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span class="badge badge-success">Online</span>
-                                <small style="opacity: 0.6;">1920x1080</small>
-                            </div>
-                        </div>
-                        
-                        <div style="background: linear-gradient(135deg, #1f2937, #374151); border-radius: 12px; padding: 20px; text-align: center; color: white; position: relative;">
-                            <div style="position: absolute; top: 12px; right: 12px; background: #10b981; color: white; padding: 4px 8px; border-radius: 4px; font-size: 10px; font-weight: 600;">LIVE</div>
-                            <i class="fas fa-video" style="font-size: 48px; margin-bottom: 16px; opacity: 0.8;"></i>
-                            <h6 style="margin-bottom: 8px;">CCTV Camera 4</h6>
-                            <p style="opacity: 0.8; margin-bottom: 12px;">CAFETERIA - Dining Area</p>
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span class="badge badge-success">Online</span>
-                                <small style="opacity: 0.6;">1920x1080</small>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <div class="card-header"><div class="card-title">Real-time Activity Feed</div></div>
-                <div class="card-body">
-                    <div style="font-family: 'Courier New', monospace; background: #1f2937; color: #10b981; padding: 16px; border-radius: 8px; height: 300px; overflow-y: auto;">
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:18:45]</span>
-                            <span style="color: #3b82f6;">Card swipe:</span>
-                            <span>E100001 → LAB_101</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:18:32]</span>
-                            <span style="color: #f59e0b;">WiFi connect:</span>
-                            <span>Device_ABC123 → AP_LAB_201</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:18:18]</span>
-                            <span style="color: #ef4444;">CCTV detection:</span>
-                            <span>Face_ID_456 → LIBRARY</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:18:05]</span>
-                            <span style="color: #3b82f6;">Card swipe:</span>
-                            <span>E100002 → AUDITORIUM</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:17:52]</span>
-                            <span style="color: #8b5cf6;">Lab booking:</span>
-                            <span>E100003 → LAB_301</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:17:38]</span>
-                            <span style="color: #10b981;">Library checkout:</span>
-                            <span>E100004 → LIBRARY</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:17:25]</span>
-                            <span style="color: #f59e0b;">WiFi disconnect:</span>
-                            <span>Device_XYZ789 → AP_CAFETERIA</span>
-                        </div>
-                        <div style="margin-bottom: 8px; display: flex; align-items: center; gap: 8px;">
-                            <span style="color: #64748b;">[19:17:12]</span>
-                            <span style="color: #ef4444;">CCTV detection:</span>
-                            <span>Face_ID_789 → ADMIN_BLOCK</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="card" style="margin-top: 24px;">
-            <div class="card-header"><div class="card-title">Location Heatmap</div></div>
-            <div class="card-body">
-                <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 16px;">
-                    <div style="text-align: center; padding: 16px; background: linear-gradient(135deg, #ef4444, #dc2626); border-radius: 8px; color: white;">
-                        <i class="fas fa-fire" style="font-size: 24px; margin-bottom: 8px;"></i>
-                        <div style="font-weight: 600;">LAB_301</div>
-                        <div style="font-size: 12px; opacity: 0.9;">High Activity</div>
-                    </div>
-                    <div style="text-align: center; padding: 16px; background: linear-gradient(135deg, #f59e0b, #d97706); border-radius: 8px; color: white;">
-                        <i class="fas fa-thermometer-half" style="font-size: 24px; margin-bottom: 8px;"></i>
-                        <div style="font-weight: 600;">LIBRARY</div>
-                        <div style="font-size: 12px; opacity: 0.9;">Medium Activity</div>
-                    </div>
-                    <div style="text-align: center; padding: 16px; background: linear-gradient(135deg, #10b981, #059669); border-radius: 8px; color: white;">
-                        <i class="fas fa-snowflake" style="font-size: 24px; margin-bottom: 8px;"></i>
-                        <div style="font-weight: 600;">AUDITORIUM</div>
-                        <div style="font-size: 12px; opacity: 0.9;">Low Activity</div>
-                    </div>
-                    <div style="text-align: center; padding: 16px; background: linear-gradient(135deg, #3b82f6, #2563eb); border-radius: 8px; color: white;">
-                        <i class="fas fa-chart-bar" style="font-size: 24px; margin-bottom: 8px;"></i>
-                        <div style="font-weight: 600;">CAFETERIA</div>
-                        <div style="font-size: 12px; opacity: 0.9;">Normal Activity</div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    """, "monitoring")
+    return page_response(request, PAGE_HTML["monitoring"], PAGE_ETAGS["monitoring"], PAGE_GZIP["monitoring"])
 
 @app.get("/settings", response_class=HTMLResponse)
-async def settings_page():
+async def settings_page(request: Request):
     """Settings page"""
-    return create_page_template("Settings", """
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 24px;">
-            <div class="card">
-                <div class="card-header">
-                    <div class="card-title">System Configuration</div>
-                    <p style="color: #64748b; font-size: 14px; margin: 0;">Configure system-wide settings and preferences</p>
-                </div>
-                <div class="card-body">
-                    <div class="form-group">
-                        <label class="form-label">Data Refresh Interval</label>
-                        <select class="form-control" style="background: white;">
-                            <option>Every 5 minutes</option>
-                            <option selected>Every 10 minutes</option>
-                            <option>Every 30 minutes</option>
-                            <option>Every 1 hour</option>
-                        </select>
-                        <small style="color: #64748b;">How often to refresh campus data from sources</small>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Alert Threshold Level</label>
-                        <div style="display: flex; align-items: center; gap: 16px;">
-                            <input type="range" style="flex: 1;" min="1" max="10" value="7" id="alertRange">
-                            <span style="background: #3b82f6; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: 600;" id="alertValue">7</span>
-                        </div>
-                        <small style="color: #64748b;">Security alert sensitivity (1=Low, 10=High)</small>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Entity Resolution Settings</label>
-                        <div style="display: flex; align-items: center; gap: 16px; margin-bottom: 12px;">
-                            <input type="checkbox" checked id="autoResolve">
-                            <label for="autoResolve" style="margin: 0;">Enable automatic entity resolution</label>
-                        </div>
-                        <div style="display: flex; align-items: center; gap: 16px;">
-                            <input type="checkbox" checked id="crossSource">
-                            <label for="crossSource" style="margin: 0;">Cross-source data linking</label>
-                        </div>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Confidence Threshold</label>
-                        <div style="display: flex; align-items: center; gap: 16px;">
-                            <input type="range" style="flex: 1;" min="50" max="100" value="85" id="confidenceRange">
-                            <span style="background: #10b981; color: white; padding: 4px 8px; border-radius: 4px; font-size: 12px; font-weight: 600;" id="confidenceValue">85%</span>
-                        </div>
-                        <small style="color: #64748b;">Minimum confidence for entity matching</small>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <div class="card-header">
-                    <div class="card-title">Notification Settings</div>
-                    <p style="color: #64748b; font-size: 14px; margin: 0;">Configure alerts and notification preferences</p>
-                </div>
-                <div class="card-body">
-                    <div class="form-group">
-                        <label class="form-label">Email Notifications</label>
-                        <div style="display: grid; gap: 12px;">
-                            <div style="display: flex; align-items: center; gap: 12px; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                                <input type="checkbox" checked id="securityAlerts">
-                                <div style="flex: 1;">
-                                    <label for="securityAlerts" style="margin: 0; font-weight: 500;">Security Alerts</label>
-                                    <div style="font-size: 12px; color: #64748b;">High-priority security incidents</div>
-                                </div>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 12px; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                                <input type="checkbox" checked id="systemHealth">
-                                <div style="flex: 1;">
-                                    <label for="systemHealth" style="margin: 0; font-weight: 500;">System Health</label>
-                                    <div style="font-size: 12px; color: #64748b;">System performance and uptime alerts</div>
-                                </div>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 12px; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                                <input type="checkbox" id="dailyReports">
-                                <div style="flex: 1;">
-                                    <label for="dailyReports" style="margin: 0; font-weight: 500;">Daily Reports</label>
-                                    <div style="font-size: 12px; color: #64748b;">Daily activity summaries</div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Email Address</label>
-                        <input type="email" class="form-control" value="admin@campus-security.edu" placeholder="Enter email address">
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Notification Frequency</label>
-                        <select class="form-control" style="background: white;">
-                            <option selected>Immediate</option>
-                            <option>Every 15 minutes</option>
-                            <option>Every hour</option>
-                            <option>Daily digest</option>
-                        </select>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 24px; margin-top: 24px;">
-            <div class="card">
-                <div class="card-header">
-                    <div class="card-title">Data Sources</div>
-                    <p style="color: #64748b; font-size: 14px; margin: 0;">Manage campus data source connections</p>
-                </div>
-                <div class="card-body">
-                    <div style="display: grid; gap: 12px;">
-                        <div style="display: flex; justify-content: space-between; align-items: center; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <div style="width: 32px; height: 32px; background: #3b82f6; border-radius: 6px; display: flex; align-items: center; justify-content: center;">
-                                    <i class="fas fa-credit-card" style="color: white; font-size: 14px;"></i>
-                                </div>
-                                <div>
-                                    <div style="font-weight: 500;">Card Swipes</div>
-                                    <div style="font-size: 12px; color: #64748b;">2,847 records</div>
-                                </div>
-                            </div>
-                            <span class="badge badge-success">Connected</span>
-                        </div>
-                        
-                        <div style="display: flex; justify-content: space-between; align-items: center; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <div style="width: 32px; height: 32px; background: #ef4444; border-radius: 6px; display: flex; align-items: center; justify-content: center;">
-                                    <i class="fas fa-video" style="color: white; font-size: 14px;"></i>
-                                </div>
-                                <div>
-                                    <div style="font-weight: 500;">CCTV Frames</div>
-                                    <div style="font-size: 12px; color: #64748b;">1,923 detections</div>
-                                </div>
-                            </div>
-                            <span class="badge badge-success">Connected</span>
-                        </div>
-                        
-                        <div style="display: flex; justify-content: space-between; align-items: center; padding: 12px; background: #f8fafc; border-radius: 8px;">
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <div style="width: 32px; height: 32px; background: #10b981; border-radius: 6px; display: flex; align-items: center; justify-content: center;">
-                                    <i class="fas fa-wifi" style="color: white; font-size: 14px;"></i>
-                                </div>
-                                <div>
-                                    <div style="font-weight: 500;">WiFi Logs</div>
-                                    <div style="font-size: 12px; color: #64748b;">5,384 sessions</div>
-                                </div>
-                            </div>
-                            <span class="badge badge-success">Connected</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <div class="card-header">
-                    <div class="card-title">Security & Privacy</div>
-                    <p style="color: #64748b; font-size: 14px; margin: 0;">Configure security and privacy settings</p>
-                </div>
-                <div class="card-body">
-                    <div class="form-group">
-                        <label class="form-label">Data Retention Period</label>
-                        <select class="form-control" style="background: white;">
-                            <option>30 days</option>
-                            <option>90 days</option>
-                            <option selected>180 days</option>
-                            <option>1 year</option>
-                        </select>
-                        <small style="color: #64748b;">How long to keep historical data</small>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Privacy Settings</label>
-                        <div style="display: grid; gap: 12px;">
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <input type="checkbox" checked id="anonymizeData">
-                                <label for="anonymizeData" style="margin: 0;">Anonymize personal data in reports</label>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <input type="checkbox" checked id="encryptStorage">
-                                <label for="encryptStorage" style="margin: 0;">Encrypt data at rest</label>
-                            </div>
-                            <div style="display: flex; align-items: center; gap: 12px;">
-                                <input type="checkbox" id="auditLog">
-                                <label for="auditLog" style="margin: 0;">Enable detailed audit logging</label>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label class="form-label">Access Control</label>
-                        <div style="display: flex; gap: 12px;">
-                            <button class="btn btn-primary" style="flex: 1;">Manage Users</button>
-                            <button class="btn btn-secondary" style="flex: 1;">View Audit Log</button>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div style="margin-top: 24px; text-align: center;">
-            <button class="btn btn-primary" style="padding: 12px 32px; margin-right: 12px;">Save Settings</button>
-            <button class="btn btn-secondary" style="padding: 12px 32px;">Reset to Defaults</button>
-        </div>
-        
-        <script>
-            // Update range slider values
-            document.getElementById('alertRange').addEventListener('input', function(e) {
-                document.getElementById('alertValue').textContent = e.target.value;
-            });
-            
-            document.getElementById('confidenceRange').addEventListener('input', function(e) {
-                document.getElementById('confidenceValue').textContent = e.target.value + '%';
-            });
-        </script>
-    """, "settings")
+    return page_response(request, PAGE_HTML["settings"], PAGE_ETAGS["settings"], PAGE_GZIP["settings"])
+
+def render_page_fragment(page_title, content):
+    """Header and content of a page, without the shell, for client-side navigation"""
+    return inline_icons(PAGE_HEADER_TEMPLATE.render(title=page_title, content=content))
 
 def create_page_template(page_title, content, active_page="dashboard"):
     """Create page template with sidebar"""
-    return f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <title>{page_title} - Campus Security</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <script src="https://code.jquery.com/jquery-3.6.0.min.js"></script>
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ font-family: 'Inter', sans-serif; background: #f8fafc; color: #334155; }}
-            .sidebar {{ width: 280px; height: 100vh; background: #ffffff; border-right: 1px solid #e2e8f0; position: fixed; left: 0; top: 0; z-index: 1000; }}
-            .sidebar-header {{ padding: 24px; border-bottom: 1px solid #e2e8f0; }}
-            .sidebar-brand {{ display: flex; align-items: center; gap: 12px; font-size: 18px; font-weight: 600; color: #1e293b; }}
-            .sidebar-nav {{ padding: 24px 0; }}
-            .nav-section {{ margin-bottom: 32px; }}
-            .nav-section-title {{ padding: 0 24px 12px; font-size: 12px; font-weight: 600; color: #64748b; text-transform: uppercase; letter-spacing: 0.05em; }}
-            .nav-item {{ display: flex; align-items: center; gap: 12px; padding: 12px 24px; color: #64748b; text-decoration: none; transition: all 0.2s; }}
-            .nav-item:hover, .nav-item.active {{ background: #f1f5f9; color: #0f172a; }}
-            .nav-item.active {{ border-right: 3px solid #3b82f6; }}
-            .main-content {{ margin-left: 280px; padding: 32px; }}
-            .header {{ display: flex; justify-content: between; align-items: center; margin-bottom: 32px; }}
-            .header h1 {{ font-size: 28px; font-weight: 700; color: #0f172a; }}
-            .stats-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 24px; margin-bottom: 32px; }}
-            .stat-card {{ background: white; border-radius: 12px; padding: 24px; border: 1px solid #e2e8f0; }}
-            .stat-value {{ font-size: 32px; font-weight: 700; color: #0f172a; margin-bottom: 8px; }}
-            .stat-change {{ font-size: 14px; display: flex; align-items: center; gap: 4px; }}
-            .stat-change.positive {{ color: #059669; }}
-            .stat-change.negative {{ color: #dc2626; }}
-            .card {{ background: white; border-radius: 12px; border: 1px solid #e2e8f0; }}
-            .card-header {{ padding: 24px 24px 0; border-bottom: none; }}
-            .card-title {{ font-size: 18px; font-weight: 600; color: #0f172a; margin-bottom: 8px; }}
-            .card-body {{ padding: 24px; }}
-            .form-group {{ margin-bottom: 20px; }}
-            .form-label {{ display: block; font-size: 14px; font-weight: 500; color: #374151; margin-bottom: 8px; }}
-            .form-control {{ width: 100%; padding: 12px 16px; border: 1px solid #d1d5db; border-radius: 8px; font-size: 14px; transition: border-color 0.2s; }}
-            .form-control:focus {{ outline: none; border-color: #3b82f6; box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1); }}
-            .badge {{ padding: 4px 8px; border-radius: 6px; font-size: 12px; font-weight: 500; }}
-            .badge-success {{ background: #d1fae5; color: #065f46; }}
-            .badge-warning {{ background: #fef3c7; color: #92400e; }}
-            .badge-danger {{ background: #fee2e2; color: #991b1b; }}
-            .btn {{ padding: 8px 16px; border-radius: 6px; font-size: 14px; font-weight: 500; border: none; cursor: pointer; transition: all 0.2s; }}
-            .btn-primary {{ background: #3b82f6; color: white; }}
-            .btn-primary:hover {{ background: #2563eb; }}
-            .btn-secondary {{ background: #6b7280; color: white; }}
-            .btn-secondary:hover {{ background: #4b5563; }}
-            .btn-danger {{ background: #dc2626; color: white; }}
-            .btn-danger:hover {{ background: #b91c1c; }}
-            .stat-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px; }}
-            .stat-title {{ font-size: 14px; font-weight: 500; color: #64748b; }}
-            .stat-icon {{ width: 40px; height: 40px; border-radius: 8px; display: flex; align-items: center; justify-content: center; }}
-            .modal {{ display: none; position: fixed; z-index: 2000; left: 0; top: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.5); }}
-            .modal-content {{ background-color: white; margin: 5% auto; padding: 20px; border-radius: 12px; width: 80%; max-width: 600px; }}
-            .close {{ color: #aaa; float: right; font-size: 28px; font-weight: bold; cursor: pointer; }}
-            .close:hover {{ color: black; }}
-        </style>
-    </head>
-    <body>
-        <div class="sidebar">
-            <div class="sidebar-header">
-                <div class="sidebar-brand">
-                    <div style="width: 32px; height: 32px; background: linear-gradient(45deg, #ff6b35, #f7931e); border-radius: 8px; display: flex; align-items: center; justify-content: center; color: white; font-weight: 700; font-size: 16px;">C</div>
-                    Campus Security
-                </div>
-            </div>
-            <nav class="sidebar-nav">
-                <div class="nav-section">
-                    <div class="nav-section-title">Feature</div>
-                    <a href="/" class="nav-item {'active' if active_page == 'dashboard' else ''}"><i class="fas fa-tachometer-alt"></i> Dashboard</a>
-                    <a href="/analytics" class="nav-item {'active' if active_page == 'analytics' else ''}"><i class="fas fa-chart-line"></i> Analytics</a>
-                    <a href="/entities" class="nav-item {'active' if active_page == 'entities' else ''}"><i class="fas fa-users"></i> Entities</a>
-                    <a href="/security" class="nav-item {'active' if active_page == 'security' else ''}"><i class="fas fa-shield-alt"></i> Security</a>
-                    <a href="/monitoring" class="nav-item {'active' if active_page == 'monitoring' else ''}"><i class="fas fa-video"></i> Monitoring</a>
-                </div>
-                <div class="nav-section">
-                    <div class="nav-section-title">Others</div>
-                    <a href="/settings" class="nav-item {'active' if active_page == 'settings' else ''}"><i class="fas fa-cog"></i> Setting</a>
-                </div>
-            </nav>
-        </div>
-        <div class="main-content">
-            <div class="header">
-                <h1>{page_title}</h1>
-            </div>
-            {content}
-        </div>
-    </body>
-    </html>
-    """
+    return "".join(render_page_parts(page_title, content, active_page))
+
+def render_page_parts(page_title, content, active_page="dashboard"):
+    """Rendered (head, body) halves of the page template"""
+    head = PAGE_HEAD_TEMPLATE.render(
+        title=page_title, preloads=PAGE_PRELOADS.get(active_page, ()),
+        nav=NAV_HTML[active_page], css_version=APP_CSS_VERSION
+    )
+    body = PAGE_BODY_TEMPLATE.render(title=page_title, content=content)
+    return inline_icons(head), inline_icons(body)
+
+def stream_page_template(request: Request, page):
+    """Stream a pre-rendered page, flushing <head> and sidebar before the page body"""
+    headers = {'ETag': PAGE_ETAGS[page], 'Cache-Control': 'public, max-age=60', 'Vary': 'Accept-Encoding'}
+    head, body = PAGE_PARTS[page]
+    if accepts_gzip(request):
+        head, body = PAGE_PARTS_GZIP[page]
+        headers['ETag'] = PAGE_ETAGS[page][:-1] + '-gzip"'
+        headers['Content-Encoding'] = 'gzip'
+    
+    if request.headers.get('if-none-match') == headers['ETag']:
+        headers.pop('Content-Encoding', None)
+        return Response(status_code=304, headers=headers)
+    
+    async def chunks():
+        yield head
+        await asyncio.sleep(0)
+        yield body
+
+    return StreamingResponse(chunks(), media_type="text/html", headers=headers)
+
+# Page shell and bodies kept as Jinja2 templates on disk; compiled bytecode is cached across restarts
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+template_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+PAGE_HEAD_TEMPLATE = template_env.get_template("page_head.html")
+PAGE_BODY_TEMPLATE = template_env.get_template("page_body.html")
+PAGE_HEADER_TEMPLATE = template_env.get_template("page_header.html")
+PAGE_NAV_TEMPLATE = template_env.get_template("page_nav.html")
+
+# Sidebar pages: key -> (title, rendered body)
+PAGES = {
+    "analytics": ("Analytics", template_env.get_template("analytics.html").render()),
+    "entities": ("Entities", template_env.get_template("entities.html").render()),
+    "security": ("Security", template_env.get_template("security.html").render()),
+    "monitoring": ("Monitoring", template_env.get_template("monitoring.html").render()),
+    "settings": ("Settings", template_env.get_template("settings.html").render()),
+}
+
+# Shared stylesheet, versioned by content hash so browsers can cache it indefinitely
+APP_CSS_VERSION = hashlib.md5((STATIC_DIR / "app.css").read_bytes()).hexdigest()[:8]
+
+NAV_SECTIONS = (
+    ("Feature", (
+        ("dashboard", "/", "tachometer-alt", "Dashboard"),
+        ("analytics", "/analytics", "chart-line", "Analytics"),
+        ("entities", "/entities", "users", "Entities"),
+        ("security", "/security", "shield-alt", "Security"),
+        ("monitoring", "/monitoring", "video", "Monitoring"),
+    )),
+    ("Others", (
+        ("settings", "/settings", "cog", "Setting"),
+    )),
+)
+
+# Sidebar links rendered once per active page, looked up by page key
+NAV_HTML = {
+    key: PAGE_NAV_TEMPLATE.render(active_page=key, nav_sections=NAV_SECTIONS)
+    for _, links in NAV_SECTIONS for key, *_ in links
+}
+
+# Data each page fetches on load, preloaded from <head> so the request overlaps HTML parsing
+PAGE_PRELOADS = {
+    "entities": ("/api/bootstrap",),
+}
 
-@app.get("/api/entities")
-async def get_entities_api():
-    """Get all entities with details"""
+# Pages are fully static: render and UTF-8 encode each one once at import so handlers return bytes as-is
+DASHBOARD_HTML = dashboard_html().encode("utf-8")
+PAGE_HTML = {page: create_page_template(title, content, page).encode("utf-8") for page, (title, content) in PAGES.items()}
+PAGE_PARTS = {
+    page: tuple(part.encode("utf-8") for part in render_page_parts(title, content, page))
+    for page, (title, content) in PAGES.items()
+}
+PAGE_FRAGMENTS = {page: render_page_fragment(title, content).encode("utf-8") for page, (title, content) in PAGES.items()}
+DASHBOARD_ETAG = f'"{hashlib.blake2b(DASHBOARD_HTML, digest_size=16).hexdigest()}"'
+PAGE_ETAGS = {page: f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"' for page, body in PAGE_HTML.items()}
+
+# Gzip variants compressed once at import, so the middleware never recompresses page HTML per request
+DASHBOARD_GZIP = gzip_chunks(DASHBOARD_HTML)[0]
+PAGE_GZIP = {page: gzip_chunks(body)[0] for page, body in PAGE_HTML.items()}
+PAGE_PARTS_GZIP = {page: gzip_chunks(*parts) for page, parts in PAGE_PARTS.items()}
+PAGE_FRAGMENTS_GZIP = {page: gzip_chunks(body)[0] for page, body in PAGE_FRAGMENTS.items()}
+
+def entity_status(last_seen_ts: Optional[float], now_ts: float):
+    """(last seen, status) labels for an entity from the epoch of its latest event"""
+    if last_seen_ts is None:
+        return "Unknown", "Away"
+    
+    hours_ago = (now_ts - last_seen_ts) / 3600.0
+    if hours_ago < 2:
+        return f"{int(hours_ago)} hour{'s' if hours_ago != 1 else ''} ago", "Active"
+    elif hours_ago < 24:
+        return f"{int(hours_ago)} hours ago", "Away"
+    else:
+        return f"{int(hours_ago/24)} days ago", "Away"
+
+@app.get("/api/page/{page}", response_class=HTMLResponse)
+async def get_page_fragment(request: Request, page: str):
+    """Main-content fragment of a sidebar page"""
+    if page not in PAGES:
+        raise HTTPException(status_code=404, detail="Page not found")
+    
+    headers = {'X-Page-Title': PAGES[page][0], 'Vary': 'Accept-Encoding'}
+    if accepts_gzip(request):
+        headers['Content-Encoding'] = 'gzip'
+        return Response(PAGE_FRAGMENTS_GZIP[page], media_type="text/html", headers=headers)
+    return Response(PAGE_FRAGMENTS[page], media_type="text/html", headers=headers)
+
+@app.get("/api/entities", response_model=None)
+async def get_entities_api(request: Request, after: Optional[str] = None, limit: int = Query(20, ge=1, le=100)):
+    """Get a page of entities with details, keyset-paginated on entity_id"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
     
-    entities = []
-    for entity_id, info in list(entity_profiles.items())[:20]:  # Limit to 20 for demo
-        # Get recent timeline to determine last seen
-        timeline = get_entity_timeline(entity_id, 24)
-        last_seen = "Unknown"
-        status = "Away"
-        
-        if timeline:
-            last_event = timeline[0]
-            last_seen_time = datetime.fromisoformat(last_event['timestamp'].replace('Z', '+00:00'))
-            hours_ago = (datetime.now() - last_seen_time.replace(tzinfo=None)).total_seconds() / 3600
-            
-            if hours_ago < 2:
-                last_seen = f"{int(hours_ago)} hour{'s' if hours_ago != 1 else ''} ago"
-                status = "Active"
-            elif hours_ago < 24:
-                last_seen = f"{int(hours_ago)} hours ago"
-                status = "Away"
-            else:
-                last_seen = f"{int(hours_ago/24)} days ago"
-                status = "Away"
-        
-        entities.append({
+    etag = data_etag()
+    return not_modified(request, etag) or etag_response(request, await run_blocking(list_entities, after, limit), etag)
+
+@ttl_cache(3.0)
+def list_entities(after: Optional[str], limit: int):
+    """Page of entity summaries following the `after` cursor"""
+    ids = entity_table['ids']
+    start = int(np.searchsorted(ids, after, side='right')) if after else 0
+    window = slice(start, start + limit)
+    page_ids = ids[window].tolist()
+    now_ts = now_epoch()
+    
+    items = []
+    columns = [entity_table[field][window] for field in ENTITY_TABLE_FIELDS]
+    for entity_id, name, role, department, card_id, initials in zip(page_ids, *columns):
+        last_seen, status = entity_status(entity_last_seen.get(entity_id), now_ts)
+        items.append({
             'entity_id': entity_id,
-            'name': info['name'],
-            'role': info['role'],
-            'department': info['department'],
-            'card_id': info.get('card_id', ''),
+            'name': name,
+            'role': role,
+            'department': department,
+            'card_id': card_id,
             'last_seen': last_seen,
             'status': status,
-            'initials': ''.join([n[0] for n in info['name'].split()[:2]]).upper()
+            'initials': initials
         })
+    has_more = start + len(items) < len(ids)
     
-    return entities
+    return {
+        'items': items,
+        'total': len(ids),
+        'next_cursor': items[-1]['entity_id'] if items and has_more else None
+    }
 
-@app.get("/api/entity/{entity_id}")
-async def get_entity_details(entity_id: str):
+@app.get("/api/entity/{entity_id}", response_model=None)
+async def get_entity_details(request: Request, entity_id: str):
     """Get detailed entity information"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
@@ -1912,12 +1373,16 @@ async def get_entity_details(entity_id: str):
         raise HTTPException(status_code=404, detail="Entity not found")
     
     info = entity_profiles[entity_id]
-    timeline = get_entity_timeline(entity_id, 168)  # Last week
-    alerts = check_entity_alerts(entity_id)
+    # Timeline (last week) and alert scan are independent; run them concurrently
+    timeline, alerts = await asyncio.gather(
+        run_blocking(get_entity_timeline, entity_id, 168),
+        run_blocking(check_entity_alerts, entity_id)
+    )
     
-    return {
+    return etag_response(request, {
         'entity_id': entity_id,
         'name': info['name'],
+        'initials': info['initials'],
         'role': info['role'],
         'department': info['department'],
         'card_id': info.get('card_id', ''),
@@ -1926,76 +1391,88 @@ async def get_entity_details(entity_id: str):
         'timeline': timeline,
         'alerts': alerts,
         'total_activities': len(timeline)
-    }
+    })
 
-@app.get("/api/security/alerts")
-async def get_all_alerts():
+@app.get("/api/security/alerts", response_model=None)
+async def get_all_alerts(request: Request):
     """Get all security alerts"""
     if not entity_profiles:
         raise HTTPException(status_code=503, detail="System not ready")
     
-    all_alerts = []
-    # Check alerts for top entities
-    for entity_id in list(entity_profiles.keys())[:10]:
-        alerts = check_entity_alerts(entity_id)
-        all_alerts.extend(alerts)
+    etag = data_etag()
+    return not_modified(request, etag) or etag_response(request, await run_blocking(scan_alerts), etag)
+
+def scan_alerts():
+    """Refresh the alert index from the latest activity and return the newest alerts"""
+    # Check alerts for top entities, scanning their activity in one batch
+    entity_ids = list(entity_profiles.keys())[:10]
+    raised = scan_entity_alerts(entity_ids, 48)
+    for entity_id in entity_ids:
+        sync_alerts(entity_id, raised.get(entity_id, []))
     
     # Add some mock alerts for demo
-    mock_alerts = [
-        {
-            'alert_id': 'ALT001',
-            'entity_id': 'E104001',
-            'alert_type': 'unusual_activity',
-            'severity': 'medium',
-            'timestamp': datetime.now().isoformat(),
-            'description': 'Multiple failed card swipe attempts detected at LAB_301',
-            'location': 'LAB_301',
-            'status': 'active'
-        },
-        {
-            'alert_id': 'ALT002',
-            'entity_id': 'UNKNOWN',
-            'alert_type': 'access_violation',
-            'severity': 'high',
-            'timestamp': (datetime.now() - timedelta(hours=4)).isoformat(),
-            'description': 'Unauthorized access attempt to restricted ADMIN_BLOCK area',
-            'location': 'ADMIN_BLOCK',
-            'status': 'active'
-        }
-    ]
+    if 'demo' not in active_alerts:
+        sync_alerts('demo', [
+            {
+                'alert_id': 'ALT001',
+                'entity_id': 'E104001',
+                'alert_type': 'unusual_activity',
+                'severity': 'medium',
+                'timestamp': datetime.now().isoformat(),
+                'description': 'Multiple failed card swipe attempts detected at LAB_301',
+                'location': 'LAB_301',
+                'status': 'active'
+            },
+            {
+                'alert_id': 'ALT002',
+                'entity_id': 'UNKNOWN',
+                'alert_type': 'access_violation',
+                'severity': 'high',
+                'timestamp': (datetime.now() - timedelta(hours=4)).isoformat(),
+                'description': 'Unauthorized access attempt to restricted ADMIN_BLOCK area',
+                'location': 'ADMIN_BLOCK',
+                'status': 'active'
+            }
+        ])
     
-    all_alerts.extend(mock_alerts)
-    return sorted(all_alerts, key=lambda x: x['timestamp'], reverse=True)
+    with alerts_lock:
+        return [alert for _, alert in alerts_index.islice(0, 100)]
 
-@app.post("/api/security/alert/{alert_id}/resolve")
+@app.post("/api/security/alert/{alert_id}/resolve", response_class=ORJSONResponse, response_model=None)
 async def resolve_alert(alert_id: str):
     """Resolve a security alert"""
-    return {
+    return ORJSONResponse({
         'alert_id': alert_id,
         'status': 'resolved',
         'resolved_at': datetime.now().isoformat(),
         'message': f'Alert {alert_id} has been resolved'
-    }
+    })
 
-@app.get("/api/debug/entities")
+@app.get("/api/debug/entities", response_class=ORJSONResponse, response_model=None)
 async def debug_entities():
     """Debug endpoint to see actual entities in dataset"""
     if not entity_profiles:
-        return {"error": "System not ready"}
+        return ORJSONResponse({"error": "System not ready"})
     
     # Return first 10 entities for debugging
     sample_entities = {}
     for i, (entity_id, info) in enumerate(list(entity_profiles.items())[:10]):
         sample_entities[entity_id] = info
     
-    return {
+    return ORJSONResponse({
         "total_entities": len(entity_profiles),
         "sample_entities": sample_entities
-    }
+    })
 
-@app.get("/api/status")
-async def get_status():
+@app.get("/api/status", response_class=ORJSONResponse, response_model=None)
+async def get_status(request: Request):
     """Get system status"""
+    etag = data_etag()
+    return not_modified(request, etag) or ORJSONResponse(system_status(), headers={'ETag': etag})
+
+@ttl_cache(3.0)
+def system_status():
+    """System status, rebuilt at most every few seconds for polling dashboards"""
     return {
         'system_ready': len(entity_profiles) > 0,
         'total_entities': len(entity_profiles),
@@ -2003,13 +1480,80 @@ async def get_status():
         'last_update': datetime.now().isoformat()
     }
 
+# Live activity feed: how often new events are looked up, and how often an idle stream is kept alive
+FEED_POLL_SECONDS = 2.0
+FEED_KEEPALIVE_SECONDS = 15.0
+HEATMAP_WINDOW_SECONDS = 3600
+
+@app.get("/api/monitoring/stream")
+async def monitoring_stream(request: Request):
+    """Server-sent events for the monitoring page: location heatmap counts, recent backlog, then batches of new events"""
+    if not entity_profiles:
+        raise HTTPException(status_code=503, detail="System not ready")
+    
+    async def event_gen():
+        now_ts = now_epoch()
+        events, last_ts = feed_events(float('-inf'), now_ts, 20)
+        heatmap = None
+        idle = 0.0
+        while True:
+            # Heatmap counts are sent only when they change; the browser does the drawing
+            counts = location_counts(now_ts - HEATMAP_WINDOW_SECONDS, now_ts)
+            if counts != heatmap:
+                heatmap = counts
+                yield b"event: heatmap\ndata: " + orjson.dumps(counts) + b"\n\n"
+            
+            # One frame per poll: the whole batch is serialized as a single JSON array
+            if events:
+                yield b"data: " + orjson.dumps(events) + b"\n\n"
+            elif idle >= FEED_KEEPALIVE_SECONDS:
+                yield b"event: ping\ndata: {}\n\n"
+                idle = 0.0
+            
+            await asyncio.sleep(FEED_POLL_SECONDS)
+            if await request.is_disconnected():
+                break
+            idle = 0.0 if events else idle + FEED_POLL_SECONDS
+            now_ts = now_epoch()
+            events, last_ts = feed_events(last_ts, now_ts)
+    
+    return StreamingResponse(
+        event_gen(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.get("/api/bootstrap", response_class=ORJSONResponse, response_model=None)
+async def bootstrap_api():
+    """First page of entities, security summary and system status in one response"""
+    if not entity_profiles:
+        raise HTTPException(status_code=503, detail="System not ready")
+    
+    alerts = await run_blocking(scan_alerts)
+    
+    return ORJSONResponse({
+        'entities': await run_blocking(list_entities, None, 5),
+        'security': {
+            'total_alerts': len(alerts),
+            'high_severity': sum(1 for alert in alerts if alert['severity'] == 'high'),
+            'recent_alerts': alerts[:5]
+        },
+        'monitoring': system_status()
+    })
+
 if __name__ == "__main__":
     logger.info("🚀 Starting HACKATHON READY Campus Security System")
     logger.info("🎯 Optimized for fast startup and real data processing")
     
+    # Workers each load their own copy of the data; uvloop and httptools come with uvicorn[standard]
     uvicorn.run(
-        app,
+        "hackathon_app:app",
         host="0.0.0.0",
         port=8001,
-        log_level="info"
+        workers=os.cpu_count() or 1,
+        loop="auto",
+        http="auto",
+        access_log=False,
+        log_level="info",
+        timeout_keep_alive=30
     )
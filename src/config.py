@@ -10,10 +10,12 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "Product_Dataset" / "Test_Dataset"
 OUTPUT_DIR = PROJECT_ROOT / "output"
 LOGS_DIR = PROJECT_ROOT / "logs"
+CACHE_DIR = OUTPUT_DIR / "cache"
 
 # Create directories if they don't exist
 OUTPUT_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
 
 # Data file paths
 DATA_FILES = {
@@ -35,7 +37,9 @@ ENTITY_RESOLUTION_CONFIG = {
     "time_window_minutes": 10,
     "location_match_weight": 0.3,
     "temporal_match_weight": 0.4,
-    "identifier_match_weight": 0.3
+    "identifier_match_weight": 0.3,
+    "scoring_workers": -1,
+    "cache_results": True
 }
 
 # Multi-Modal Fusion Configuration
@@ -61,7 +65,11 @@ PREDICTION_CONFIG = {
     "missing_data_threshold_hours": 1,
     "prediction_confidence_threshold": 0.6,
     "anomaly_detection_threshold": 0.8,
-    "alert_absence_hours": 12
+    "alert_absence_hours": 12,
+    "cache_models": True,
+    "model_compression": 3,
+    "skip_uninformed_predictions": False,
+    "n_jobs": -1
 }
 
 # Security Dashboard Configuration
@@ -13,6 +13,16 @@ import io
 
 from .config import DATA_FILES, CAMPUS_LOCATIONS, ENTITY_TYPES
 
+# Low-cardinality label columns stored as pandas categoricals, per source
+CATEGORY_COLUMNS = {
+    'profiles': ['role', 'department', 'entity_type'],
+    'card_swipes': ['location_id', 'location_name'],
+    'cctv_frames': ['location_id'],
+    'notes': ['category'],
+    'lab_bookings': ['room_id'],
+    'wifi_logs': ['ap_id', 'location_from_ap']
+}
+
 
 class CampusDataLoader:
     """Handles loading and preprocessing of all campus data sources"""
@@ -20,10 +30,12 @@ class CampusDataLoader:
     def __init__(self):
         self.data = {}
         self.processed_data = {}
+        self._groups = {}
         
     def load_all_data(self) -> Dict[str, pd.DataFrame]:
         """Load all data sources into memory"""
         logger.info("Loading all campus data sources...")
+        self._groups = {}
         
         # Load structured data
         self.data['profiles'] = self._load_profiles()
@@ -35,6 +47,9 @@ class CampusDataLoader:
         self.data['library_checkouts'] = self._load_library_checkouts()
         self.data['wifi_logs'] = self._load_wifi_logs()
         
+        for source_name, df in self.data.items():
+            self._compact_dtypes(df, CATEGORY_COLUMNS.get(source_name, []))
+        
         logger.info(f"Loaded {len(self.data)} data sources successfully")
         return self.data
     
@@ -160,75 +175,53 @@ class CampusDataLoader:
         logger.info(f"Loaded {len(df)} WiFi association records")
         return df
     
+    def _compact_dtypes(self, df: pd.DataFrame, category_columns: List[str]):
+        """Store label columns as categoricals and downcast integer columns in place"""
+        for col in category_columns:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        for col in df.select_dtypes(include='integer').columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    
     def get_entity_data(self, entity_id: str) -> Dict[str, pd.DataFrame]:
         """Get all data related to a specific entity"""
         entity_data = {}
         
         # Profile data
-        if 'profiles' in self.data:
-            entity_data['profile'] = self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]
-        
-        # Card swipes
-        if 'card_swipes' in self.data and 'profiles' in self.data:
-            card_id = self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]['card_id'].iloc[0] if len(self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]) > 0 else None
-            
-            if card_id:
-                entity_data['card_swipes'] = self.data['card_swipes'][
-                    self.data['card_swipes']['card_id'] == card_id
-                ]
-        
-        # CCTV frames
-        if 'cctv_frames' in self.data and 'profiles' in self.data:
-            face_id = self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]['face_id'].iloc[0] if len(self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]) > 0 else None
-            
-            if face_id:
-                entity_data['cctv_frames'] = self.data['cctv_frames'][
-                    self.data['cctv_frames']['face_id'] == face_id
-                ]
-        
-        # WiFi logs
-        if 'wifi_logs' in self.data and 'profiles' in self.data:
-            device_hash = self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]['device_hash'].iloc[0] if len(self.data['profiles'][
-                self.data['profiles']['entity_id'] == entity_id
-            ]) > 0 else None
-            
-            if device_hash:
-                entity_data['wifi_logs'] = self.data['wifi_logs'][
-                    self.data['wifi_logs']['device_hash'] == device_hash
-                ]
-        
-        # Notes
-        if 'notes' in self.data:
-            entity_data['notes'] = self.data['notes'][
-                self.data['notes']['entity_id'] == entity_id
-            ]
-        
-        # Lab bookings
-        if 'lab_bookings' in self.data:
-            entity_data['lab_bookings'] = self.data['lab_bookings'][
-                self.data['lab_bookings']['entity_id'] == entity_id
-            ]
-        
-        # Library checkouts
-        if 'library_checkouts' in self.data:
-            entity_data['library_checkouts'] = self.data['library_checkouts'][
-                self.data['library_checkouts']['entity_id'] == entity_id
-            ]
+        profile = self._rows('profiles', 'entity_id', entity_id) if 'profiles' in self.data else None
+        if profile is not None:
+            entity_data['profile'] = profile
+        
+        # Card swipes, CCTV frames and WiFi logs are keyed by the profile's identifiers
+        linked_sources = [
+            ('card_swipes', 'card_id'),
+            ('cctv_frames', 'face_id'),
+            ('wifi_logs', 'device_hash')
+        ]
+        for source, column in linked_sources:
+            if source in self.data and profile is not None:
+                identifier = profile[column].iloc[0] if len(profile) > 0 else None
+                if identifier:
+                    entity_data[source] = self._rows(source, column, identifier)
+        
+        # Notes, lab bookings and library checkouts carry the entity id directly
+        for source in ['notes', 'lab_bookings', 'library_checkouts']:
+            if source in self.data:
+                entity_data[source] = self._rows(source, 'entity_id', entity_id)
         
         return entity_data
     
+    def _rows(self, source: str, column: str, value) -> pd.DataFrame:
+        """Rows of a source whose column equals value, via a groupby built once per column"""
+        df = self.data[source]
+        positions = self._groups.get((source, column))
+        if positions is None:
+            positions = self._groups[(source, column)] = df.groupby(column, sort=False).indices
+        
+        rows = positions.get(value)
+        return df.iloc[rows] if rows is not None else df.iloc[:0]
+    
     def get_data_summary(self) -> Dict[str, Dict]:
         """Get summary statistics for all loaded data"""
         summary = {}
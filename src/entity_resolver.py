@@ -6,17 +6,65 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
-from fuzzywuzzy import fuzz, process
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Indel
+from rapidfuzz.utils import default_process
 import networkx as nx
+from scipy import sparse
+from scipy.sparse import csgraph
 from sklearn.cluster import DBSCAN
 from sklearn.metrics.pairwise import cosine_similarity
 from loguru import logger
 import re
+import hashlib
+import pickle
+from pathlib import Path
 
-from .config import ENTITY_RESOLUTION_CONFIG
+from .config import ENTITY_RESOLUTION_CONFIG, CACHE_DIR
 
+# Bump when resolver output changes so stale cached results are not reused
+RESULT_CACHE_VERSION = 2
 
-@dataclass
+# Datasets read by the resolver; only these feed the result cache key
+SOURCE_DATASETS = ['profiles', 'card_swipes', 'wifi_logs', 'cctv_frames', 'notes']
+
+# Profile columns carried onto each profile entity record
+PROFILE_FIELDS = [
+    'entity_id', 'name', 'email', 'role', 'department',
+    'student_id', 'staff_id', 'card_id', 'device_hash', 'face_id'
+]
+
+# Confidence assigned to pairs sharing an identifier; records are only paired within these blocks
+DIRECT_MATCH_CONFIDENCE = {'entity_id': 1.0, 'card_id': 0.95, 'device_hash': 0.90, 'face_id': 0.85}
+
+# Weight each soft signal carries in the overall match confidence
+SIGNAL_WEIGHTS = {'name': 0.8, 'email': 0.7, 'temporal': 0.6, 'location': 0.5}
+
+# Minimum local-part similarity (0-100) for an email pair to count as evidence
+EMAIL_SIMILARITY_CUTOFF = 80
+
+# Soft-signal columns of the match table, mapped to their SIGNAL_WEIGHTS entry
+SIGNAL_COLUMNS = {
+    'name_similarity': 'name',
+    'email_similarity': 'email',
+    'temporal_correlation': 'temporal',
+    'location_correlation': 'location'
+}
+
+# Record fields listing the locations or access points an entity was seen at
+LOCATION_FIELDS = ['locations_visited', 'locations_detected', 'access_points']
+
+# Record fields holding activity timestamps used for temporal correlation
+TIMESTAMP_FIELDS = ['first_seen', 'last_seen', 'first_note', 'last_note']
+
+# Leading characters of each name token used as the fuzzy-name blocking key
+NAME_BLOCK_PREFIX = 4
+
+# Minimum name-token Jaccard overlap before a pair is handed to the fuzzy name scorer
+NAME_TOKEN_JACCARD = 0.3
+
+
+@dataclass(slots=True)
 class EntityMatch:
     """Represents a potential entity match between records"""
     source_id: str
@@ -28,7 +76,7 @@ class EntityMatch:
     evidence: Dict[str, any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedEntity:
     """Represents a resolved entity with unified identifiers"""
     unified_id: str
@@ -37,6 +85,7 @@ class ResolvedEntity:
     identifiers: Dict[str, Set[str]]
     confidence: float
     primary_profile: Dict[str, any]
+    primary_entity_id: Optional[str] = None
 
 
 class EntityResolver:
@@ -47,9 +96,14 @@ class EntityResolver:
     
     def __init__(self, config: Dict = None):
         self.config = config or ENTITY_RESOLUTION_CONFIG
-        self.entity_graph = nx.Graph()
+        self._matches = self._empty_matches()
+        self._entity_graph = None
+        self._graph_size = (0, 0)
         self.resolved_entities = {}
         self.match_cache = {}
+        self._features = {}
+        self._identifier_index = {}
+        self._indexed_entities = []
         
     def resolve_entities(self, data: Dict[str, pd.DataFrame]) -> Dict[str, ResolvedEntity]:
         """
@@ -58,50 +112,107 @@ class EntityResolver:
         """
         logger.info("Starting entity resolution process...")
         
+        cache_path = self._cache_path(data) if self.config.get('cache_results', True) else None
+        if cache_path is not None and self._load_cached_result(cache_path):
+            logger.info(f"Loaded {len(self.resolved_entities)} resolved entities from cache")
+            return self.resolved_entities
+        
         # Step 1: Extract all potential entity records
         entity_records = self._extract_entity_records(data)
         logger.info(f"Extracted {len(entity_records)} entity records")
+        self._features = self._record_features(entity_records)
         
         # Step 2: Find potential matches using multiple strategies
         matches = self._find_entity_matches(entity_records)
         logger.info(f"Found {len(matches)} potential matches")
         
-        # Step 3: Build entity graph
-        self._build_entity_graph(matches)
-        logger.info(f"Built entity graph with {self.entity_graph.number_of_nodes()} nodes")
+        # Step 3: Keep matches; the networkx graph is only built if something asks for it
+        self._matches = matches
+        self._entity_graph = None
         
         # Step 4: Cluster entities using graph analysis
-        entity_clusters = self._cluster_entities()
+        entity_clusters, cluster_confidences = self._cluster_entities(matches)
+        logger.info(f"Built entity graph with {self._graph_size[0]} nodes")
         logger.info(f"Identified {len(entity_clusters)} entity clusters")
         
         # Step 5: Create resolved entities
-        self.resolved_entities = self._create_resolved_entities(entity_clusters, entity_records)
+        self.resolved_entities = self._create_resolved_entities(entity_clusters, cluster_confidences, entity_records)
+        self._build_identifier_index()
         logger.info(f"Resolved {len(self.resolved_entities)} unique entities")
         
+        if cache_path is not None:
+            self._save_cached_result(cache_path)
+        
         return self.resolved_entities
     
+    def _cache_path(self, data: Dict[str, pd.DataFrame]) -> Optional[Path]:
+        """Result cache file keyed by the source data contents and resolver config"""
+        digest = hashlib.sha256(f"{RESULT_CACHE_VERSION}:{sorted(self.config.items())!r}".encode())
+        
+        try:
+            for name in SOURCE_DATASETS:
+                df = data.get(name)
+                if df is None:
+                    continue
+                digest.update(f"{name}:{list(df.columns)!r}".encode())
+                digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cell values (e.g. lists) just disable caching for this input
+            return None
+        
+        return CACHE_DIR / f"resolved_{digest.hexdigest()[:32]}.pkl"
+    
+    def _load_cached_result(self, path: Path) -> bool:
+        """Restore a previous run's results; returns False when there is no usable cache entry"""
+        if not path.exists():
+            return False
+        
+        try:
+            state = pickle.loads(path.read_bytes())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable resolver cache {path.name}: {e}")
+            return False
+        
+        self.resolved_entities = state['resolved_entities']
+        self._matches = state['matches']
+        self._features = state['features']
+        self._graph_size = state['graph_size']
+        self._entity_graph = None
+        self._build_identifier_index()
+        return True
+    
+    def _save_cached_result(self, path: Path):
+        """Persist this run's results for reuse on identical input"""
+        state = {
+            'resolved_entities': self.resolved_entities,
+            'matches': self._matches,
+            # Only what the lazy entity graph needs to materialize matches
+            'features': {key: self._features[key] for key in ('record_ids', 'datasets', 'entity_ids')},
+            'graph_size': self._graph_size
+        }
+        
+        try:
+            temp_path = path.with_suffix('.tmp')
+            temp_path.write_bytes(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            temp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write resolver cache {path.name}: {e}")
+    
     def _extract_entity_records(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
         """Extract all records that could represent entities"""
         entity_records = []
         
         # Primary source: profiles
         if 'profiles' in data:
-            for _, row in data['profiles'].iterrows():
-                record = {
-                    'record_id': f"profile_{row['entity_id']}",
-                    'dataset': 'profiles',
-                    'entity_id': row['entity_id'],
-                    'name': row['name'],
-                    'email': row['email'],
-                    'role': row['role'],
-                    'department': row['department'],
-                    'student_id': row.get('student_id'),
-                    'staff_id': row.get('staff_id'),
-                    'card_id': row['card_id'],
-                    'device_hash': row['device_hash'],
-                    'face_id': row['face_id']
-                }
-                entity_records.append(record)
+            profiles = data['profiles']
+            records = profiles.reindex(columns=PROFILE_FIELDS)
+            records.insert(0, 'record_id', 'profile_' + profiles['entity_id'].astype(str))
+            records.insert(1, 'dataset', 'profiles')
+            # Normalize names once here so scorers can run with processor=None
+            records['name_norm'] = [
+                default_process(name) if isinstance(name, str) else '' for name in records['name']
+            ]
+            entity_records.extend(records.to_dict(orient='records'))
         
         # Secondary sources: infer entities from other datasets
         entity_records.extend(self._extract_from_card_swipes(data.get('card_swipes')))
@@ -113,315 +224,466 @@ class EntityResolver:
     
     def _extract_from_card_swipes(self, df: Optional[pd.DataFrame]) -> List[Dict]:
         """Extract entity records from card swipe data"""
-        if df is None or df.empty:
-            return []
-        
-        records = []
-        unique_cards = df['card_id'].unique()
-        
-        for card_id in unique_cards:
-            card_data = df[df['card_id'] == card_id]
-            record = {
-                'record_id': f"card_{card_id}",
-                'dataset': 'card_swipes',
-                'card_id': card_id,
-                'first_seen': card_data['timestamp'].min(),
-                'last_seen': card_data['timestamp'].max(),
-                'locations_visited': card_data['location_id'].unique().tolist(),
-                'total_swipes': len(card_data)
-            }
-            records.append(record)
-        
-        return records
+        return self._aggregate_records(
+            df, 'card_id', 'card', 'card_swipes',
+            count_field='total_swipes', values_field='locations_visited', values_column='location_id'
+        )
     
     def _extract_from_wifi_logs(self, df: Optional[pd.DataFrame]) -> List[Dict]:
         """Extract entity records from WiFi logs"""
-        if df is None or df.empty:
-            return []
-        
-        records = []
-        unique_devices = df['device_hash'].unique()
-        
-        for device_hash in unique_devices:
-            device_data = df[df['device_hash'] == device_hash]
-            record = {
-                'record_id': f"wifi_{device_hash}",
-                'dataset': 'wifi_logs',
-                'device_hash': device_hash,
-                'first_seen': device_data['timestamp'].min(),
-                'last_seen': device_data['timestamp'].max(),
-                'access_points': device_data['ap_id'].unique().tolist(),
-                'total_connections': len(device_data)
-            }
-            records.append(record)
-        
-        return records
+        return self._aggregate_records(
+            df, 'device_hash', 'wifi', 'wifi_logs',
+            count_field='total_connections', values_field='access_points', values_column='ap_id'
+        )
     
     def _extract_from_cctv_frames(self, df: Optional[pd.DataFrame]) -> List[Dict]:
         """Extract entity records from CCTV frames"""
-        if df is None or df.empty:
-            return []
-        
-        records = []
-        unique_faces = df[df['face_id'].notna()]['face_id'].unique()
-        
-        for face_id in unique_faces:
-            face_data = df[df['face_id'] == face_id]
-            record = {
-                'record_id': f"face_{face_id}",
-                'dataset': 'cctv_frames',
-                'face_id': face_id,
-                'first_seen': face_data['timestamp'].min(),
-                'last_seen': face_data['timestamp'].max(),
-                'locations_detected': face_data['location_id'].unique().tolist(),
-                'total_detections': len(face_data)
-            }
-            records.append(record)
-        
-        return records
+        return self._aggregate_records(
+            df, 'face_id', 'face', 'cctv_frames',
+            count_field='total_detections', values_field='locations_detected', values_column='location_id'
+        )
     
     def _extract_from_notes(self, df: Optional[pd.DataFrame]) -> List[Dict]:
         """Extract entity records from text notes"""
+        return self._aggregate_records(
+            df, 'entity_id', 'notes', 'notes',
+            count_field='total_notes', values_field='note_categories', values_column='category',
+            time_fields=('first_note', 'last_note')
+        )
+    
+    def _aggregate_records(self, df: Optional[pd.DataFrame], key: str, prefix: str, dataset: str,
+                           count_field: str, values_field: str, values_column: str,
+                           time_fields: Tuple[str, str] = ('first_seen', 'last_seen')) -> List[Dict]:
+        """Collapse a dataset into one entity record per key value in a single groupby pass"""
         if df is None or df.empty:
             return []
         
-        records = []
-        unique_entities = df['entity_id'].unique()
-        
-        for entity_id in unique_entities:
-            entity_data = df[df['entity_id'] == entity_id]
-            record = {
-                'record_id': f"notes_{entity_id}",
-                'dataset': 'notes',
-                'entity_id': entity_id,
-                'note_categories': entity_data['category'].unique().tolist(),
-                'total_notes': len(entity_data),
-                'first_note': entity_data['timestamp'].min(),
-                'last_note': entity_data['timestamp'].max()
-            }
-            records.append(record)
-        
-        return records
+        grouped = df.groupby(key, sort=False)
+        first_field, last_field = time_fields
+        records = grouped.agg(**{
+            first_field: ('timestamp', 'min'),
+            last_field: ('timestamp', 'max'),
+            count_field: ('timestamp', 'size')
+        })
+        records[values_field] = grouped[values_column].unique().map(lambda values: values.tolist())
+        records = records.reset_index()
+        records.insert(0, 'record_id', prefix + '_' + records[key].astype(str))
+        records.insert(1, 'dataset', dataset)
+        
+        return records.to_dict(orient='records')
     
-    def _find_entity_matches(self, entity_records: List[Dict]) -> List[EntityMatch]:
-        """Find potential matches between entity records"""
-        matches = []
-        
-        # Limit comparison for performance - only compare first 1000 records
-        limited_records = entity_records[:1000]
-        
-        for i, record1 in enumerate(limited_records):
-            for j, record2 in enumerate(limited_records[i+1:], i+1):
-                match = self._compare_records(record1, record2)
-                if match and match.confidence >= self.config['fuzzy_match_threshold']:
-                    matches.append(match)
-        
-        return matches
+    def _find_entity_matches(self, entity_records: List[Dict]) -> pd.DataFrame:
+        """Find potential matches between entity records as a table of record-index pairs"""
+        n = len(entity_records)
+        if n < 2:
+            return self._empty_matches()
+        
+        features = self._features
+        names, locations, timestamps = features['names'], features['locations'], features['timestamps']
+        keys = self._blocking_keys(entity_records, names)
+        is_name_key = keys['field'] == 'name'
+        
+        direct = self._find_direct_matches(n, keys[~is_name_key])
+        candidate_codes = self._name_candidate_codes(keys[is_name_key], names, n)
+        if SIGNAL_WEIGHTS['email'] >= self.config['fuzzy_match_threshold']:
+            email_codes = self._email_candidate_codes(features['local_parts'], features['domains'], n)
+            candidate_codes = np.union1d(candidate_codes, email_codes)
+        if SIGNAL_WEIGHTS['location'] >= self.config['fuzzy_match_threshold']:
+            candidate_codes = np.union1d(candidate_codes, self._location_candidate_codes(locations, n))
+        if SIGNAL_WEIGHTS['temporal'] >= self.config['fuzzy_match_threshold']:
+            candidate_codes = np.union1d(candidate_codes, self._temporal_candidate_codes(timestamps, n))
+        
+        # Fuzzy scoring only runs on block pairs not already linked by an identifier
+        fuzzy_codes = np.setdiff1d(candidate_codes, direct['code'].to_numpy())
+        fuzzy = self._score_pairs(fuzzy_codes // n, fuzzy_codes % n)
+        fuzzy.insert(0, 'code', fuzzy_codes[fuzzy.pop('pair').to_numpy()])
+        
+        # Keep pair order stable so cluster numbering does not depend on match strategy
+        matches = pd.concat([direct, fuzzy], ignore_index=True).sort_values('code', kind='stable')
+        codes = matches.pop('code').to_numpy()
+        matches.insert(0, 'source', (codes // n).astype(np.int32))
+        matches.insert(1, 'target', (codes % n).astype(np.int32))
+        return matches.reset_index(drop=True)
     
-    def _compare_records(self, record1: Dict, record2: Dict) -> Optional[EntityMatch]:
-        """Compare two records and determine if they might represent the same entity"""
-        evidence = {}
-        confidence_scores = []
-        
-        # Direct identifier matches (highest confidence)
-        if self._check_direct_match(record1, record2, 'entity_id'):
-            return EntityMatch(
-                source_id=record1['record_id'],
-                target_id=record2['record_id'],
-                source_dataset=record1['dataset'],
-                target_dataset=record2['dataset'],
-                confidence=1.0,
-                match_type='direct_entity_id',
-                evidence={'entity_id': record1.get('entity_id')}
+    def _empty_matches(self) -> pd.DataFrame:
+        """Match table with no rows"""
+        return pd.DataFrame({
+            'source': np.array([], dtype=np.int32),
+            'target': np.array([], dtype=np.int32),
+            'confidence': np.array([], dtype=np.float64),
+            'match_type': np.array([], dtype=object),
+            'shared_ids': np.array([], dtype=object),
+            **{column: np.array([], dtype=np.float64) for column in SIGNAL_COLUMNS}
+        })
+    
+    def _match_objects(self, matches: pd.DataFrame) -> List[EntityMatch]:
+        """Materialize rows of the match table as EntityMatch records with their evidence"""
+        record_ids, datasets = self._features['record_ids'], self._features['datasets']
+        signals = {column: matches[column].to_numpy() for column in SIGNAL_COLUMNS}
+        
+        objects = []
+        for k, (source, target, confidence, match_type, shared_ids) in enumerate(zip(
+            matches['source'].tolist(), matches['target'].tolist(), matches['confidence'].tolist(),
+            matches['match_type'], matches['shared_ids']
+        )):
+            if match_type == 'direct_entity_id':
+                evidence = {'entity_id': self._features['entity_ids'][source]}
+            elif shared_ids:
+                evidence = {f"{field}_match": True for field in shared_ids}
+            else:
+                evidence = {column: float(values[k]) for column, values in signals.items() if not np.isnan(values[k])}
+            
+            objects.append(EntityMatch(
+                source_id=record_ids[source],
+                target_id=record_ids[target],
+                source_dataset=datasets[source],
+                target_dataset=datasets[target],
+                confidence=confidence,
+                match_type=match_type,
+                evidence=evidence
+            ))
+        
+        return objects
+    
+    def _record_features(self, entity_records: List[Dict]) -> Dict[str, any]:
+        """Precompute per-record comparison features once, aligned with record position"""
+        local_parts, domains = self._split_emails(entity_records)
+        return {
+            'record_ids': np.array([record['record_id'] for record in entity_records], dtype=object),
+            'datasets': np.array([record['dataset'] for record in entity_records], dtype=object),
+            'entity_ids': [record.get('entity_id') for record in entity_records],
+            'names': [record.get('name_norm', '') for record in entity_records],
+            'local_parts': local_parts,
+            'domains': domains,
+            'locations': self._location_matrix(entity_records),
+            'timestamps': self._timestamp_matrix(entity_records)
+        }
+    
+    def _blocking_keys(self, entity_records: List[Dict], names: List[str]) -> pd.DataFrame:
+        """Build a long (record index, field, integer block key) table for candidate generation"""
+        columns = {
+            field: pd.Series([record.get(field) for record in entity_records], dtype=object)
+            for field in DIRECT_MATCH_CONFIDENCE
+        }
+        # Token-prefix keys keep near-identical and reordered names in a shared block
+        columns['name'] = pd.Series(names, dtype=object).str.split().explode().str[:NAME_BLOCK_PREFIX]
+        
+        frames = []
+        offset = 0
+        for field, values in columns.items():
+            values = values.dropna()
+            # Integer codes turn block grouping into a numeric sort instead of string comparisons
+            codes, uniques = pd.factorize(values)
+            frames.append(pd.DataFrame({'idx': values.index, 'field': field, 'key': codes.astype(np.int64) + offset}))
+            offset += len(uniques)
+        
+        return pd.concat(frames, ignore_index=True).drop_duplicates(['idx', 'key'])
+    
+    def _block_pair_codes(self, keys: pd.DataFrame, n: int):
+        """Yield (field, sorted member indices, i * n + j pair codes) for every block with a pair"""
+        keys = keys.sort_values(['key', 'idx'], kind='stable')
+        block_keys = keys['key'].to_numpy()
+        record_idx = keys['idx'].to_numpy(dtype=np.int64)
+        fields = keys['field'].to_numpy()
+        
+        bounds = np.flatnonzero(np.diff(block_keys)) + 1
+        for start, end in zip(np.r_[0, bounds].tolist(), np.r_[bounds, len(block_keys)].tolist()):
+            if end - start < 2:
+                continue
+            members = record_idx[start:end]
+            left, right = np.triu_indices(len(members), k=1)
+            yield fields[start], members, members[left] * n + members[right]
+    
+    def _find_direct_matches(self, n: int, keys: pd.DataFrame) -> pd.DataFrame:
+        """Link every pair of records that share an identifier, keyed by pair code"""
+        codes, fields = [], []
+        for field, _, block_codes in self._block_pair_codes(keys, n):
+            codes.append(block_codes)
+            fields.append(np.full(len(block_codes), field, dtype=object))
+        if not codes:
+            return self._empty_matches().drop(columns=['source', 'target']).assign(code=np.array([], dtype=np.int64))
+        
+        shared = pd.DataFrame({'code': np.concatenate(codes), 'field': np.concatenate(fields)})
+        shared['confidence'] = shared['field'].map(DIRECT_MATCH_CONFIDENCE)
+        shared = shared.sort_values('confidence', ascending=False, kind='stable')
+        
+        # Strongest shared identifier decides the tier; every shared one is kept as evidence
+        best = shared.drop_duplicates('code').set_index('code').sort_index()
+        best = best[best['confidence'] >= self.config['fuzzy_match_threshold']]
+        shared_ids = shared.groupby('code')['field'].agg(tuple)
+        
+        return pd.DataFrame({
+            'code': best.index.to_numpy(dtype=np.int64),
+            'confidence': best['confidence'].to_numpy(dtype=np.float64),
+            'match_type': ('direct_' + best['field']).to_numpy(dtype=object),
+            'shared_ids': shared_ids.reindex(best.index).to_numpy(dtype=object),
+            **{column: np.full(len(best), np.nan) for column in SIGNAL_COLUMNS}
+        })
+    
+    @property
+    def _workers(self) -> int:
+        """Thread count for batched RapidFuzz scoring; -1 uses every core since scoring releases the GIL"""
+        return self.config.get('scoring_workers', -1)
+    
+    def _name_candidate_codes(self, keys: pd.DataFrame, names: List[str], n: int) -> np.ndarray:
+        """Return pair codes of records whose names score near the threshold within a name block"""
+        name_cutoff = int(self.config['name_similarity_threshold'] * 100)
+        codes = np.unique(np.concatenate(
+            [np.array([], dtype=np.int64)] + [block_codes for _, _, block_codes in self._block_pair_codes(keys, n)]
+        ))
+        if len(codes) == 0:
+            return codes
+        left, right = codes // n, codes % n
+        
+        # Cheap token-overlap prefilter; containment is kept since token-set ratio scores subsets as equal
+        tokens = sparse.csr_matrix(
+            (np.ones(len(keys)), (keys['idx'].to_numpy(), keys['key'].to_numpy() - keys['key'].min())),
+            shape=(n, keys['key'].max() - keys['key'].min() + 1)
+        )
+        sizes = np.asarray(tokens.sum(axis=1)).ravel()
+        shared = np.asarray(tokens[left].multiply(tokens[right]).sum(axis=1)).ravel()
+        overlap = (shared / (sizes[left] + sizes[right] - shared) >= NAME_TOKEN_JACCARD) | \
+            (shared == np.minimum(sizes[left], sizes[right]))
+        codes, left, right = codes[overlap], left[overlap], right[overlap]
+        
+        # Score the surviving pairs in one batched call and keep only pairs near the threshold
+        scores = process.cpdist(
+            [names[i] for i in left], [names[j] for j in right],
+            scorer=fuzz.token_set_ratio, processor=None,
+            score_cutoff=name_cutoff, dtype=np.uint8, workers=self._workers
+        )
+        return codes[scores >= name_cutoff]
+    
+    def _split_emails(self, entity_records: List[Dict]) -> Tuple[List[str], List[str]]:
+        """Split each record's email into normalized local part and domain"""
+        emails = pd.Series([record.get('email') for record in entity_records], dtype=object)
+        emails = emails.where(emails.map(lambda value: isinstance(value, str)), '')
+        parts = emails.str.strip().str.lower().str.partition('@')
+        return parts[0].tolist(), parts[2].tolist()
+    
+    def _email_candidate_codes(self, local_parts: List[str], domains: List[str], n: int) -> np.ndarray:
+        """Return pair codes of records in the same email domain with similar local parts"""
+        pair_codes = [np.array([], dtype=np.int64)]
+        
+        for domain, members in pd.Series(domains).groupby(domains, sort=False).indices.items():
+            if not domain or len(members) < 2:
+                continue
+            block_locals = [local_parts[i] for i in members]
+            scores = process.cdist(
+                block_locals, block_locals, scorer=fuzz.ratio,
+                score_cutoff=EMAIL_SIMILARITY_CUTOFF, dtype=np.uint8, workers=self._workers
             )
+            left, right = np.nonzero(np.triu(scores >= EMAIL_SIMILARITY_CUTOFF, k=1))
+            pair_codes.append(members[left] * n + members[right])
+        
+        return np.unique(np.concatenate(pair_codes))
+    
+    def _location_matrix(self, entity_records: List[Dict]) -> sparse.csr_matrix:
+        """Build a binary record x location incidence matrix"""
+        rows, values = [], []
+        for idx, record in enumerate(entity_records):
+            for field in LOCATION_FIELDS:
+                for location in record.get(field) or ():
+                    rows.append(idx)
+                    values.append(location)
+        
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        known = codes >= 0
+        matrix = sparse.csr_matrix(
+            (np.ones(known.sum()), (np.asarray(rows, dtype=np.int64)[known], codes[known])),
+            shape=(len(entity_records), len(uniques))
+        )
+        # Collapse repeated locations so each row is a set
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return matrix
+    
+    def _location_similarity(self, locations: sparse.csr_matrix, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Jaccard similarity of the location sets for each (left, right) record pair"""
+        if len(left) == 0:
+            return np.zeros(0)
+        
+        sizes = np.asarray(locations.sum(axis=1)).ravel()
+        intersection = np.asarray(locations[left].multiply(locations[right]).sum(axis=1)).ravel()
+        union = sizes[left] + sizes[right] - intersection
+        return np.divide(intersection, union, out=np.zeros(len(left)), where=union > 0)
+    
+    def _location_candidate_codes(self, locations: sparse.csr_matrix, n: int) -> np.ndarray:
+        """Return pair codes of records whose location sets overlap by more than half"""
+        sizes = np.asarray(locations.sum(axis=1)).ravel()
+        overlap = sparse.triu(locations @ locations.T, k=1).tocoo()
+        union = sizes[overlap.row] + sizes[overlap.col] - overlap.data
+        keep = overlap.data / union > 0.5
+        return np.unique(overlap.row[keep].astype(np.int64) * n + overlap.col[keep])
+    
+    def _timestamp_matrix(self, entity_records: List[Dict]) -> np.ndarray:
+        """Stack each record's activity timestamps as float minutes since epoch, NaN when absent"""
+        columns = [
+            pd.to_datetime(pd.Series([record.get(field) for record in entity_records], dtype=object))
+            for field in TIMESTAMP_FIELDS
+        ]
+        times = np.column_stack([
+            column.to_numpy(dtype='datetime64[ns]').astype(np.int64) for column in columns
+        ]).astype(np.float64) / 60e9
+        times[np.column_stack([column.isna().to_numpy() for column in columns])] = np.nan
+        return times
+    
+    def _temporal_similarity(self, timestamps: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Closeness of the nearest timestamps of each (left, right) record pair within the time window"""
+        if len(left) == 0:
+            return np.zeros(0)
+        
+        window = self.config['time_window_minutes']
+        gaps = np.abs(timestamps[left][:, :, None] - timestamps[right][:, None, :])
+        nearest = np.fmin.reduce(gaps.reshape(len(left), -1), axis=1)
+        return np.where(nearest <= window, 1.0 - nearest / window, 0.0)
+    
+    def _temporal_candidate_codes(self, timestamps: np.ndarray, n: int) -> np.ndarray:
+        """Return pair codes of records with timestamps inside the correlation window"""
+        rows, columns = np.nonzero(~np.isnan(timestamps))
+        order = np.argsort(timestamps[rows, columns], kind='stable')
+        times, owners = timestamps[rows, columns][order], rows[order].astype(np.int64)
+        
+        # Each timestamp pairs with every later one that falls within the window
+        ends = np.searchsorted(times, times + self.config['time_window_minutes'], side='right')
+        counts = ends - np.arange(len(times)) - 1
+        starts = np.repeat(np.arange(len(times)), counts)
+        partners = starts + 1 + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        
+        left, right = owners[starts], owners[partners]
+        distinct = left != right
+        low, high = np.minimum(left, right)[distinct], np.maximum(left, right)[distinct]
+        return np.unique(low * n + high)
+    
+    def _score_pairs(self, left: np.ndarray, right: np.ndarray) -> pd.DataFrame:
+        """Score candidate pairs on every soft signal at once and keep those above the match threshold"""
+        threshold = self.config['fuzzy_match_threshold']
+        scorers = {
+            'name_similarity': self._name_similarity,
+            'email_similarity': self._email_similarity,
+            'temporal_correlation': lambda a, b: self._temporal_similarity(self._features['timestamps'], a, b),
+            'location_correlation': lambda a, b: self._location_similarity(self._features['locations'], a, b)
+        }
+        cutoffs = {
+            'name_similarity': self.config['name_similarity_threshold'],
+            'email_similarity': EMAIL_SIMILARITY_CUTOFF / 100,
+            'temporal_correlation': 0.5,
+            'location_correlation': 0.5
+        }
         
-        # Card ID matches
-        if self._check_direct_match(record1, record2, 'card_id'):
-            confidence_scores.append(0.95)
-            evidence['card_id_match'] = True
-        
-        # Device hash matches
-        if self._check_direct_match(record1, record2, 'device_hash'):
-            confidence_scores.append(0.90)
-            evidence['device_hash_match'] = True
-        
-        # Face ID matches
-        if self._check_direct_match(record1, record2, 'face_id'):
-            confidence_scores.append(0.85)
-            evidence['face_id_match'] = True
-        
-        # Name similarity (fuzzy matching)
-        name_similarity = self._calculate_name_similarity(record1, record2)
-        if name_similarity > self.config['name_similarity_threshold']:
-            confidence_scores.append(name_similarity * 0.8)
-            evidence['name_similarity'] = name_similarity
-        
-        # Email similarity
-        email_similarity = self._calculate_email_similarity(record1, record2)
-        if email_similarity > 0.8:
-            confidence_scores.append(email_similarity * 0.7)
-            evidence['email_similarity'] = email_similarity
-        
-        # Temporal correlation
-        temporal_score = self._calculate_temporal_correlation(record1, record2)
-        if temporal_score > 0.5:
-            confidence_scores.append(temporal_score * 0.6)
-            evidence['temporal_correlation'] = temporal_score
-        
-        # Location correlation
-        location_score = self._calculate_location_correlation(record1, record2)
-        if location_score > 0.5:
-            confidence_scores.append(location_score * 0.5)
-            evidence['location_correlation'] = location_score
-        
-        # Calculate overall confidence
-        if confidence_scores:
-            overall_confidence = max(confidence_scores)  # Take the highest confidence indicator
+        # Overall confidence is the strongest weighted signal that cleared its own threshold
+        confidence = np.zeros(len(left))
+        evidence = {}
+        for column in sorted(scorers, key=lambda column: SIGNAL_WEIGHTS[SIGNAL_COLUMNS[column]], reverse=True):
+            weight = SIGNAL_WEIGHTS[SIGNAL_COLUMNS[column]]
+            
+            # A signal whose ceiling is below the threshold cannot create a match on its own,
+            # so it is only scored for evidence on pairs that have already matched
+            rows = np.arange(len(left)) if weight >= threshold else np.flatnonzero(confidence >= threshold)
+            scores = np.full(len(left), np.nan)
+            if len(rows):
+                scores[rows] = scorers[column](left[rows], right[rows])
             
-            if overall_confidence >= self.config['fuzzy_match_threshold']:
-                return EntityMatch(
-                    source_id=record1['record_id'],
-                    target_id=record2['record_id'],
-                    source_dataset=record1['dataset'],
-                    target_dataset=record2['dataset'],
-                    confidence=overall_confidence,
-                    match_type='fuzzy_match',
-                    evidence=evidence
-                )
-        
-        return None
-    
-    def _check_direct_match(self, record1: Dict, record2: Dict, field: str) -> bool:
-        """Check if two records have matching values for a specific field"""
-        val1 = record1.get(field)
-        val2 = record2.get(field)
-        return val1 is not None and val2 is not None and val1 == val2
-    
-    def _calculate_name_similarity(self, record1: Dict, record2: Dict) -> float:
-        """Calculate name similarity between two records"""
-        name1 = record1.get('name', '').strip().lower()
-        name2 = record2.get('name', '').strip().lower()
-        
-        if not name1 or not name2:
-            return 0.0
-        
-        # Use multiple fuzzy matching strategies
-        ratio = fuzz.ratio(name1, name2) / 100.0
-        token_sort_ratio = fuzz.token_sort_ratio(name1, name2) / 100.0
-        token_set_ratio = fuzz.token_set_ratio(name1, name2) / 100.0
-        
-        return max(ratio, token_sort_ratio, token_set_ratio)
-    
-    def _calculate_email_similarity(self, record1: Dict, record2: Dict) -> float:
-        """Calculate email similarity between two records"""
-        email1 = record1.get('email', '').strip().lower()
-        email2 = record2.get('email', '').strip().lower()
-        
-        if not email1 or not email2:
-            return 0.0
-        
-        return fuzz.ratio(email1, email2) / 100.0
-    
-    def _calculate_temporal_correlation(self, record1: Dict, record2: Dict) -> float:
-        """Calculate temporal correlation between records"""
-        # Look for overlapping time periods
-        times1 = self._extract_timestamps(record1)
-        times2 = self._extract_timestamps(record2)
-        
-        if not times1 or not times2:
-            return 0.0
-        
-        # Calculate overlap in active periods
-        overlap_score = 0.0
-        for t1 in times1:
-            for t2 in times2:
-                time_diff = abs((t1 - t2).total_seconds()) / 60  # minutes
-                if time_diff <= self.config['time_window_minutes']:
-                    overlap_score = max(overlap_score, 1.0 - (time_diff / self.config['time_window_minutes']))
-        
-        return overlap_score
-    
-    def _calculate_location_correlation(self, record1: Dict, record2: Dict) -> float:
-        """Calculate location correlation between records"""
-        locations1 = self._extract_locations(record1)
-        locations2 = self._extract_locations(record2)
-        
-        if not locations1 or not locations2:
-            return 0.0
-        
-        # Calculate Jaccard similarity
-        intersection = len(locations1.intersection(locations2))
-        union = len(locations1.union(locations2))
-        
-        return intersection / union if union > 0 else 0.0
-    
-    def _extract_timestamps(self, record: Dict) -> List:
-        """Extract timestamps from a record"""
-        timestamps = []
-        
-        for key in ['first_seen', 'last_seen', 'first_note', 'last_note']:
-            if key in record and record[key] is not None:
-                timestamps.append(pd.to_datetime(record[key]))
-        
-        return timestamps
-    
-    def _extract_locations(self, record: Dict) -> Set[str]:
-        """Extract locations from a record"""
-        locations = set()
-        
-        for key in ['locations_visited', 'locations_detected', 'access_points']:
-            if key in record and record[key]:
-                if isinstance(record[key], list):
-                    locations.update(record[key])
-                else:
-                    locations.add(record[key])
-        
-        return locations
-    
-    def _build_entity_graph(self, matches: List[EntityMatch]):
+            passed = scores > cutoffs[column]
+            confidence = np.maximum(confidence, np.where(passed, scores * weight, 0.0))
+            # Signals that did not clear their threshold are left out of the evidence
+            evidence[column] = np.where(passed, scores, np.nan)
+        
+        keep = np.flatnonzero(confidence >= threshold)
+        return pd.DataFrame({
+            'pair': keep,
+            'confidence': confidence[keep],
+            'match_type': np.full(len(keep), 'fuzzy_match', dtype=object),
+            'shared_ids': np.full(len(keep), None, dtype=object),
+            **{column: evidence[column][keep] for column in SIGNAL_COLUMNS}
+        })
+    
+    def _name_similarity(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Token-set name similarity for each (left, right) record pair"""
+        names = self._features['names']
+        
+        # Token-set ratio already covers plain and reordered-token matches
+        return process.cpdist(
+            [names[i] for i in left], [names[j] for j in right],
+            scorer=fuzz.token_set_ratio, processor=None, dtype=np.float64, workers=self._workers
+        ) / 100.0
+    
+    def _email_similarity(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Local-part similarity for each (left, right) record pair in the same email domain"""
+        local_parts = self._features['local_parts']
+        domains = np.asarray(self._features['domains'], dtype=object)
+        
+        same_domain = (domains[left] != '') & (domains[left] == domains[right])
+        scores = process.cpdist(
+            [local_parts[i] for i in left], [local_parts[j] for j in right],
+            scorer=Indel.normalized_similarity, dtype=np.float64, workers=self._workers
+        )
+        return np.where(same_domain, scores, 0.0)
+    
+    @property
+    def entity_graph(self) -> nx.Graph:
+        """Graph of entity relationships, built from the last run's matches on first access"""
+        if self._entity_graph is None:
+            self._entity_graph = self._build_entity_graph(self._matches)
+        return self._entity_graph
+    
+    def _build_entity_graph(self, matches: pd.DataFrame) -> nx.Graph:
         """Build a graph of entity relationships"""
-        self.entity_graph.clear()
-        
-        # Add all matches as edges
-        for match in matches:
-            self.entity_graph.add_edge(
-                match.source_id,
-                match.target_id,
-                weight=match.confidence,
-                match_type=match.match_type,
-                evidence=match.evidence
-            )
+        graph = nx.Graph()
+        graph.add_edges_from(
+            (match.source_id, match.target_id,
+             {'weight': match.confidence, 'match_type': match.match_type, 'evidence': match.evidence})
+            for match in self._match_objects(matches)
+        )
+        return graph
     
-    def _cluster_entities(self) -> List[Set[str]]:
-        """Cluster entities using graph-based community detection"""
-        if self.entity_graph.number_of_nodes() == 0:
-            return []
-        
-        # Use connected components for clustering
-        clusters = list(nx.connected_components(self.entity_graph))
-        
-        # Filter clusters by minimum confidence
-        filtered_clusters = []
-        for cluster in clusters:
-            if len(cluster) > 1:  # Only consider clusters with multiple nodes
-                # Calculate cluster confidence
-                subgraph = self.entity_graph.subgraph(cluster)
-                avg_confidence = np.mean([data['weight'] for _, _, data in subgraph.edges(data=True)])
-                
-                if avg_confidence >= self.config['fuzzy_match_threshold']:
-                    filtered_clusters.append(cluster)
-            else:
-                # Single node clusters are always valid
-                filtered_clusters.append(cluster)
-        
-        return filtered_clusters
+    def _cluster_entities(self, matches: pd.DataFrame) -> Tuple[List[Set[str]], List[float]]:
+        """Cluster entities into connected components of the match graph, with each cluster's confidence"""
+        if matches.empty:
+            self._graph_size = (0, 0)
+            return [], []
+        
+        # Interleave endpoints so node numbering follows first appearance in the match list
+        endpoints = np.column_stack([matches['source'].to_numpy(), matches['target'].to_numpy()])
+        endpoints = self._features['record_ids'][endpoints.ravel()]
+        codes, nodes = pd.factorize(endpoints)
+        n_nodes = len(nodes)
+        source, target = codes[0::2], codes[1::2]
+        weights = matches['confidence'].to_numpy(dtype=np.float64)
+        
+        # A repeated edge keeps its latest weight, as in the entity graph
+        pair_keys = np.minimum(source, target) * n_nodes + np.maximum(source, target)
+        _, last_seen = np.unique(pair_keys[::-1], return_index=True)
+        keep = np.sort(len(pair_keys) - 1 - last_seen)
+        source, target, weights = source[keep], target[keep], weights[keep]
+        self._graph_size = (n_nodes, len(keep))
+        
+        adjacency = sparse.coo_matrix((np.ones(len(weights)), (source, target)), shape=(n_nodes, n_nodes))
+        _, labels = csgraph.connected_components(adjacency, directed=False)
+        labels, _ = pd.factorize(labels)
+        n_clusters = labels.max() + 1
+        
+        # Filter clusters by mean edge confidence; single nodes are always valid
+        edge_labels = labels[source]
+        weight_sums = np.bincount(edge_labels, weights=weights, minlength=n_clusters)
+        edge_counts = np.bincount(edge_labels, minlength=n_clusters)
+        sizes = np.bincount(labels, minlength=n_clusters)
+        mean_confidence = np.divide(weight_sums, edge_counts, out=np.zeros(n_clusters), where=edge_counts > 0)
+        valid = (sizes == 1) | (mean_confidence >= self.config['fuzzy_match_threshold'])
+        
+        order = np.argsort(labels, kind='stable')
+        members = np.split(np.asarray(nodes, dtype=object)[order], np.cumsum(sizes)[:-1])
+        valid_labels = np.flatnonzero(valid)
+        confidences = np.where(sizes > 1, mean_confidence, 1.0)[valid_labels]
+        return [set(members[label]) for label in valid_labels], confidences.tolist()
     
-    def _create_resolved_entities(self, clusters: List[Set[str]], entity_records: List[Dict]) -> Dict[str, ResolvedEntity]:
+    def _create_resolved_entities(self, clusters: List[Set[str]], cluster_confidences: List[float],
+                                  entity_records: List[Dict]) -> Dict[str, ResolvedEntity]:
         """Create resolved entities from clusters"""
         resolved_entities = {}
         record_lookup = {record['record_id']: record for record in entity_records}
         
-        for i, cluster in enumerate(clusters):
+        for i, (cluster, cluster_confidence) in enumerate(zip(clusters, cluster_confidences)):
             unified_id = f"unified_entity_{i:06d}"
             
             # Collect all information from cluster members
@@ -437,7 +699,6 @@ class EntityResolver:
             }
             
             primary_profile = None
-            cluster_confidence = 1.0
             
             for record_id in cluster:
                 record = record_lookup.get(record_id, {})
@@ -459,51 +720,50 @@ class EntityResolver:
                     ('staff_ids', 'staff_id'),
                     ('emails', 'email')
                 ]:
-                    if id_key in record and record[id_key]:
-                        identifiers[id_type].add(record[id_key])
+                    value = record.get(id_key)
+                    if value and pd.notna(value):
+                        identifiers[id_type].add(value)
                 
                 # Use profile record as primary if available
                 if record.get('dataset') == 'profiles' and primary_profile is None:
                     primary_profile = record
             
-            # Calculate cluster confidence
-            if len(cluster) > 1:
-                subgraph = self.entity_graph.subgraph(cluster)
-                if subgraph.number_of_edges() > 0:
-                    cluster_confidence = np.mean([data['weight'] for _, _, data in subgraph.edges(data=True)])
-            
             resolved_entity = ResolvedEntity(
                 unified_id=unified_id,
                 entity_ids=entity_ids,
                 names=names,
                 identifiers=identifiers,
                 confidence=cluster_confidence,
-                primary_profile=primary_profile or {}
+                primary_profile=primary_profile or {},
+                primary_entity_id=(primary_profile or {}).get('entity_id') or next(iter(entity_ids), None)
             )
             
             resolved_entities[unified_id] = resolved_entity
         
         return resolved_entities
     
+    def _build_identifier_index(self):
+        """Index every entity ID and identifier to the position of the first entity holding it"""
+        self._identifier_index = {}
+        
+        for position, entity in enumerate(self.resolved_entities.values()):
+            for value in entity.entity_ids:
+                self._identifier_index.setdefault(('entity_ids', value), position)
+                self._identifier_index.setdefault((None, value), position)
+            for id_type, values in entity.identifiers.items():
+                for value in values:
+                    self._identifier_index.setdefault((id_type, value), position)
+                    self._identifier_index.setdefault((None, value), position)
+        
+        self._indexed_entities = list(self.resolved_entities.values())
+    
     def get_entity_by_identifier(self, identifier: str, identifier_type: str = None) -> Optional[ResolvedEntity]:
         """Find a resolved entity by any of its identifiers"""
-        for entity in self.resolved_entities.values():
-            # Check entity IDs
-            if identifier in entity.entity_ids:
-                return entity
-            
-            # Check specific identifier types
-            if identifier_type and identifier_type in entity.identifiers:
-                if identifier in entity.identifiers[identifier_type]:
-                    return entity
-            
-            # Check all identifier types if no specific type given
-            if not identifier_type:
-                for id_set in entity.identifiers.values():
-                    if identifier in id_set:
-                        return entity
+        # Entity IDs always match; a typed lookup also checks that identifier type only
+        keys = [('entity_ids', identifier), (identifier_type, identifier)] if identifier_type else [(None, identifier)]
+        positions = [self._identifier_index[key] for key in keys if key in self._identifier_index]
         
-        return None
+        return self._indexed_entities[min(positions)] if positions else None
     
     def get_resolution_statistics(self) -> Dict[str, any]:
         """Get statistics about the entity resolution process"""
@@ -519,6 +779,6 @@ class EntityResolver:
             'merged_entities': merged_entities,
             'merge_rate': merged_entities / total_entities if total_entities > 0 else 0,
             'average_confidence': avg_confidence,
-            'graph_nodes': self.entity_graph.number_of_nodes(),
-            'graph_edges': self.entity_graph.number_of_edges()
+            'graph_nodes': self._graph_size[0],
+            'graph_edges': self._graph_size[1]
         }
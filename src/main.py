@@ -4,28 +4,60 @@ Integrates all components and provides API endpoints
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict
 import uvicorn
+import orjson
 from loguru import logger
 import asyncio
+import hashlib
+import os
+import time
+from collections import defaultdict
+from itertools import chain
 from pathlib import Path
 
-from .config import API_CONFIG, DATA_FILES, OUTPUT_DIR
+from .config import API_CONFIG, CACHE_DIR, DATA_FILES, OUTPUT_DIR
 from .data_loader import CampusDataLoader
 from .entity_resolver import EntityResolver, ResolvedEntity
 from .multimodal_fusion import MultiModalFusion, FusionRecord
 from .timeline_generator import TimelineGenerator, TimelineEvent, TimelineSummary
 from .predictive_monitor import PredictiveMonitor, Prediction, AnomalyAlert
 
+# Fused records and timelines are reused for this many seconds (matches the dashboard refresh)
+TIMELINE_CACHE_TTL = 30.0
+TIMELINE_CACHE_SIZE = 1024
+
+# Bump when training inputs or model layout change so stale cached models are not reused
+MODEL_CACHE_VERSION = 1
+
+# Alert checks look at this much recent history
+ALERT_WINDOW = timedelta(hours=48)
+
+# Handlers share one wall-clock reading per interval; sub-second freshness is not needed for windows
+CLOCK_RESOLUTION_SECONDS = 0.1
+
+# Alerts for all entities are recomputed in the background at this interval
+ALERT_REFRESH_SECONDS = 300
+
+# Search terms are matched through an index of character n-grams of this length
+SEARCH_NGRAM = 3
+
+# Request models reject unknown fields and trim string inputs
+REQUEST_MODEL_CONFIG = ConfigDict(extra='forbid', str_strip_whitespace=True)
+
 
 # Pydantic models for API
 class EntityQuery(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     entity_identifier: str
     identifier_type: Optional[str] = None
     start_time: Optional[datetime] = None
@@ -33,6 +65,8 @@ class EntityQuery(BaseModel):
 
 
 class TimelineRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     entity_id: str
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
@@ -40,12 +74,16 @@ class TimelineRequest(BaseModel):
 
 
 class PredictionRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     entity_id: str
     timestamp: datetime
     context_hours: int = 24
 
 
 class SecurityAlert(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     alert_id: str
     entity_id: str
     alert_type: str
@@ -55,6 +93,32 @@ class SecurityAlert(BaseModel):
     status: str = "active"
 
 
+class Clock:
+    """Wall-clock time re-read at most once per resolution interval"""
+    
+    def __init__(self, resolution: float = CLOCK_RESOLUTION_SECONDS):
+        self.resolution = resolution
+        self._read_at = float('-inf')
+        self._now = None
+    
+    def now(self) -> datetime:
+        monotonic = time.monotonic()
+        if monotonic - self._read_at >= self.resolution:
+            self._now = datetime.now()
+            self._read_at = monotonic
+        return self._now
+
+
+clock = Clock()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson, falling back to FastAPI's encoder for types orjson lacks"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 class CampusEntityResolutionSystem:
     """
     Main system class that orchestrates all components
@@ -71,6 +135,13 @@ class CampusEntityResolutionSystem:
         self.resolved_entities = {}
         self.entity_timelines = {}
         self.active_alerts = {}
+        self._alerts_refreshed_at = None
+        self._profile_by_id = {}
+        self._fusion_cache = {}
+        self._timeline_cache = {}
+        self._search_text = {}
+        self._search_order = {}
+        self._search_index = defaultdict(set)
         self.system_ready = False
         
         logger.info("Campus Entity Resolution System initialized")
@@ -81,9 +152,13 @@ class CampusEntityResolutionSystem:
             logger.info("Starting system initialization...")
             
             # Load all data
-            self.data = self.data_loader.load_all_data()
+            self.data = await asyncio.to_thread(self.data_loader.load_all_data)
             logger.info("Data loading completed")
             
+            # Index profiles once so per-request lookups are dict hits
+            profiles = self.data['profiles'].drop_duplicates('entity_id')
+            self._profile_by_id = dict(zip(profiles['entity_id'], profiles.to_dict('records')))
+            
             # Resolve entities with limited dataset for performance
             # Use only profiles + first 1000 records from other sources for demo
             limited_data = {
@@ -94,22 +169,34 @@ class CampusEntityResolutionSystem:
                 'notes': self.data['notes'].head(1000)
             }
             
-            self.resolved_entities = self.entity_resolver.resolve_entities(limited_data)
+            self.resolved_entities = await asyncio.to_thread(self.entity_resolver.resolve_entities, limited_data)
+            self._invalidate()
+            self._build_search_index()
             logger.info(f"Entity resolution completed: {len(self.resolved_entities)} entities")
             
-            # Prepare training data for predictive models
-            training_records = []
-            for entity_id, entity in list(self.resolved_entities.items())[:100]:  # Use first 100 for training
-                entity_data = self.data_loader.get_entity_data(list(entity.entity_ids)[0] if entity.entity_ids else entity_id)
-                fused_records = self.fusion_engine.fuse_entity_data(entity, entity_data, self.data.get('face_embeddings'))
-                training_records.extend(fused_records)
+            # Reuse models trained on the same data files by a previous run
+            model_path = self._model_cache_path()
+            if model_path is not None and model_path.exists():
+                await asyncio.to_thread(self.predictive_monitor.load_models, str(model_path))
             
-            # Train predictive models
-            if training_records:
-                performance = self.predictive_monitor.train_predictive_models(
-                    training_records, self.data['profiles']
-                )
-                logger.info(f"Predictive models trained: {performance}")
+            if not self.predictive_monitor.is_trained:
+                # Prepare training data for predictive models, fusing entities in worker threads
+                training_entities = list(self.resolved_entities.items())[:100]  # Use first 100 for training
+                fused_batches = await asyncio.gather(*(
+                    asyncio.to_thread(self._get_fused_records, entity, entity_id)
+                    for entity_id, entity in training_entities
+                ))
+                training_records = list(chain.from_iterable(fused_batches))
+                
+                # Train predictive models
+                if training_records:
+                    performance = await asyncio.to_thread(
+                        self.predictive_monitor.train_predictive_models, training_records, self.data['profiles']
+                    )
+                    logger.info(f"Predictive models trained: {performance}")
+                    
+                    if model_path is not None:
+                        await asyncio.to_thread(self.predictive_monitor.save_models, str(model_path))
             
             self.system_ready = True
             logger.info("System initialization completed successfully")
@@ -118,6 +205,55 @@ class CampusEntityResolutionSystem:
             logger.error(f"System initialization failed: {e}")
             raise
     
+    def _model_cache_path(self) -> Optional[Path]:
+        """Model cache file keyed by the data files' sizes and mtimes and the resolver and prediction configs"""
+        if not self.predictive_monitor.config.get('cache_models', False):
+            return None
+        
+        digest = hashlib.sha256(f"{MODEL_CACHE_VERSION}:{sorted(self.entity_resolver.config.items())!r}".encode())
+        digest.update(repr(sorted(self.predictive_monitor.config.items())).encode())
+        for name, path in sorted(DATA_FILES.items()):
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        
+        return CACHE_DIR / f"models_{digest.hexdigest()[:32]}.pkl"
+    
+    def _build_search_index(self):
+        """Index each entity's lowercased names and ids by character n-gram"""
+        self._search_text = {}
+        self._search_order = {}
+        self._search_index = defaultdict(set)
+        for position, (unified_id, entity) in enumerate(self.resolved_entities.items()):
+            self._search_order[unified_id] = position
+            names = ' '.join(name for name in entity.names if isinstance(name, str))
+            text = f"{names} {' '.join(entity.entity_ids)}".lower()
+            self._search_text[unified_id] = text
+            for token in text.split():
+                for i in range(len(token) - SEARCH_NGRAM + 1):
+                    self._search_index[token[i:i + SEARCH_NGRAM]].add(unified_id)
+    
+    def search_entities(self, query: str, limit: int = 10) -> List[ResolvedEntity]:
+        """Find entities whose names or ids contain the query"""
+        if limit <= 0:
+            return []
+        query = query.lower()
+        grams = {token[i:i + SEARCH_NGRAM] for token in query.split() for i in range(len(token) - SEARCH_NGRAM + 1)}
+        if grams:
+            # Only entities holding every n-gram of the query can contain it
+            candidates = set.intersection(*(self._search_index.get(gram, set()) for gram in grams))
+            candidates = sorted(candidates, key=self._search_order.__getitem__)
+        else:
+            candidates = self.resolved_entities
+        
+        results = []
+        for unified_id in candidates:
+            if query in self._search_text.get(unified_id, ''):
+                results.append(self.resolved_entities[unified_id])
+                if len(results) >= limit:
+                    break
+        return results
+    
     def get_entity_by_identifier(self, identifier: str, identifier_type: Optional[str] = None) -> Optional[ResolvedEntity]:
         """Find entity by any identifier"""
         return self.entity_resolver.get_entity_by_identifier(identifier, identifier_type)
@@ -135,17 +271,54 @@ class CampusEntityResolutionSystem:
             if not entity:
                 raise HTTPException(status_code=404, detail="Entity not found")
         
-        # Get entity data
-        primary_entity_id = list(entity.entity_ids)[0] if entity.entity_ids else entity_id
-        entity_data = self.data_loader.get_entity_data(primary_entity_id)
-        
-        # Fuse data
-        fused_records = self.fusion_engine.fuse_entity_data(entity, entity_data, self.data.get('face_embeddings'))
-        
-        # Generate timeline
-        timeline = self.timeline_generator.generate_timeline(entity.unified_id, fused_records, start_time, end_time)
+        key = (entity.unified_id, start_time and start_time.isoformat(), end_time and end_time.isoformat())
+        return self._cached(self._timeline_cache, key, lambda: self.timeline_generator.generate_timeline(
+            entity.unified_id, self._get_fused_records(entity, entity_id, start_time, end_time), start_time, end_time
+        ))
+    
+    def _get_fused_batch(self, entity: ResolvedEntity, entity_id: str) -> Tuple[List[FusionRecord], np.ndarray]:
+        """Get an entity's chronological fused records and their timestamp column, reusing recent results"""
+        def fuse():
+            records = self._fuse_entity(entity, entity_id)
+            return records, pd.to_datetime([record.timestamp for record in records]).to_numpy(dtype='datetime64[ns]')
         
-        return timeline
+        return self._cached(self._fusion_cache, entity.unified_id, fuse)
+    
+    def _fuse_entity(self, entity: ResolvedEntity, entity_id: str) -> List[FusionRecord]:
+        """Fuse an entity's records from every data source, bypassing the caches"""
+        primary_entity_id = entity.primary_entity_id or entity_id
+        entity_data = self.data_loader.get_entity_data(primary_entity_id)
+        return self.fusion_engine.fuse_entity_data(entity, entity_data, self.data.get('face_embeddings'))
+    
+    def _get_fused_records(self, entity: ResolvedEntity, entity_id: str,
+                           start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[FusionRecord]:
+        """Get an entity's fused records, sliced to a time window by binary search on the timestamp column"""
+        records, timestamps = self._get_fused_batch(entity, entity_id)
+        lo = np.searchsorted(timestamps, np.datetime64(start_time, 'ns'), side='left') if start_time else 0
+        hi = np.searchsorted(timestamps, np.datetime64(end_time, 'ns'), side='right') if end_time else len(records)
+        return records[lo:hi]
+    
+    def _cached(self, cache: Dict, key: Any, compute):
+        """Return a cached value younger than the TTL, computing and storing it otherwise"""
+        now = time.monotonic()
+        hit = cache.get(key)
+        if hit is not None and now - hit[0] < TIMELINE_CACHE_TTL:
+            return hit[1]
+        if len(cache) >= TIMELINE_CACHE_SIZE:
+            cache.clear()
+        value = compute()
+        cache[key] = (now, value)
+        return value
+    
+    def _invalidate(self, entity_id: Optional[str] = None):
+        """Drop cached fusion/timeline results for one entity, or all of them"""
+        if entity_id is None:
+            self._fusion_cache.clear()
+            self._timeline_cache.clear()
+            return
+        self._fusion_cache.pop(entity_id, None)
+        for key in [key for key in self._timeline_cache if key[0] == entity_id]:
+            del self._timeline_cache[key]
     
     def get_entity_summary(self, entity_id: str) -> TimelineSummary:
         """Get summary for an entity"""
@@ -169,24 +342,11 @@ class CampusEntityResolutionSystem:
         timeline = self.get_entity_timeline(entity.unified_id, context_start, timestamp)
         
         # Convert timeline to fusion records (simplified)
-        context_records = []
-        for event in timeline:
-            if event.activity != 'gap':
-                context_record = FusionRecord(
-                    unified_entity_id=entity.unified_id,
-                    timestamp=event.timestamp,
-                    location=event.location,
-                    activity_type=event.activity,
-                    confidence=event.confidence,
-                    source_records=[{'dataset': source} for source in event.sources],
-                    provenance={},
-                    evidence={}
-                )
-                context_records.append(context_record)
+        context_records = self._timeline_to_fusion_records(entity, timeline)
         
         # Get entity profile
-        primary_entity_id = list(entity.entity_ids)[0] if entity.entity_ids else entity_id
-        entity_profile = self.data['profiles'][self.data['profiles']['entity_id'] == primary_entity_id].iloc[0].to_dict() if not self.data['profiles'].empty else {}
+        primary_entity_id = entity.primary_entity_id or entity_id
+        entity_profile = self._profile_by_id.get(primary_entity_id, {})
         
         # Make prediction
         return self.predictive_monitor.predict_missing_data(entity.unified_id, timestamp, context_records, entity_profile)
@@ -203,34 +363,68 @@ class CampusEntityResolutionSystem:
             if not entity:
                 return []
         
-        # Get recent timeline
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=48)  # Last 48 hours
-        timeline = self.get_entity_timeline(entity.unified_id, start_time, end_time)
+        # Serve the precomputed alerts once the background refresh has run
+        if self._alerts_refreshed_at is not None:
+            return self.active_alerts.get(entity.unified_id, [])
+        return self._detect_entity_alerts(entity, entity_id)
+    
+    def _detect_entity_alerts(self, entity: ResolvedEntity, entity_id: str, use_cache: bool = True) -> List[AnomalyAlert]:
+        """Run anomaly detection over an entity's last 48 hours"""
+        # Get recent timeline; bulk refreshes skip the per-request caches so they don't evict them
+        end_time = clock.now()
+        start_time = end_time - ALERT_WINDOW
+        if use_cache:
+            timeline = self.get_entity_timeline(entity.unified_id, start_time, end_time)
+        else:
+            timeline = self.timeline_generator.generate_timeline(
+                entity.unified_id, self._fuse_entity(entity, entity_id), start_time, end_time
+            )
         
         # Convert to fusion records
-        recent_records = []
-        for event in timeline:
-            if event.activity != 'gap':
-                record = FusionRecord(
-                    unified_entity_id=entity.unified_id,
-                    timestamp=event.timestamp,
-                    location=event.location,
-                    activity_type=event.activity,
-                    confidence=event.confidence,
-                    source_records=[{'dataset': source} for source in event.sources],
-                    provenance={},
-                    evidence={}
-                )
-                recent_records.append(record)
+        recent_records = self._timeline_to_fusion_records(entity, timeline)
         
         # Get entity profile
-        primary_entity_id = list(entity.entity_ids)[0] if entity.entity_ids else entity_id
-        entity_profile = self.data['profiles'][self.data['profiles']['entity_id'] == primary_entity_id].iloc[0].to_dict() if not self.data['profiles'].empty else {}
+        primary_entity_id = entity.primary_entity_id or entity_id
+        entity_profile = self._profile_by_id.get(primary_entity_id, {})
         
         # Detect anomalies
         return self.predictive_monitor.detect_anomalies(recent_records, entity_profile)
     
+    def recompute_all_alerts(self):
+        """Recompute alerts for every resolved entity, keeping those with active alerts"""
+        active_alerts = {}
+        for unified_id, entity in list(self.resolved_entities.items()):
+            try:
+                alerts = self._detect_entity_alerts(entity, unified_id, use_cache=False)
+            except Exception as e:
+                logger.error(f"Alert check failed for entity {unified_id}: {e}")
+                continue
+            if alerts:
+                active_alerts[unified_id] = alerts
+        
+        self.active_alerts = active_alerts
+        self._alerts_refreshed_at = datetime.now()
+        logger.info(f"Alerts refreshed: {len(active_alerts)} entities with active alerts")
+    
+    async def run_alert_refresh(self):
+        """Refresh the alerts table in a worker thread every ALERT_REFRESH_SECONDS"""
+        while True:
+            if self.system_ready:
+                try:
+                    await asyncio.to_thread(self.recompute_all_alerts)
+                except Exception as e:
+                    logger.error(f"Alert refresh failed: {e}")
+            await asyncio.sleep(ALERT_REFRESH_SECONDS)
+    
+    def _timeline_to_fusion_records(self, entity: ResolvedEntity, timeline: List[TimelineEvent]) -> List[FusionRecord]:
+        """Convert non-gap timeline events back into fusion records in one pass"""
+        unified_id = entity.unified_id
+        return [
+            FusionRecord(unified_id, event.timestamp, event.location, event.activity, event.confidence,
+                         [{'dataset': source} for source in event.sources], {}, {})
+            for event in timeline if event.activity != 'gap'
+        ]
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
         return {
@@ -242,41 +436,8 @@ class CampusEntityResolutionSystem:
         }
 
 
-# Initialize system
-system = CampusEntityResolutionSystem()
-
-# Create FastAPI app
-app = FastAPI(
-    title="Campus Entity Resolution & Security Monitoring System",
-    description="Advanced system for campus security and entity tracking",
-    version="1.0.0"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=API_CONFIG['cors_origins'],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files
-static_dir = Path(__file__).parent.parent / "static"
-if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize system on startup"""
-    await system.initialize_system()
-
-
-@app.get("/", response_class=HTMLResponse)
-async def dashboard():
-    """Serve the main dashboard"""
-    return """
+# Dashboard page, encoded once at import
+DASHBOARD_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -503,42 +664,99 @@ async def dashboard():
         </script>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+
+
+# Initialize system
+system = CampusEntityResolutionSystem()
+
+# Create FastAPI app
+app = FastAPI(
+    title="Campus Entity Resolution & Security Monitoring System",
+    description="Advanced system for campus security and entity tracking",
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=API_CONFIG['cors_origins'],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Compress JSON payloads; timelines and summaries repeat locations and timestamps heavily
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Mount static files
+static_dir = Path(__file__).parent.parent / "static"
+if static_dir.exists():
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize system on startup"""
+    await system.initialize_system()
+    app.state.alert_refresh = asyncio.create_task(system.run_alert_refresh())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background alert refresh"""
+    task = getattr(app.state, 'alert_refresh', None)
+    if task:
+        task.cancel()
+
+
+@app.get("/", response_class=HTMLResponse, include_in_schema=False)
+async def dashboard():
+    """Serve the main dashboard"""
+    return Response(DASHBOARD_HTML, media_type="text/html")
 
 
 # API Routes
 @app.get("/api/v1/system/status")
 async def get_system_status():
     """Get system status"""
-    return system.get_system_status()
+    return FastJSONResponse(system.get_system_status())
 
 
 @app.get("/api/v1/entity/{entity_id}/timeline")
 async def get_entity_timeline(
     entity_id: str,
     hours: int = Query(24, description="Hours to look back"),
-    include_predictions: bool = Query(False, description="Include predictions for gaps")
+    include_predictions: bool = Query(False, description="Include predictions for gaps"),
+    stream: bool = Query(False, description="Stream events as NDJSON instead of a JSON array")
 ):
     """Get entity timeline"""
-    end_time = datetime.now()
+    end_time = clock.now()
     start_time = end_time - timedelta(hours=hours)
     
     timeline = system.get_entity_timeline(entity_id, start_time, end_time)
     
     # Convert to serializable format
-    timeline_data = []
-    for event in timeline:
-        timeline_data.append({
-            'timestamp': event.timestamp.isoformat(),
+    def event_data(event: TimelineEvent) -> Dict[str, Any]:
+        return {
+            'timestamp': event.timestamp,
             'location': event.location,
             'activity': event.activity,
             'description': event.description,
             'confidence': event.confidence,
             'sources': event.sources,
             'duration_minutes': event.duration.total_seconds() / 60 if event.duration else None
-        })
+        }
     
-    return timeline_data
+    if stream:
+        async def lines():
+            for event in timeline:
+                yield orjson.dumps(event_data(event), default=jsonable_encoder, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+        
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    return FastJSONResponse([event_data(event) for event in timeline])
 
 
 @app.get("/api/v1/entity/{entity_id}/summary")
@@ -546,17 +764,17 @@ async def get_entity_summary(entity_id: str):
     """Get entity summary"""
     summary = system.get_entity_summary(entity_id)
     
-    return {
+    return FastJSONResponse({
         'entity_id': summary.entity_id,
-        'start_time': summary.start_time.isoformat(),
-        'end_time': summary.end_time.isoformat(),
+        'start_time': summary.start_time,
+        'end_time': summary.end_time,
         'total_events': summary.total_events,
         'locations_visited': summary.locations_visited,
         'primary_activities': summary.primary_activities,
         'summary_text': summary.summary_text,
         'confidence_score': summary.confidence_score,
-        'gaps': [(gap[0].isoformat(), gap[1].isoformat()) for gap in summary.gaps]
-    }
+        'gaps': summary.gaps
+    })
 
 
 @app.get("/api/v1/entity/{entity_id}/alerts")
@@ -570,13 +788,13 @@ async def get_entity_alerts(entity_id: str):
             'entity_id': alert.entity_id,
             'alert_type': alert.alert_type,
             'severity': alert.severity,
-            'timestamp': alert.timestamp.isoformat(),
+            'timestamp': alert.timestamp,
             'description': alert.description,
             'evidence': alert.evidence,
             'recommended_actions': alert.recommended_actions
         })
     
-    return alert_data
+    return FastJSONResponse(alert_data)
 
 
 @app.post("/api/v1/entity/{entity_id}/predict")
@@ -587,16 +805,16 @@ async def predict_entity_state(entity_id: str, request: PredictionRequest):
     if not prediction:
         raise HTTPException(status_code=404, detail="Unable to make prediction")
     
-    return {
+    return FastJSONResponse({
         'entity_id': prediction.entity_id,
-        'timestamp': prediction.timestamp.isoformat(),
+        'timestamp': prediction.timestamp,
         'predicted_location': prediction.predicted_location,
         'predicted_activity': prediction.predicted_activity,
         'confidence': prediction.confidence,
         'explanation': prediction.explanation,
         'evidence': prediction.evidence,
         'alternative_predictions': prediction.alternative_predictions
-    }
+    })
 
 
 @app.get("/api/v1/entities/search")
@@ -607,25 +825,27 @@ async def search_entities(
     """Search for entities"""
     results = []
     
-    for entity_id, entity in list(system.resolved_entities.items())[:limit]:
-        # Simple search in names and IDs
-        search_text = f"{' '.join(entity.names)} {' '.join(entity.entity_ids)}".lower()
-        if query.lower() in search_text:
-            results.append({
-                'unified_id': entity.unified_id,
-                'names': list(entity.names),
-                'entity_ids': list(entity.entity_ids),
-                'confidence': entity.confidence,
-                'primary_profile': entity.primary_profile
-            })
+    for entity in system.search_entities(query, limit):
+        results.append({
+            'unified_id': entity.unified_id,
+            'names': list(entity.names),
+            'entity_ids': list(entity.entity_ids),
+            'confidence': entity.confidence,
+            'primary_profile': entity.primary_profile
+        })
     
-    return results
+    return FastJSONResponse(results)
 
 
 if __name__ == "__main__":
+    # Reload needs a single process; otherwise run a worker per core, each loading its own data
+    # (the resolver and model caches on disk keep those extra startups cheap)
     uvicorn.run(
         "src.main:app",
         host=API_CONFIG['host'],
         port=API_CONFIG['port'],
-        reload=API_CONFIG['debug']
+        reload=API_CONFIG['debug'],
+        workers=1 if API_CONFIG['debug'] else (os.cpu_count() or 1),
+        loop="auto",
+        http="auto"
     )
@@ -16,7 +16,7 @@ from .config import FUSION_CONFIG, CAMPUS_LOCATIONS
 from .entity_resolver import ResolvedEntity
 
 
-@dataclass
+@dataclass(slots=True)
 class FusionRecord:
     """Represents a fused record from multiple data sources"""
     unified_entity_id: str
@@ -53,6 +53,7 @@ class MultiModalFusion:
         self.config = config or FUSION_CONFIG
         self.fused_records = []
         self.activity_timeline = {}
+        self._embedding_index = (None, {})
         
     def fuse_entity_data(self, 
                         entity: ResolvedEntity, 
@@ -94,95 +95,95 @@ class MultiModalFusion:
         
         # Card swipe events
         if 'card_swipes' in entity_data and not entity_data['card_swipes'].empty:
-            for _, row in entity_data['card_swipes'].iterrows():
+            for row in entity_data['card_swipes'].to_dict('records'):
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['timestamp']),
+                    timestamp=row['timestamp'],
                     location=row['location_id'],
                     event_type='card_swipe',
                     source_dataset='card_swipes',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.95  # High confidence for physical access
                 ))
         
         # CCTV detection events
         if 'cctv_frames' in entity_data and not entity_data['cctv_frames'].empty:
-            for _, row in entity_data['cctv_frames'].iterrows():
+            for row in entity_data['cctv_frames'].to_dict('records'):
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['timestamp']),
+                    timestamp=row['timestamp'],
                     location=row['location_id'],
                     event_type='cctv_detection',
                     source_dataset='cctv_frames',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.85  # Good confidence for face detection
                 ))
         
         # WiFi connection events
         if 'wifi_logs' in entity_data and not entity_data['wifi_logs'].empty:
-            for _, row in entity_data['wifi_logs'].iterrows():
+            for row in entity_data['wifi_logs'].to_dict('records'):
                 # Infer location from AP ID
                 location = self._infer_location_from_ap(row['ap_id'])
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['timestamp']),
+                    timestamp=row['timestamp'],
                     location=location,
                     event_type='wifi_connection',
                     source_dataset='wifi_logs',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.75  # Medium confidence for location inference
                 ))
         
         # Lab booking events
         if 'lab_bookings' in entity_data and not entity_data['lab_bookings'].empty:
-            for _, row in entity_data['lab_bookings'].iterrows():
+            for row in entity_data['lab_bookings'].to_dict('records'):
                 # Start event
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['start_time']),
+                    timestamp=row['start_time'],
                     location=row['room_id'],
                     event_type='lab_booking_start',
                     source_dataset='lab_bookings',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.90 if row.get('attended') else 0.60
                 ))
                 
                 # End event
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['end_time']),
+                    timestamp=row['end_time'],
                     location=row['room_id'],
                     event_type='lab_booking_end',
                     source_dataset='lab_bookings',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.90 if row.get('attended') else 0.60
                 ))
         
         # Library checkout events
         if 'library_checkouts' in entity_data and not entity_data['library_checkouts'].empty:
-            for _, row in entity_data['library_checkouts'].iterrows():
+            for row in entity_data['library_checkouts'].to_dict('records'):
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['timestamp']),
+                    timestamp=row['timestamp'],
                     location='LIB_ENT',  # Assume library entrance
                     event_type='library_checkout',
                     source_dataset='library_checkouts',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.85
                 ))
         
         # Note/helpdesk events
         if 'notes' in entity_data and not entity_data['notes'].empty:
-            for _, row in entity_data['notes'].iterrows():
+            for row in entity_data['notes'].to_dict('records'):
                 # Try to infer location from note text
                 location = self._infer_location_from_text(row['text'])
                 events.append(ActivityEvent(
                     entity_id=entity.unified_id,
-                    timestamp=pd.to_datetime(row['timestamp']),
+                    timestamp=row['timestamp'],
                     location=location or 'UNKNOWN',
                     event_type=f"note_{row['category']}",
                     source_dataset='notes',
-                    raw_data=row.to_dict(),
+                    raw_data=row,
                     confidence=0.70  # Lower confidence for text inference
                 ))
         
@@ -407,6 +408,7 @@ class MultiModalFusion:
             return None
         
         face_validation = {}
+        embedding_index = self._get_embedding_index(face_embeddings)
         
         for cctv_event in cctv_events:
             face_id = cctv_event.raw_data.get('face_id')
@@ -414,12 +416,10 @@ class MultiModalFusion:
                 continue
             
             # Find corresponding face embedding
-            face_embedding_row = face_embeddings[face_embeddings['face_id'] == face_id]
-            if face_embedding_row.empty:
+            embedding_vector = embedding_index.get(face_id)
+            if embedding_vector is None:
                 continue
             
-            embedding_vector = face_embedding_row.iloc[0]['embedding_vector']
-            
             # For now, we'll assume high similarity if we have the embedding
             # In a real implementation, this would compare against known face embeddings
             face_validation[face_id] = {
@@ -430,6 +430,15 @@ class MultiModalFusion:
         
         return face_validation if face_validation else None
     
+    def _get_embedding_index(self, face_embeddings: pd.DataFrame) -> Dict[str, Any]:
+        """Map face_id to its first embedding vector, rebuilt only when a different frame is passed"""
+        frame, index = self._embedding_index
+        if frame is not face_embeddings:
+            first_rows = face_embeddings.dropna(subset=['face_id']).drop_duplicates('face_id')
+            index = dict(zip(first_rows['face_id'], first_rows['embedding_vector']))
+            self._embedding_index = (face_embeddings, index)
+        return index
+    
     def _validate_fusion_records(self, records: List[FusionRecord]) -> List[FusionRecord]:
         """Validate and filter fusion records"""
         validated_records = []
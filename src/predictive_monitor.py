@@ -2,10 +2,13 @@
 Predictive Monitoring System with Explainability
 ML-based inference for missing data with evidence-based reasoning
 """
+import threading
 import pandas as pd
 import numpy as np
+from collections import Counter
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder, StandardScaler
@@ -18,6 +21,37 @@ from .config import PREDICTION_CONFIG, CAMPUS_LOCATIONS, ENTITY_TYPES
 from .timeline_generator import TimelineEvent
 from .multimodal_fusion import FusionRecord
 
+# Categorical feature codes; unknown roles map to 0, unknown departments and locations to -1
+ROLE_CODES = {'student': 0, 'staff': 1, 'faculty': 2}
+DEPARTMENT_CODES = {
+    'Physics': 0, 'MECH': 1, 'ECE': 2, 'CIVIL': 3, 'BIO': 4,
+    'Chemistry': 5, 'Admin': 6, 'Maths': 7, 'Computer Science': 8
+}
+LOCATION_CODES = {loc: i for i, loc in enumerate(CAMPUS_LOCATIONS.keys())}
+
+# Prediction lists at or below this size are tallied with Counter instead of pandas
+SMALL_TALLY_SIZE = 1000
+
+# Source datasets encoded as binary presence features, in feature order
+FEATURE_SOURCES = ('card_swipes', 'cctv_frames', 'wifi_logs', 'lab_bookings', 'library_checkouts', 'notes')
+SOURCE_COLUMNS = {source: i for i, source in enumerate(FEATURE_SOURCES)}
+
+
+@lru_cache(maxsize=4096)
+def profile_codes(role: Any, department: Any) -> Tuple[int, int]:
+    """Role and department feature codes for a profile, memoized across records"""
+    return ROLE_CODES.get(role, 0), DEPARTMENT_CODES.get(department, -1)
+
+
+def top_k_indices(probs: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest probabilities, highest first and ties to the higher index, without a full sort"""
+    k = min(k, len(probs))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    kth_largest = np.partition(probs, len(probs) - k)[len(probs) - k]
+    candidates = np.flatnonzero(probs >= kth_largest)
+    return candidates[np.lexsort((-candidates, -probs[candidates]))][:k]
+
 
 @dataclass
 class Prediction:
@@ -44,6 +78,57 @@ class AnomalyAlert:
     recommended_actions: List[str]
 
 
+class FlatForest:
+    """Random forest classifier flattened into contiguous node arrays for vectorized inference"""
+    
+    def __init__(self, forest: RandomForestClassifier):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        
+        left = np.concatenate([tree.children_left for tree in trees]).astype(np.int32)
+        right = np.concatenate([tree.children_right for tree in trees]).astype(np.int32)
+        nodes = np.arange(len(left), dtype=np.int32)
+        is_leaf = left == -1
+        shift = np.repeat(offsets[:-1], [tree.node_count for tree in trees]).astype(np.int32)
+        
+        # Leaves point at themselves so every row can walk the full depth
+        self.left = np.where(is_leaf, nodes, left + shift)
+        self.right = np.where(is_leaf, nodes, right + shift)
+        self.feature = np.where(is_leaf, 0, np.concatenate([tree.feature for tree in trees])).astype(np.int32)
+        self.threshold = self._float32_thresholds(np.concatenate([tree.threshold for tree in trees]))
+        self.roots = offsets[:-1].astype(np.int32)
+        self.depth = max(tree.max_depth for tree in trees)
+        
+        # Per-leaf class fractions; older sklearn stores sample counts and normalizes at predict time
+        value = np.concatenate([tree.value[:, 0, :forest.n_classes_] for tree in trees])
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        self.proba = np.where(normalizer > 1.0 + 1e-6, value / np.maximum(normalizer, 1.0), value)
+    
+    @staticmethod
+    def _float32_thresholds(threshold: np.ndarray) -> np.ndarray:
+        """Round split thresholds down to float32 so x <= t decides identically for float32 inputs"""
+        threshold32 = threshold.astype(np.float32)
+        above = threshold32 > threshold
+        threshold32[above] = np.nextafter(threshold32[above], np.float32(-np.inf))
+        return threshold32
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Mean class probabilities over all trees, matching RandomForestClassifier.predict_proba"""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        
+        leaf_proba = self.proba[node]
+        all_proba = np.zeros((len(X), self.proba.shape[1]), dtype=np.float64)
+        for t in range(len(self.roots)):
+            all_proba += leaf_proba[:, t]
+        all_proba /= len(self.roots)
+        return all_proba
+
+
 class PredictiveMonitor:
     """
     Advanced predictive monitoring system that:
@@ -60,6 +145,11 @@ class PredictiveMonitor:
         self.anomaly_detector = None
         self.label_encoders = {}
         self.feature_scaler = StandardScaler()
+        self._scale_mean = None
+        self._scale_std = None
+        self._scratch = threading.local()
+        self._flat_forests = {}
+        self._class_labels = {}
         self.is_trained = False
         
     def train_predictive_models(self, 
@@ -92,25 +182,29 @@ class PredictiveMonitor:
         # Scale features
         X_train_scaled = self.feature_scaler.fit_transform(X_train)
         X_test_scaled = self.feature_scaler.transform(X_test)
+        self._cache_scaler_params()
         
         # Train location predictor
+        n_jobs = self.config.get('n_jobs', -1)
         self.location_predictor = RandomForestClassifier(
-            n_estimators=100, random_state=42, max_depth=10
+            n_estimators=100, random_state=42, max_depth=10, n_jobs=n_jobs
         )
         self.location_predictor.fit(X_train_scaled, y_loc_train)
         
         # Train activity predictor
         self.activity_predictor = RandomForestClassifier(
-            n_estimators=100, random_state=42, max_depth=10
+            n_estimators=100, random_state=42, max_depth=10, n_jobs=n_jobs
         )
         self.activity_predictor.fit(X_train_scaled, y_act_train)
         
         # Train anomaly detector (using isolation forest approach)
         from sklearn.ensemble import IsolationForest
         self.anomaly_detector = IsolationForest(
-            contamination=0.1, random_state=42
+            contamination=0.1, random_state=42, n_jobs=n_jobs
         )
         self.anomaly_detector.fit(X_train_scaled)
+        self._flatten_forests()
+        self._cache_class_labels()
         
         # Evaluate models
         loc_pred = self.location_predictor.predict(X_test_scaled)
@@ -136,26 +230,78 @@ class PredictiveMonitor:
         logger.info(f"Model training completed. Location accuracy: {loc_accuracy:.3f}, Activity accuracy: {act_accuracy:.3f}")
         return performance
     
+    def _cache_scaler_params(self):
+        """Keep the fitted scaler's mean and scale as plain arrays for inline scaling"""
+        self._scale_mean = np.asarray(self.feature_scaler.mean_, dtype=np.float64)
+        self._scale_std = np.asarray(self.feature_scaler.scale_, dtype=np.float64)
+    
+    def _flatten_forests(self):
+        """Flatten the trained forests for fast batched inference"""
+        self._flat_forests = {
+            'location': FlatForest(self.location_predictor),
+            'activity': FlatForest(self.activity_predictor)
+        }
+    
+    def _cache_class_labels(self):
+        """Decoded labels aligned to each predictor's probability columns"""
+        self._class_labels = {
+            'location': self.label_encoders['location'].classes_[self.location_predictor.classes_],
+            'activity': self.label_encoders['activity'].classes_[self.activity_predictor.classes_]
+        }
+    
+    def _predict_proba(self, name: str, predictor: RandomForestClassifier, features_scaled: np.ndarray) -> np.ndarray:
+        """Class probabilities from the flattened forest, falling back to sklearn for missing values"""
+        flat = self._flat_forests.get(name)
+        if flat is None or np.isnan(features_scaled).any():
+            return predictor.predict_proba(features_scaled)
+        return flat.predict_proba(features_scaled)
+    
+    def _scale_features(self, features: np.ndarray) -> np.ndarray:
+        """Standardize a feature matrix into this thread's reusable float64 buffer; valid until the next call"""
+        if self._scale_mean is None:
+            self._cache_scaler_params()
+        features = np.asarray(features, dtype=np.float64)
+        buffer = getattr(self._scratch, 'scaled', None)
+        if buffer is None or buffer.shape[0] < len(features) or buffer.shape[1] != features.shape[1]:
+            buffer = np.empty((max(len(features), 16), features.shape[1]))
+            self._scratch.scaled = buffer
+        scaled = buffer[:len(features)]
+        np.subtract(features, self._scale_mean, out=scaled)
+        np.divide(scaled, self._scale_std, out=scaled)
+        return scaled
+    
     def _prepare_training_data(self, 
                               training_data: List[FusionRecord],
                               entity_profiles: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Prepare features and targets for training"""
-        features = []
-        location_targets = []
-        activity_targets = []
-        
-        # Create entity profile lookup
-        profile_lookup = entity_profiles.set_index('entity_id').to_dict('index')
-        
-        for record in training_data:
-            # Extract features
-            feature_vector = self._extract_features(record, profile_lookup)
-            if feature_vector is not None:
-                features.append(feature_vector)
-                location_targets.append(record.location)
-                activity_targets.append(record.activity_type)
-        
-        if not features:
+        # Role/department codes for every profile, looked up per record in one reindex
+        features = self._extract_feature_matrix(training_data, {}, self._profile_code_table(entity_profiles))
+        if features is None:
+            # Fall back to per-record extraction, which skips records it cannot encode
+            profile_lookup = entity_profiles.set_index('entity_id').to_dict('index')
+            features, location_targets, activity_targets = [], [], []
+            for record in training_data:
+                feature_vector = self._extract_features(record, profile_lookup)
+                if feature_vector is not None:
+                    features.append(feature_vector)
+                    location_targets.append(record.location)
+                    activity_targets.append(record.activity_type)
+        else:
+            location_targets = [record.location for record in training_data]
+            activity_targets = [record.activity_type for record in training_data]
+        
+        # Drop records whose targets the already-fitted encoders have never seen
+        known = np.ones(len(location_targets), dtype=bool)
+        for name, targets in (('location', location_targets), ('activity', activity_targets)):
+            if name in self.label_encoders:
+                known &= np.isin(np.asarray(targets, dtype=object), self.label_encoders[name].classes_)
+        if not known.all():
+            logger.warning(f"Skipping {int((~known).sum())} training records with unseen location/activity labels")
+            features = np.asarray(features)[known]
+            location_targets = [target for target, keep in zip(location_targets, known) if keep]
+            activity_targets = [target for target, keep in zip(activity_targets, known) if keep]
+        
+        if len(features) == 0:
             return np.array([]), np.array([]), np.array([])
         
         # Encode categorical targets
@@ -173,55 +319,152 @@ class PredictiveMonitor:
         
         return np.array(features), location_targets_encoded, activity_targets_encoded
     
+    def _profile_code_table(self, entity_profiles: pd.DataFrame) -> pd.DataFrame:
+        """Role and department codes per entity_id, as a columnar table"""
+        profiles = entity_profiles.drop_duplicates('entity_id', keep='last').set_index('entity_id')
+        columns = {}
+        for column, codes, default in (('role', ROLE_CODES, 0), ('department', DEPARTMENT_CODES, -1)):
+            if column in profiles:
+                columns[column] = profiles[column].map(codes).fillna(default).astype(float)
+            else:
+                columns[column] = pd.Series(float(default), index=profiles.index)
+        return pd.DataFrame(columns)
+    
+    def _extract_feature_matrix(self, 
+                                records: List[FusionRecord], 
+                                profile_lookup: Dict,
+                                profile_table: Optional[pd.DataFrame] = None) -> Optional[np.ndarray]:
+        """Extract the (N, F) feature matrix for many records column by column; None if any record cannot be encoded"""
+        if not records:
+            return np.empty((0, 10 + len(FEATURE_SOURCES)))
+        
+        try:
+            columns = self._entity_time_columns(
+                [record.unified_entity_id for record in records], [record.timestamp for record in records],
+                profile_lookup, profile_table
+            )
+            if columns is None:
+                return None
+            
+            n_sources = np.fromiter((len(record.source_records) for record in records), dtype=np.intp, count=len(records))
+            columns += [
+                n_sources.astype(float),
+                np.fromiter((record.confidence for record in records), dtype=float, count=len(records)),
+                np.fromiter((len(record.evidence) for record in records), dtype=float, count=len(records)),
+                np.fromiter((LOCATION_CODES.get(record.location, -1) for record in records), dtype=float, count=len(records))
+            ]
+            
+            # Source presence bits scattered from one flat pass over all source records
+            source_rows = np.repeat(np.arange(len(records)), n_sources)
+            source_cols = np.fromiter(
+                (SOURCE_COLUMNS.get(source['dataset'], -1) for record in records for source in record.source_records),
+                dtype=np.intp, count=len(source_rows)
+            )
+            known = source_cols >= 0
+            source_bits = np.zeros((len(records), len(FEATURE_SOURCES)))
+            source_bits[source_rows[known], source_cols[known]] = 1.0
+            
+            return np.column_stack(columns + [source_bits]).astype(float)
+            
+        except Exception as e:
+            logger.warning(f"Failed to extract feature matrix: {e}")
+            return None
+    
+    def _extract_query_matrix(self, 
+                              entity_ids: List[str], 
+                              timestamps: List[datetime], 
+                              profile_lookup: Dict) -> Optional[np.ndarray]:
+        """Feature matrix for unobserved (entity, timestamp) points; None if any point cannot be encoded"""
+        try:
+            columns = self._entity_time_columns(entity_ids, timestamps, profile_lookup)
+            if columns is None:
+                return None
+            
+            # An unobserved point has no sources, confidence, evidence or known location
+            unobserved = np.zeros(4 + len(FEATURE_SOURCES))
+            unobserved[3] = LOCATION_CODES.get('UNKNOWN', -1)
+            matrix = np.empty((len(entity_ids), len(columns) + len(unobserved)))
+            matrix[:, :len(columns)] = np.column_stack(columns)
+            matrix[:, len(columns):] = unobserved
+            return matrix
+            
+        except Exception as e:
+            logger.warning(f"Failed to extract query feature matrix: {e}")
+            return None
+    
+    def _entity_time_columns(self, 
+                             entity_ids: List[str], 
+                             timestamps: List[datetime], 
+                             profile_lookup: Dict,
+                             profile_table: Optional[pd.DataFrame] = None) -> Optional[List[np.ndarray]]:
+        """Temporal and role/department feature columns; None if a timestamp is missing"""
+        timestamps = pd.DatetimeIndex(timestamps)
+        if timestamps.hasnans:
+            return None
+        
+        # Entity features, from the code table or resolved once per distinct entity
+        if profile_table is not None:
+            role_dept = profile_table.reindex(entity_ids).fillna({'role': 0.0, 'department': -1.0}).to_numpy(dtype=float)
+        else:
+            entity_codes = {}
+            for entity_id in set(entity_ids):
+                entity_profile = profile_lookup.get(entity_id, {})
+                entity_codes[entity_id] = profile_codes(
+                    entity_profile.get('role', 'student'), entity_profile.get('department', 'Unknown')
+                )
+            role_dept = np.array([entity_codes[entity_id] for entity_id in entity_ids], dtype=float).reshape(-1, 2)
+        
+        return [
+            timestamps.hour.to_numpy(), timestamps.weekday.to_numpy(),
+            timestamps.day.to_numpy(), timestamps.month.to_numpy(),
+            role_dept[:, 0], role_dept[:, 1]
+        ]
+    
     def _extract_features(self, 
                          record: FusionRecord, 
                          profile_lookup: Dict) -> Optional[np.ndarray]:
         """Extract feature vector from a fusion record"""
+        return self._extract_features_raw(
+            record.unified_entity_id, record.timestamp, record.source_records, record.location,
+            record.confidence, record.evidence, profile_lookup.get(record.unified_entity_id, {})
+        )
+    
+    def _extract_features_raw(self, 
+                              entity_id: str,
+                              timestamp: datetime,
+                              source_records: List[Dict],
+                              location: str,
+                              confidence: float,
+                              evidence: Dict,
+                              entity_profile: Dict) -> Optional[np.ndarray]:
+        """Extract a feature vector from record fields without building a FusionRecord"""
         try:
-            # Get entity profile
-            entity_profile = profile_lookup.get(record.unified_entity_id, {})
-            
             features = []
             
             # Temporal features
             features.extend([
-                record.timestamp.hour,
-                record.timestamp.weekday(),
-                record.timestamp.day,
-                record.timestamp.month
+                timestamp.hour,
+                timestamp.weekday(),
+                timestamp.day,
+                timestamp.month
             ])
             
-            # Entity features
-            role_encoding = {'student': 0, 'staff': 1, 'faculty': 2}
-            features.append(role_encoding.get(entity_profile.get('role', 'student'), 0))
-            
-            # Department encoding
-            dept_encoding = {
-                'Physics': 0, 'MECH': 1, 'ECE': 2, 'CIVIL': 3, 'BIO': 4,
-                'Chemistry': 5, 'Admin': 6, 'Maths': 7, 'Computer Science': 8
-            }
-            features.append(dept_encoding.get(entity_profile.get('department', 'Unknown'), -1))
+            # Entity and department features
+            features.extend(profile_codes(entity_profile.get('role', 'student'), entity_profile.get('department', 'Unknown')))
             
             # Historical pattern features (simplified)
             features.extend([
-                len(record.source_records),  # Number of data sources
-                record.confidence,  # Fusion confidence
-                len(record.evidence)  # Amount of evidence
+                len(source_records),  # Number of data sources
+                confidence,  # Fusion confidence
+                len(evidence)  # Amount of evidence
             ])
             
             # Location features
-            location_encoding = {loc: i for i, loc in enumerate(CAMPUS_LOCATIONS.keys())}
-            features.append(location_encoding.get(record.location, -1))
-            
-            # Activity pattern features
-            activity_counts = {}
-            for source_record in record.source_records:
-                dataset = source_record['dataset']
-                activity_counts[dataset] = activity_counts.get(dataset, 0) + 1
+            features.append(LOCATION_CODES.get(location, -1))
             
             # Binary features for data source presence
-            for source in ['card_swipes', 'cctv_frames', 'wifi_logs', 'lab_bookings', 'library_checkouts', 'notes']:
-                features.append(1 if source in activity_counts else 0)
+            sources_present = {source_record['dataset'] for source_record in source_records}
+            features.extend(1 if source in sources_present else 0 for source in FEATURE_SOURCES)
             
             return np.array(features, dtype=float)
             
@@ -241,72 +484,120 @@ class PredictiveMonitor:
             logger.error("Models not trained. Call train_predictive_models first.")
             return None
         
-        # Create synthetic record for feature extraction
-        synthetic_record = FusionRecord(
-            unified_entity_id=entity_id,
-            timestamp=timestamp,
-            location='UNKNOWN',
-            activity_type='unknown',
-            confidence=0.0,
-            source_records=[],
-            provenance={},
-            evidence={}
-        )
-        
-        # Extract features
-        profile_lookup = {entity_id: entity_profile}
-        features = self._extract_features(synthetic_record, profile_lookup)
+        return self.predict_missing_batch(
+            [entity_id], [timestamp], {entity_id: context_records}, {entity_id: entity_profile}
+        )[0]
+    
+    def predict_missing_batch(self, 
+                              entity_ids: List[str],
+                              timestamps: List[datetime],
+                              context_lookup: Dict[str, List[FusionRecord]],
+                              profile_lookup: Dict[str, Dict]) -> List[Optional[Prediction]]:
+        """
+        Predict location and activity for many (entity, timestamp) points with one model call per predictor
+        """
+        if not self.is_trained:
+            logger.error("Models not trained. Call train_predictive_models first.")
+            return [None] * len(entity_ids)
         
+        # Extract features, falling back per point when the batch cannot be encoded
+        features = self._extract_query_matrix(entity_ids, timestamps, profile_lookup)
         if features is None:
-            return None
-        
-        # Scale features
-        features_scaled = self.feature_scaler.transform([features])
+            rows = [
+                self._extract_features_raw(entity_id, timestamp, [], 'UNKNOWN', 0.0, {}, profile_lookup.get(entity_id, {}))
+                for entity_id, timestamp in zip(entity_ids, timestamps)
+            ]
+            valid = [i for i, row in enumerate(rows) if row is not None]
+            features = np.array([rows[i] for i in valid]).reshape(len(valid), -1)
+        else:
+            valid = list(range(len(entity_ids)))
         
-        # Make predictions
-        location_probs = self.location_predictor.predict_proba(features_scaled)[0]
-        activity_probs = self.activity_predictor.predict_proba(features_scaled)[0]
+        predictions = [None] * len(entity_ids)
         
-        # Get top predictions
-        location_classes = self.location_predictor.classes_
-        activity_classes = self.activity_predictor.classes_
+        # Opt-in: answer points with no context and no known location without consulting the forests
+        if self.config.get('skip_uninformed_predictions', False):
+            informed = []
+            for row, i in enumerate(valid):
+                if features[row, 9] == -1 and not context_lookup.get(entity_ids[i]):
+                    predictions[i] = self._uninformed_prediction(entity_ids[i], timestamps[i], profile_lookup.get(entity_ids[i], {}))
+                else:
+                    informed.append(row)
+            valid = [valid[row] for row in informed]
+            features = features[informed]
         
-        # Decode predictions
-        top_location_idx = np.argmax(location_probs)
-        top_activity_idx = np.argmax(activity_probs)
+        if not valid:
+            return predictions
         
-        predicted_location = self.label_encoders['location'].inverse_transform([location_classes[top_location_idx]])[0]
-        predicted_activity = self.label_encoders['activity'].inverse_transform([activity_classes[top_activity_idx]])[0]
+        # Scale features and make predictions
+        features_scaled = self._scale_features(features)
+        location_probs = self._predict_proba('location', self.location_predictor, features_scaled)
+        activity_probs = self._predict_proba('activity', self.activity_predictor, features_scaled)
         
-        location_confidence = location_probs[top_location_idx]
-        activity_confidence = activity_probs[top_activity_idx]
-        overall_confidence = (location_confidence + activity_confidence) / 2
+        # Get top predictions
+        location_labels = self._class_labels['location']
+        activity_labels = self._class_labels['activity']
         
-        # Generate explanation
-        explanation = self._generate_prediction_explanation(
-            entity_id, timestamp, predicted_location, predicted_activity,
-            context_records, entity_profile, features
-        )
+        # Decode predictions
+        top_location_idx = np.argmax(location_probs, axis=1)
+        top_activity_idx = np.argmax(activity_probs, axis=1)
         
-        # Generate evidence
-        evidence = self._generate_prediction_evidence(
-            entity_id, timestamp, context_records, entity_profile
-        )
+        predicted_locations = location_labels[top_location_idx]
+        predicted_activities = activity_labels[top_activity_idx]
         
-        # Get alternative predictions
-        alternatives = self._get_alternative_predictions(
-            location_probs, activity_probs, location_classes, activity_classes
-        )
+        for row, i in enumerate(valid):
+            entity_id, timestamp = entity_ids[i], timestamps[i]
+            context_records = context_lookup.get(entity_id, [])
+            entity_profile = profile_lookup.get(entity_id, {})
+            
+            location_confidence = location_probs[row, top_location_idx[row]]
+            activity_confidence = activity_probs[row, top_activity_idx[row]]
+            overall_confidence = (location_confidence + activity_confidence) / 2
+            
+            # Generate explanation
+            explanation = self._generate_prediction_explanation(
+                entity_id, timestamp, predicted_locations[row], predicted_activities[row],
+                context_records, entity_profile, features[row]
+            )
+            
+            # Generate evidence
+            evidence = self._generate_prediction_evidence(
+                entity_id, timestamp, context_records, entity_profile
+            )
+            
+            # Get alternative predictions
+            alternatives = self._get_alternative_predictions(
+                location_probs[row], activity_probs[row], location_labels, activity_labels
+            )
+            
+            predictions[i] = Prediction(
+                entity_id=entity_id,
+                timestamp=timestamp,
+                predicted_location=predicted_locations[row],
+                predicted_activity=predicted_activities[row],
+                confidence=overall_confidence,
+                explanation=explanation,
+                evidence=evidence,
+                alternative_predictions=alternatives
+            )
         
+        return predictions
+    
+    def _uninformed_prediction(self, entity_id: str, timestamp: datetime, entity_profile: Dict) -> Prediction:
+        """Zero-confidence prediction for a point with no context to predict from"""
         return Prediction(
             entity_id=entity_id,
             timestamp=timestamp,
-            predicted_location=predicted_location,
-            predicted_activity=predicted_activity,
-            confidence=overall_confidence,
-            explanation=explanation,
-            evidence=evidence,
-            alternative_predictions=alternatives
+            predicted_location='UNKNOWN',
+            predicted_activity='unknown',
+            confidence=0.0,
+            explanation={
+                'reasoning': ["Insufficient evidence: no recent activity to predict from"],
+                'confidence_factors': {},
+                'temporal_patterns': {},
+                'behavioral_patterns': {}
+            },
+            evidence=self._generate_prediction_evidence(entity_id, timestamp, [], entity_profile),
+            alternative_predictions=[]
         )
     
     def _generate_prediction_explanation(self, 
@@ -380,11 +671,10 @@ class PredictiveMonitor:
                 evidence.append(f"Last seen {int(time_diff)} minutes ago at {last_record.location}")
             
             # Pattern evidence
-            recent_locations = [r.location for r in context_records[-10:]]
-            location_counts = pd.Series(recent_locations).value_counts()
-            most_frequent = location_counts.index[0]
+            location_counts = Counter(r.location for r in context_records[-10:])
+            most_frequent, frequency = location_counts.most_common(1)[0]
             
-            evidence.append(f"Most frequently visits {most_frequent} ({location_counts[most_frequent]} times recently)")
+            evidence.append(f"Most frequently visits {most_frequent} ({frequency} times recently)")
         
         # Schedule evidence
         hour = timestamp.hour
@@ -402,22 +692,22 @@ class PredictiveMonitor:
     def _get_alternative_predictions(self, 
                                    location_probs: np.ndarray,
                                    activity_probs: np.ndarray,
-                                   location_classes: np.ndarray,
-                                   activity_classes: np.ndarray) -> List[Tuple[str, float]]:
+                                   location_labels: np.ndarray,
+                                   activity_labels: np.ndarray) -> List[Tuple[str, float]]:
         """Get alternative predictions with confidence scores"""
         alternatives = []
         
         # Top 3 location alternatives
-        top_location_indices = np.argsort(location_probs)[-3:][::-1]
+        top_location_indices = top_k_indices(location_probs, 3)
         for idx in top_location_indices[1:]:  # Skip the top prediction
-            location = self.label_encoders['location'].inverse_transform([location_classes[idx]])[0]
+            location = location_labels[idx]
             confidence = location_probs[idx]
             alternatives.append((f"Location: {location}", confidence))
         
         # Top 3 activity alternatives
-        top_activity_indices = np.argsort(activity_probs)[-3:][::-1]
+        top_activity_indices = top_k_indices(activity_probs, 3)
         for idx in top_activity_indices[1:]:  # Skip the top prediction
-            activity = self.label_encoders['activity'].inverse_transform([activity_classes[idx]])[0]
+            activity = activity_labels[idx]
             confidence = activity_probs[idx]
             alternatives.append((f"Activity: {activity}", confidence))
         
@@ -438,18 +728,24 @@ class PredictiveMonitor:
         if absence_alert:
             alerts.append(absence_alert)
         
-        # Check for behavioral anomalies
-        for record in entity_records[-10:]:  # Check last 10 records
-            features = self._extract_features(record, profile_lookup)
-            if features is not None:
-                features_scaled = self.feature_scaler.transform([features])
-                anomaly_score = self.anomaly_detector.decision_function(features_scaled)[0]
-                
-                if anomaly_score < -0.5:  # Threshold for anomaly
-                    behavioral_alert = self._create_behavioral_anomaly_alert(
-                        record, anomaly_score, entity_profile
-                    )
-                    alerts.append(behavioral_alert)
+        # Check for behavioral anomalies, scoring the last 10 records in one batch
+        scored_records = entity_records[-10:]
+        features = self._extract_feature_matrix(scored_records, profile_lookup)
+        if features is None:
+            rows = [(record, self._extract_features(record, profile_lookup)) for record in scored_records]
+            rows = [(record, row) for record, row in rows if row is not None]
+            scored_records = [record for record, _ in rows]
+            features = np.array([row for _, row in rows]).reshape(len(rows), -1)
+        
+        if len(features):
+            features_scaled = self._scale_features(features)
+            anomaly_scores = self.anomaly_detector.decision_function(features_scaled)
+            
+            for i in np.flatnonzero(anomaly_scores < -0.5):  # Threshold for anomaly
+                behavioral_alert = self._create_behavioral_anomaly_alert(
+                    scored_records[i], anomaly_scores[i], entity_profile
+                )
+                alerts.append(behavioral_alert)
         
         return alerts
     
@@ -535,7 +831,7 @@ class PredictiveMonitor:
             'config': self.config
         }
         
-        joblib.dump(model_data, model_path)
+        joblib.dump(model_data, model_path, compress=self.config.get('model_compression', 3))
         logger.info(f"Models saved to {model_path}")
     
     def load_models(self, model_path: str):
@@ -548,7 +844,11 @@ class PredictiveMonitor:
             self.anomaly_detector = model_data['anomaly_detector']
             self.label_encoders = model_data['label_encoders']
             self.feature_scaler = model_data['feature_scaler']
-            self.config = model_data.get('config', self.config)
+            # The live config wins over the one pickled at training time
+            self.config = {**model_data.get('config', {}), **self.config}
+            self._cache_scaler_params()
+            self._flatten_forests()
+            self._cache_class_labels()
             
             self.is_trained = True
             logger.info(f"Models loaded from {model_path}")
@@ -561,16 +861,24 @@ class PredictiveMonitor:
         if not predictions:
             return {}
         
-        confidences = [p.confidence for p in predictions]
+        confidences = np.fromiter((p.confidence for p in predictions), dtype=float, count=len(predictions))
         locations = [p.predicted_location for p in predictions]
         activities = [p.predicted_activity for p in predictions]
         
+        if len(predictions) <= SMALL_TALLY_SIZE:
+            location_distribution = dict(Counter(locations).most_common())
+            activity_distribution = dict(Counter(activities).most_common())
+        else:
+            labels = pd.DataFrame({'location': locations, 'activity': activities})
+            location_distribution = labels['location'].value_counts().to_dict()
+            activity_distribution = labels['activity'].value_counts().to_dict()
+        
         return {
             'total_predictions': len(predictions),
-            'average_confidence': np.mean(confidences),
-            'confidence_std': np.std(confidences),
-            'high_confidence_predictions': sum(1 for c in confidences if c > 0.8),
-            'location_distribution': pd.Series(locations).value_counts().to_dict(),
-            'activity_distribution': pd.Series(activities).value_counts().to_dict(),
-            'prediction_coverage': len(set(locations)) / len(CAMPUS_LOCATIONS) if CAMPUS_LOCATIONS else 0
+            'average_confidence': confidences.mean(),
+            'confidence_std': confidences.std(),
+            'high_confidence_predictions': int(np.count_nonzero(confidences > 0.8)),
+            'location_distribution': location_distribution,
+            'activity_distribution': activity_distribution,
+            'prediction_coverage': len(location_distribution) / len(CAMPUS_LOCATIONS) if CAMPUS_LOCATIONS else 0
         }
@@ -4,17 +4,71 @@ Creates chronological activity timelines with human-readable summaries
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple, Optional, Any, Union, Iterable, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
+from itertools import chain
+from operator import attrgetter
+import heapq
 import re
+import sys
 from loguru import logger
 
 from .config import TIMELINE_CONFIG, CAMPUS_LOCATIONS
 from .multimodal_fusion import FusionRecord
 
+# Display name for each campus location code
+LOCATION_NAMES = {code: info.get('name', code) for code, info in CAMPUS_LOCATIONS.items()}
 
-@dataclass
+# Consecutive events at the same location within this many nanoseconds (5 minutes) are merged
+MERGE_WINDOW_NS = 5 * 60 * 10**9
+
+# C-level accessor for the timestamp of records and events, used as a sort/merge key
+EVENT_TIMESTAMP = attrgetter('timestamp')
+
+# Groups smaller than numpy's pairwise-summation block average identically with a plain sum
+SMALL_MEAN_SIZE = 8
+
+# Fixed intervals reused by gap detection and narrative summaries
+GAP_START_OFFSET = timedelta(minutes=30)
+ONE_HOUR = timedelta(hours=1)
+ONE_DAY = timedelta(days=1)
+
+# Descriptions that depend only on the location name, keyed by activity type
+DESCRIPTION_TEMPLATES = {
+    'card_swipe': "Accessed {} using campus card",
+    'cctv_detection': "Detected by CCTV camera at {}",
+    'wifi_connection': "Connected to WiFi network at {}",
+    'lab_booking_end': "Ended lab session at {}"
+}
+
+# Activity types whose descriptions read the source records' raw data
+RAW_DATA_ACTIVITIES = ('lab_booking_start', 'library_checkout')
+
+
+@lru_cache(maxsize=4096)
+def static_description(activity_type: str, location: str) -> str:
+    """Description for an activity that depends only on its type and location, memoized"""
+    location_name = LOCATION_NAMES.get(location, location)
+    template = DESCRIPTION_TEMPLATES.get(activity_type)
+    if template is not None:
+        return template.format(location_name)
+    return f"Activity at {location_name}: {activity_type}"
+
+
+def intern_label(value: Any) -> Any:
+    """Interned copy of a string label; other values (e.g. missing data) pass through"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def reads_raw_data(activity_type: str) -> bool:
+    """Whether an activity's description depends on its source records"""
+    return activity_type in RAW_DATA_ACTIVITIES or activity_type.startswith('note_')
+
+
+@dataclass(slots=True)
 class TimelineEvent:
     """Represents a single event in the timeline"""
     timestamp: datetime
@@ -27,7 +81,7 @@ class TimelineEvent:
     related_events: List[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TimelineSummary:
     """Represents a summarized timeline for a time period"""
     entity_id: str
@@ -52,114 +106,107 @@ class TimelineGenerator:
     
     def __init__(self, config: Dict = None):
         self.config = config or TIMELINE_CONFIG
+        self._max_gap = timedelta(hours=self.config['max_gap_hours'])
+        self._max_gap_ns = pd.Timedelta(self._max_gap).value
         
     def generate_timeline(self, 
                          entity_id: str, 
-                         fused_records: List[FusionRecord],
+                         fused_records: Union[List[FusionRecord], Dict[str, List[FusionRecord]]],
                          start_time: Optional[datetime] = None,
                          end_time: Optional[datetime] = None) -> List[TimelineEvent]:
         """
-        Generate a chronological timeline from fused records
+        Generate a chronological timeline from fused records, or from per-source batches already sorted by time
         """
         logger.info(f"Generating timeline for entity {entity_id}")
         
-        # Filter records by time range if specified
-        filtered_records = self._filter_by_time_range(fused_records, start_time, end_time)
+        # Sort and window on int64 nanosecond timestamps, read from the records once
+        if isinstance(fused_records, dict):
+            # Each batch is already time-ordered, so a k-way merge replaces the full sort
+            sorted_records = list(heapq.merge(*fused_records.values(), key=EVENT_TIMESTAMP))
+            timestamps = self._timestamps_ns(sorted_records)
+        else:
+            timestamps = self._timestamps_ns(fused_records)
+            order = np.argsort(timestamps, kind='stable')
+            sorted_records = [fused_records[i] for i in order.tolist()]
+            timestamps = timestamps[order]
+        lo, hi = self._window_bounds(timestamps, start_time, end_time)
+        filtered_records = sorted_records[lo:hi]
+        timestamps = timestamps[lo:hi]
         
         if not filtered_records:
             logger.warning(f"No records found for entity {entity_id} in specified time range")
             return []
         
-        # Sort records chronologically
-        filtered_records.sort(key=lambda x: x.timestamp)
-        
         # Convert fusion records to timeline events
         timeline_events = self._convert_to_timeline_events(filtered_records)
         
-        # Merge related events and calculate durations
-        merged_events = self._merge_related_events(timeline_events)
-        
-        # Detect and fill gaps
-        gap_filled_events = self._detect_and_analyze_gaps(merged_events)
+        # Merge related events and fill gaps in one streamed pass; each merged event keeps its group's first timestamp
+        bounds = self._merge_bounds(timeline_events, timestamps)
+        merged_events = self._iter_merged_events(timeline_events, bounds)
+        gap_filled_events = self._fill_gaps(merged_events, timestamps[bounds[:-1]])
         
         logger.info(f"Generated timeline with {len(gap_filled_events)} events")
         return gap_filled_events
     
-    def _filter_by_time_range(self, 
-                             records: List[FusionRecord],
-                             start_time: Optional[datetime],
-                             end_time: Optional[datetime]) -> List[FusionRecord]:
-        """Filter records by time range"""
-        if not start_time and not end_time:
-            return records
-        
-        filtered = []
-        for record in records:
-            if start_time and record.timestamp < start_time:
-                continue
-            if end_time and record.timestamp > end_time:
-                continue
-            filtered.append(record)
-        
-        return filtered
+    def _window_bounds(self, 
+                       timestamps: np.ndarray,
+                       start_time: Optional[datetime],
+                       end_time: Optional[datetime]) -> Tuple[int, int]:
+        """Slice bounds of sorted nanosecond timestamps within the inclusive [start_time, end_time] range"""
+        lo = int(np.searchsorted(timestamps, pd.Timestamp(start_time).as_unit('ns').value, 'left')) if start_time else 0
+        hi = int(np.searchsorted(timestamps, pd.Timestamp(end_time).as_unit('ns').value, 'right')) if end_time else len(timestamps)
+        return lo, hi
     
     def _convert_to_timeline_events(self, fused_records: List[FusionRecord]) -> List[TimelineEvent]:
-        """Convert fusion records to timeline events"""
-        timeline_events = []
+        """Convert fusion records to timeline events, describing records in batches per activity type"""
+        rows_by_activity = defaultdict(list)
+        for i, record in enumerate(fused_records):
+            rows_by_activity[record.activity_type].append(i)
+        
+        # Static descriptions come from the memoized (activity, location) table; the rest read their raw data
+        descriptions = [None] * len(fused_records)
+        for activity_type, rows in rows_by_activity.items():
+            if reads_raw_data(activity_type):
+                for i in rows:
+                    descriptions[i] = self._generate_event_description(fused_records[i])
+            else:
+                for i in rows:
+                    descriptions[i] = static_description(activity_type, fused_records[i].location)
         
-        for record in fused_records:
-            # Generate human-readable description
-            description = self._generate_event_description(record)
-            
-            # Extract source datasets
-            sources = [sr['dataset'] for sr in record.source_records]
-            
-            event = TimelineEvent(
+        # Location, activity and source labels are interned so events share one copy of each
+        return [
+            TimelineEvent(
                 timestamp=record.timestamp,
-                location=record.location,
-                activity=record.activity_type,
+                location=intern_label(record.location),
+                activity=intern_label(record.activity_type),
                 description=description,
                 confidence=record.confidence,
-                sources=sources,
+                sources=[intern_label(sr['dataset']) for sr in record.source_records],
                 related_events=[]
             )
-            
-            timeline_events.append(event)
-        
-        return timeline_events
+            for record, description in zip(fused_records, descriptions)
+        ]
     
     def _generate_event_description(self, record: FusionRecord) -> str:
         """Generate human-readable description for an event"""
-        location_name = CAMPUS_LOCATIONS.get(record.location, {}).get('name', record.location)
+        if not reads_raw_data(record.activity_type):
+            return static_description(record.activity_type, record.location)
         
-        # Activity type specific descriptions
-        if record.activity_type == 'card_swipe':
-            return f"Accessed {location_name} using campus card"
+        location_name = LOCATION_NAMES.get(record.location, record.location)
         
-        elif record.activity_type == 'cctv_detection':
-            return f"Detected by CCTV camera at {location_name}"
-        
-        elif record.activity_type == 'wifi_connection':
-            return f"Connected to WiFi network at {location_name}"
-        
-        elif record.activity_type == 'lab_booking_start':
+        # Activity type specific descriptions
+        if record.activity_type == 'lab_booking_start':
             duration = self._extract_booking_duration(record)
             duration_str = f" for {duration}" if duration else ""
             return f"Started lab session at {location_name}{duration_str}"
         
-        elif record.activity_type == 'lab_booking_end':
-            return f"Ended lab session at {location_name}"
-        
         elif record.activity_type == 'library_checkout':
             book_info = self._extract_book_info(record)
             return f"Checked out book at Library{book_info}"
         
-        elif record.activity_type.startswith('note_'):
-            category = record.activity_type.replace('note_', '')
+        else:  # note_* activities
+            category = record.activity_type.partition('note_')[2]
             return f"Submitted {category} request: {self._extract_note_summary(record)}"
-        
-        else:
-            return f"Activity at {location_name}: {record.activity_type}"
     
     def _extract_booking_duration(self, record: FusionRecord) -> Optional[str]:
         """Extract booking duration from record"""
@@ -203,30 +250,20 @@ class TimelineGenerator:
         if not events:
             return events
         
-        merged_events = []
-        current_group = [events[0]]
-        
-        for event in events[1:]:
-            last_event = current_group[-1]
-            
-            # Check if events should be merged
-            time_diff = (event.timestamp - last_event.timestamp).total_seconds() / 60
-            same_location = event.location == last_event.location
-            
-            if time_diff <= 5 and same_location:  # 5-minute window for same location
-                current_group.append(event)
-            else:
-                # Process current group
-                merged_event = self._create_merged_event(current_group)
-                merged_events.append(merged_event)
-                current_group = [event]
-        
-        # Process final group
-        if current_group:
-            merged_event = self._create_merged_event(current_group)
-            merged_events.append(merged_event)
-        
-        return merged_events
+        bounds = self._merge_bounds(events, self._timestamps_ns(events))
+        return list(self._iter_merged_events(events, bounds))
+    
+    def _iter_merged_events(self, events: List[TimelineEvent], bounds: List[int]) -> Iterator[TimelineEvent]:
+        """Yield one merged event per group delimited by bounds"""
+        for lo, hi in zip(bounds, bounds[1:]):
+            yield self._create_merged_event(events[lo:hi])
+    
+    def _merge_bounds(self, events: List[TimelineEvent], timestamps: np.ndarray) -> List[int]:
+        """Start index of every merge group plus the end index"""
+        # A new group starts wherever the location changes or more than 5 minutes pass since the previous event
+        location_ids, _ = pd.factorize(np.array([event.location for event in events], dtype=object), use_na_sentinel=False)
+        breaks = (np.diff(timestamps) > MERGE_WINDOW_NS) | (location_ids[1:] != location_ids[:-1])
+        return [0, *(np.flatnonzero(breaks) + 1).tolist(), len(events)]
     
     def _create_merged_event(self, event_group: List[TimelineEvent]) -> TimelineEvent:
         """Create a single merged event from a group of related events"""
@@ -234,39 +271,39 @@ class TimelineGenerator:
             return event_group[0]
         
         # Use earliest timestamp
-        timestamp = min(event.timestamp for event in event_group)
+        timestamps = list(map(EVENT_TIMESTAMP, event_group))
+        timestamp = min(timestamps)
         
         # Use most common location
         locations = [event.location for event in event_group]
-        location = max(set(locations), key=locations.count)
+        location = Counter(locations).most_common(1)[0][0]
         
         # Combine activities
         activities = [event.activity for event in event_group]
-        unique_activities = list(set(activities))
-        primary_activity = max(set(activities), key=activities.count)
+        unique_activities = list(dict.fromkeys(activities))
+        primary_activity = Counter(activities).most_common(1)[0][0]
         
         # Create combined description
         if len(unique_activities) == 1:
             description = event_group[0].description
         else:
-            location_name = CAMPUS_LOCATIONS.get(location, {}).get('name', location)
+            location_name = LOCATION_NAMES.get(location, location)
             description = f"Multiple activities at {location_name}: {', '.join(unique_activities[:3])}"
             if len(unique_activities) > 3:
                 description += f" and {len(unique_activities) - 3} more"
         
         # Calculate average confidence
-        confidence = np.mean([event.confidence for event in event_group])
+        confidences = [event.confidence for event in event_group]
+        if len(confidences) < SMALL_MEAN_SIZE:
+            confidence = sum(confidences) / len(confidences)
+        else:
+            confidence = np.mean(confidences)
         
         # Combine sources
-        all_sources = []
-        for event in event_group:
-            all_sources.extend(event.sources)
-        unique_sources = list(set(all_sources))
+        unique_sources = list(dict.fromkeys(chain.from_iterable(event.sources for event in event_group)))
         
-        # Calculate duration if applicable
-        duration = None
-        if len(event_group) > 1:
-            duration = max(event.timestamp for event in event_group) - timestamp
+        # Calculate duration
+        duration = max(timestamps) - timestamp
         
         return TimelineEvent(
             timestamp=timestamp,
@@ -279,34 +316,48 @@ class TimelineGenerator:
             related_events=[f"{event.activity}@{event.timestamp}" for event in event_group[1:]]
         )
     
-    def _detect_and_analyze_gaps(self, events: List[TimelineEvent]) -> List[TimelineEvent]:
+    def _detect_and_analyze_gaps(self, 
+                                 events: List[TimelineEvent],
+                                 timestamps: Optional[np.ndarray] = None) -> List[TimelineEvent]:
         """Detect gaps in timeline and add analysis"""
         if len(events) < 2:
             return events
         
-        enhanced_events = []
-        
-        for i, event in enumerate(events):
-            enhanced_events.append(event)
-            
-            # Check for gap to next event
-            if i < len(events) - 1:
-                next_event = events[i + 1]
-                gap_duration = next_event.timestamp - event.timestamp
-                
-                if gap_duration > timedelta(hours=self.config['max_gap_hours']):
-                    # Add gap event
-                    gap_event = self._create_gap_event(event, next_event, gap_duration)
-                    enhanced_events.append(gap_event)
-        
-        return enhanced_events
+        if timestamps is None:
+            timestamps = self._timestamps_ns(events)
+        return self._fill_gaps(events, timestamps)
+    
+    def _fill_gaps(self, events: Iterable[TimelineEvent], timestamps: np.ndarray) -> List[TimelineEvent]:
+        """Events in order, each preceded by a gap event when the previous one is more than the max gap earlier"""
+        # Only pairs further apart than the max gap need a gap event
+        gap_before = np.empty(len(timestamps), dtype=bool)
+        gap_before[:1] = False
+        np.greater(np.diff(timestamps), self._max_gap_ns, out=gap_before[1:])
+        
+        # The output size is known up front, so fill a pre-sized list instead of growing one
+        filled = [None] * (len(timestamps) + int(gap_before.sum()))
+        j = 0
+        previous = None
+        for event, gap in zip(events, gap_before.tolist()):
+            if gap:
+                filled[j] = self._create_gap_event(previous, event, event.timestamp - previous.timestamp)
+                j += 1
+            filled[j] = event
+            j += 1
+            previous = event
+        return filled
+    
+    @staticmethod
+    def _timestamps_ns(events: List[Any]) -> np.ndarray:
+        """Event or record timestamps as int64 nanoseconds since the epoch"""
+        return pd.DatetimeIndex([event.timestamp for event in events]).as_unit('ns').asi8
     
     def _create_gap_event(self, 
                          before_event: TimelineEvent, 
                          after_event: TimelineEvent, 
                          gap_duration: timedelta) -> TimelineEvent:
         """Create an event representing a gap in the timeline"""
-        gap_start = before_event.timestamp + timedelta(minutes=30)  # Assume activity ended 30 min after last event
+        gap_start = before_event.timestamp + GAP_START_OFFSET  # Assume activity ended 30 min after last event
         
         hours = int(gap_duration.total_seconds() // 3600)
         minutes = int((gap_duration.total_seconds() % 3600) // 60)
@@ -334,10 +385,11 @@ class TimelineGenerator:
                         summary_window_hours: Optional[int] = None) -> TimelineSummary:
         """Generate a human-readable summary of the timeline"""
         if not timeline_events:
+            now = datetime.now()
             return TimelineSummary(
                 entity_id=entity_id,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
+                start_time=now,
+                end_time=now,
                 total_events=0,
                 locations_visited=[],
                 primary_activities=[],
@@ -349,16 +401,17 @@ class TimelineGenerator:
         window_hours = summary_window_hours or self.config['summary_window_hours']
         
         # Filter events within summary window
-        end_time = max(event.timestamp for event in timeline_events)
+        end_time = max(map(EVENT_TIMESTAMP, timeline_events))
         start_time = end_time - timedelta(hours=window_hours)
         
         recent_events = [event for event in timeline_events 
                         if event.timestamp >= start_time and event.activity != 'gap']
         
-        # Extract summary statistics
-        locations_visited = list(set(event.location for event in recent_events if event.location != 'UNKNOWN'))
-        activities = [event.activity for event in recent_events]
-        primary_activities = list(set(activities))
+        # Extract summary statistics, most frequent first
+        location_counts = Counter(event.location for event in recent_events)
+        location_counts.pop('UNKNOWN', None)
+        locations_visited = [location for location, _ in location_counts.most_common()]
+        primary_activities = [activity for activity, _ in Counter(event.activity for event in recent_events).most_common()]
         
         # Calculate confidence score
         if recent_events:
@@ -395,8 +448,9 @@ class TimelineGenerator:
             return "No recent activity detected."
         
         # Start with time range
-        start_time = min(event.timestamp for event in events)
-        end_time = max(event.timestamp for event in events)
+        timestamps = list(map(EVENT_TIMESTAMP, events))
+        start_time = min(timestamps)
+        end_time = max(timestamps)
         
         summary_parts = []
         
@@ -410,7 +464,7 @@ class TimelineGenerator:
         
         # Location summary
         if locations:
-            location_names = [CAMPUS_LOCATIONS.get(loc, {}).get('name', loc) for loc in locations[:3]]
+            location_names = [LOCATION_NAMES.get(loc, loc) for loc in locations[:3]]
             if len(locations) == 1:
                 summary_parts.append(f"Visited {location_names[0]}")
             elif len(locations) <= 3:
@@ -419,11 +473,7 @@ class TimelineGenerator:
                 summary_parts.append(f"Visited {', '.join(location_names)} and {len(locations) - 3} other locations")
         
         # Activity summary
-        activity_counts = {}
-        for activity in activities:
-            activity_counts[activity] = activity_counts.get(activity, 0) + 1
-        
-        top_activities = sorted(activity_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_activities = Counter(activities).most_common(3)
         
         if top_activities:
             activity_descriptions = []
@@ -443,13 +493,13 @@ class TimelineGenerator:
         
         # Recent activity
         if events:
-            last_event = max(events, key=lambda x: x.timestamp)
+            last_event = max(events, key=EVENT_TIMESTAMP)
             time_since = datetime.now() - last_event.timestamp
             
-            if time_since < timedelta(hours=1):
-                summary_parts.append(f"Last seen {int(time_since.total_seconds() // 60)} minutes ago at {CAMPUS_LOCATIONS.get(last_event.location, {}).get('name', last_event.location)}")
-            elif time_since < timedelta(days=1):
-                summary_parts.append(f"Last seen {int(time_since.total_seconds() // 3600)} hours ago at {CAMPUS_LOCATIONS.get(last_event.location, {}).get('name', last_event.location)}")
+            if time_since < ONE_HOUR:
+                summary_parts.append(f"Last seen {int(time_since.total_seconds() // 60)} minutes ago at {LOCATION_NAMES.get(last_event.location, last_event.location)}")
+            elif time_since < ONE_DAY:
+                summary_parts.append(f"Last seen {int(time_since.total_seconds() // 3600)} hours ago at {LOCATION_NAMES.get(last_event.location, last_event.location)}")
             else:
                 summary_parts.append(f"Last seen on {last_event.timestamp.strftime('%B %d at %I:%M %p')}")
         
@@ -460,71 +510,71 @@ class TimelineGenerator:
         if not timeline_events:
             return pd.DataFrame()
         
-        export_data = []
-        
-        for event in timeline_events:
-            row = {
-                'timestamp': event.timestamp,
-                'location': event.location,
-                'location_name': CAMPUS_LOCATIONS.get(event.location, {}).get('name', event.location),
-                'activity': event.activity,
-                'description': event.description,
-                'confidence': event.confidence,
-                'sources': ','.join(event.sources),
-                'duration_minutes': event.duration.total_seconds() / 60 if event.duration else None,
-                'related_events_count': len(event.related_events) if event.related_events else 0
-            }
-            export_data.append(row)
-        
-        return pd.DataFrame(export_data)
+        # Assemble column by column so pandas gets whole columns instead of row dicts
+        return pd.DataFrame({
+            'timestamp': [event.timestamp for event in timeline_events],
+            'location': [event.location for event in timeline_events],
+            'location_name': [LOCATION_NAMES.get(event.location, event.location) for event in timeline_events],
+            'activity': [event.activity for event in timeline_events],
+            'description': [event.description for event in timeline_events],
+            'confidence': np.fromiter((event.confidence for event in timeline_events), dtype=float, count=len(timeline_events)),
+            'sources': [','.join(event.sources) for event in timeline_events],
+            'duration_minutes': [event.duration.total_seconds() / 60 if event.duration else None for event in timeline_events],
+            'related_events_count': [len(event.related_events) if event.related_events else 0 for event in timeline_events]
+        })
     
     def get_timeline_statistics(self, timeline_events: List[TimelineEvent]) -> Dict[str, Any]:
         """Get statistical analysis of the timeline"""
         if not timeline_events:
             return {}
         
-        # Filter out gap events for statistics
-        real_events = [event for event in timeline_events if event.activity != 'gap']
-        
-        if not real_events:
+        # One columnar frame of every event; gap rows are split off by mask
+        frame = pd.DataFrame({
+            'timestamp': [event.timestamp for event in timeline_events],
+            'location': [event.location for event in timeline_events],
+            'activity': [event.activity for event in timeline_events],
+            'confidence': [event.confidence for event in timeline_events],
+            'sources': [event.sources for event in timeline_events],
+            'duration_seconds': [event.duration.total_seconds() if event.duration else 0.0 for event in timeline_events]
+        })
+        is_gap = frame['activity'] == 'gap'
+        real_events = frame[~is_gap]
+        
+        if real_events.empty:
             return {}
         
         # Time analysis
-        timestamps = [event.timestamp for event in real_events]
-        time_span = max(timestamps) - min(timestamps)
+        time_span = real_events['timestamp'].max() - real_events['timestamp'].min()
         
         # Location analysis
-        locations = [event.location for event in real_events if event.location != 'UNKNOWN']
-        location_counts = pd.Series(locations).value_counts().to_dict() if locations else {}
+        locations = real_events.loc[real_events['location'] != 'UNKNOWN', 'location']
+        location_counts = locations.value_counts().to_dict()
         
         # Activity analysis
-        activities = [event.activity for event in real_events]
-        activity_counts = pd.Series(activities).value_counts().to_dict()
+        activity_counts = real_events['activity'].value_counts().to_dict()
         
         # Confidence analysis
-        confidences = [event.confidence for event in real_events]
+        confidences = real_events['confidence'].to_numpy(dtype=float)
         
         # Source analysis
-        all_sources = []
-        for event in real_events:
-            all_sources.extend(event.sources)
-        source_counts = pd.Series(all_sources).value_counts().to_dict() if all_sources else {}
+        all_sources = pd.Series(list(chain.from_iterable(real_events['sources'])), dtype=object)
+        source_counts = all_sources.value_counts().to_dict()
         
         # Gap analysis
-        gap_events = [event for event in timeline_events if event.activity == 'gap']
-        total_gap_time = sum([event.duration.total_seconds() for event in gap_events if event.duration], 0) / 3600  # hours
+        total_gaps = int(is_gap.sum())
+        total_gap_time = float(frame.loc[is_gap, 'duration_seconds'].sum()) / 3600  # hours
         
         return {
             'total_events': len(real_events),
             'time_span_hours': time_span.total_seconds() / 3600,
             'events_per_hour': len(real_events) / (time_span.total_seconds() / 3600) if time_span.total_seconds() > 0 else 0,
-            'unique_locations': len(set(locations)),
+            'unique_locations': locations.nunique(dropna=False),
             'location_distribution': location_counts,
             'activity_distribution': activity_counts,
-            'average_confidence': np.mean(confidences) if confidences else 0,
-            'confidence_std': np.std(confidences) if confidences else 0,
+            'average_confidence': np.mean(confidences),
+            'confidence_std': np.std(confidences),
             'source_distribution': source_counts,
-            'total_gaps': len(gap_events),
+            'total_gaps': total_gaps,
             'total_gap_hours': total_gap_time,
             'data_coverage': 1 - (total_gap_time / (time_span.total_seconds() / 3600)) if time_span.total_seconds() > 0 else 1
         }